@@ -0,0 +1,119 @@
+"""
+合成图层生成模块
+生成规则格网、Voronoi 剖分和多顶点锯齿多边形，用于可复现的性能测试
+"""
+
+import numpy as np
+import geopandas as gpd
+import shapely
+
+
+# 所有合成图层覆盖的范围（投影坐标）
+EXTENT = (0.0, 0.0, 100_000.0, 100_000.0)
+CRS = 'EPSG:3857'
+
+
+def _attributes(count: int, rng: np.random.Generator) -> dict:
+    """生成一组常见类型的属性字段"""
+    return {
+        'fid': np.arange(count, dtype=np.int64),
+        'code': np.char.add('U', np.arange(count).astype(str)),
+        'value': rng.random(count),
+        'level': rng.integers(1, 6, count),
+    }
+
+
+def grid_layer(count: int, seed: int = 0) -> gpd.GeoDataFrame:
+    """
+    规则格网图层（约 count 个正方形单元）
+
+    Args:
+        count: 要素数
+        seed: 随机种子
+
+    Returns:
+        GeoDataFrame
+    """
+    rng = np.random.default_rng(seed)
+    side = int(np.ceil(np.sqrt(count)))
+    min_x, min_y, max_x, max_y = EXTENT
+    size = (max_x - min_x) / side
+
+    cells = np.arange(count)
+    x0 = min_x + (cells % side) * size
+    y0 = min_y + (cells // side) * size
+    geoms = shapely.box(x0, y0, x0 + size, y0 + size)
+
+    return gpd.GeoDataFrame(_attributes(count, rng), geometry=geoms, crs=CRS)
+
+
+def voronoi_layer(count: int, seed: int = 0) -> gpd.GeoDataFrame:
+    """
+    Voronoi 剖分图层（count 个随机种子点生成的无缝多边形，近似行政区/流域）
+
+    Args:
+        count: 要素数
+        seed: 随机种子
+
+    Returns:
+        GeoDataFrame
+    """
+    rng = np.random.default_rng(seed)
+    min_x, min_y, max_x, max_y = EXTENT
+    points = np.column_stack([
+        rng.uniform(min_x, max_x, count),
+        rng.uniform(min_y, max_y, count),
+    ])
+    extent = shapely.box(*EXTENT)
+    cells = shapely.get_parts(shapely.voronoi_polygons(shapely.multipoints(points), extend_to=extent))
+    geoms = shapely.intersection(cells, extent)
+
+    return gpd.GeoDataFrame(_attributes(len(geoms), rng), geometry=geoms, crs=CRS)
+
+
+def jagged_layer(count: int, vertices: int = 256, invalid_ratio: float = 0.01, seed: int = 0) -> gpd.GeoDataFrame:
+    """
+    多顶点锯齿多边形图层（星形多边形，少量要素故意自相交以测试几何修复）
+
+    Args:
+        count: 要素数
+        vertices: 每个多边形的顶点数
+        invalid_ratio: 自相交（无效）要素的比例
+        seed: 随机种子
+
+    Returns:
+        GeoDataFrame
+    """
+    rng = np.random.default_rng(seed)
+    min_x, min_y, max_x, max_y = EXTENT
+    radius = (max_x - min_x) / np.sqrt(count)
+
+    centers = np.column_stack([
+        rng.uniform(min_x, max_x, count),
+        rng.uniform(min_y, max_y, count),
+    ])
+    angles = np.linspace(0, 2 * np.pi, vertices, endpoint=False)
+    radii = radius * rng.uniform(0.3, 1.0, (count, vertices))
+    coords = np.empty((count, vertices + 1, 2))
+    coords[:, :-1, 0] = centers[:, [0]] + radii * np.cos(angles)
+    coords[:, :-1, 1] = centers[:, [1]] + radii * np.sin(angles)
+
+    # 交换相隔较远的两个顶点，制造自相交
+    invalid = rng.random(count) < invalid_ratio
+    half = vertices // 2
+    swapped = coords[invalid, 1].copy()
+    coords[invalid, 1] = coords[invalid, half]
+    coords[invalid, half] = swapped
+
+    coords[:, -1] = coords[:, 0]
+    geoms = shapely.polygons(coords)
+
+    return gpd.GeoDataFrame(_attributes(count, rng), geometry=geoms, crs=CRS)
+
+
+# 布局名称 -> 生成函数
+LAYOUTS = {
+    'grid': grid_layer,
+    'voronoi': voronoi_layer,
+    'jagged': jagged_layer,
+}
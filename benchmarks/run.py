@@ -0,0 +1,300 @@
+"""
+空间关联流程性能基准
+
+分别计时加载、几何修复、空间关联、Shapefile 导出、CSV 导出五个阶段，
+记录耗时、峰值内存（RSS）与处理速度，结果写入 JSON 以便在不同提交之间比较。
+
+用法:
+    python -m benchmarks.run run --scales 1k,10k --layouts grid,voronoi,jagged -o bench.json
+    python -m benchmarks.run compare base.json bench.json --threshold 0.1
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import warnings
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+import shapely
+import geopandas as gpd
+
+from src.core.loader import ShapefileLoader
+from src.core.validator import GeometryValidator
+from src.core.processor import SpatialJoinProcessor
+from src.core.exporter import ResultExporter
+from .generators import LAYOUTS, voronoi_layer
+
+try:
+    import psutil
+except ImportError:  # pragma: no cover - psutil 为可选依赖
+    psutil = None
+
+
+SCALES = {'1k': 1_000, '10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+STAGES = ('load', 'repair', 'process', 'export_shapefile', 'export_geopackage', 'export_geoparquet',
+          'export_flatgeobuf', 'export_csv')
+
+# 导出阶段 -> 输出文件扩展名
+EXPORT_STAGES = {
+    'export_shapefile': '.shp',
+    'export_geopackage': '.gpkg',
+    'export_geoparquet': '.parquet',
+    'export_flatgeobuf': '.fgb',
+    'export_csv': '.csv',
+}
+
+# 目标图层要素数与源图层之比（目标通常是更粗的分区，如行政区）
+TARGET_RATIO = 0.1
+
+
+def current_rss() -> Optional[int]:
+    """
+    获取当前进程的常驻内存（字节）
+
+    Returns:
+        RSS 字节数，无法获取时为 None
+    """
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return None
+
+
+class PeakMemorySampler:
+    """在后台线程中周期采样 RSS，记录某一阶段内的峰值"""
+
+    def __init__(self, interval: float = 0.01):
+        """
+        Args:
+            interval: 采样间隔（秒）
+        """
+        self.interval = interval
+        self.peak: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self):
+        self.peak = current_rss()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def _sample(self):
+        rss = current_rss()
+        if rss is not None and (self.peak is None or rss > self.peak):
+            self.peak = rss
+
+
+@contextmanager
+def measure(record: Dict[str, Any], features: int):
+    """
+    测量一个阶段的耗时与峰值内存，结果写入 record
+
+    Args:
+        record: 结果字典
+        features: 该阶段处理的要素数
+    """
+    gc.collect()
+    with PeakMemorySampler() as sampler:
+        start = time.perf_counter()
+        yield
+        elapsed = time.perf_counter() - start
+    record.update({
+        'features': features,
+        'wall_s': round(elapsed, 4),
+        'peak_rss_mb': round(sampler.peak / 2 ** 20, 1) if sampler.peak is not None else None,
+        'features_per_s': round(features / elapsed, 1) if elapsed > 0 else None,
+    })
+
+
+def run_scenario(layout: str, count: int, workdir: str, workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    对一种图层布局和规模执行完整流程并逐阶段计时
+
+    Args:
+        layout: 源图层布局（见 LAYOUTS）
+        count: 源图层要素数
+        workdir: 临时文件目录
+        workers: 空间关联并行进程数
+
+    Returns:
+        每个阶段一条记录的列表
+    """
+    source_path = os.path.join(workdir, f'{layout}_{count}_source.shp')
+    target_path = os.path.join(workdir, f'{layout}_{count}_target.shp')
+    LAYOUTS[layout](count, seed=1).to_file(source_path)
+    voronoi_layer(max(int(count * TARGET_RATIO), 10), seed=2).to_file(target_path)
+
+    records = []
+
+    def stage(name: str) -> Dict[str, Any]:
+        record = {'layout': layout, 'scale': count, 'stage': name}
+        records.append(record)
+        return record
+
+    loader = ShapefileLoader()
+    with measure(stage('load'), count):
+        source_gdf, errors = loader.load_layer(source_path)
+        if errors:
+            raise RuntimeError(errors[0])
+    target_gdf, errors = loader.load_layer(target_path)
+    if errors:
+        raise RuntimeError(errors[0])
+
+    validator = GeometryValidator()
+    source_geoms = source_gdf.geometry.to_numpy()
+    with measure(stage('repair'), count):
+        validator.fix_invalid_geometries(source_geoms)
+
+    processor = SpatialJoinProcessor(validator)
+    with measure(stage('process'), count):
+        results = processor.process(source_gdf, target_gdf, workers=workers)
+
+    exporter = ResultExporter()
+    for name, extension in EXPORT_STAGES.items():
+        with measure(stage(name), count):
+            success, errors = exporter.export(
+                source_gdf, results, os.path.join(workdir, f'{layout}_{count}_output{extension}')
+            )
+            if not success:
+                raise RuntimeError(errors[0])
+
+    return records
+
+
+def environment() -> Dict[str, Any]:
+    """记录运行环境，便于解释不同结果之间的差异"""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'shapely': shapely.__version__,
+        'geopandas': gpd.__version__,
+    }
+
+
+def compare(base: Dict[str, Any], new: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """
+    比较两次基准结果
+
+    Args:
+        base: 基线结果
+        new: 新结果
+        threshold: 耗时增长超过此比例视为性能回退
+
+    Returns:
+        每个共有阶段一条比较记录的列表
+    """
+    key = lambda r: (r['layout'], r['scale'], r['stage'])
+    base_records = {key(r): r for r in base['results']}
+    rows = []
+    for record in new['results']:
+        old = base_records.get(key(record))
+        if old is None or not old['wall_s']:
+            continue
+        ratio = record['wall_s'] / old['wall_s']
+        rows.append({
+            'layout': record['layout'],
+            'scale': record['scale'],
+            'stage': record['stage'],
+            'base_s': old['wall_s'],
+            'new_s': record['wall_s'],
+            'ratio': ratio,
+            'regression': ratio > 1 + threshold,
+        })
+    return rows
+
+
+def _parse_scales(value: str) -> List[int]:
+    counts = []
+    for item in value.split(','):
+        item = item.strip().lower()
+        counts.append(SCALES[item] if item in SCALES else int(item))
+    return counts
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.run', description='空间关联流程性能基准')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='执行基准测试')
+    run_parser.add_argument('--scales', default='1k,10k', help=f"要素规模，逗号分隔（{', '.join(SCALES)} 或整数）")
+    run_parser.add_argument('--layouts', default=','.join(LAYOUTS), help='源图层布局，逗号分隔')
+    run_parser.add_argument('--workers', type=int, default=None, help='空间关联并行进程数')
+    run_parser.add_argument('-o', '--output', default='benchmark.json', help='结果 JSON 路径')
+
+    compare_parser = subparsers.add_parser('compare', help='比较两次基准结果')
+    compare_parser.add_argument('base', help='基线结果 JSON')
+    compare_parser.add_argument('new', help='新结果 JSON')
+    compare_parser.add_argument('--threshold', type=float, default=0.1, help='判定为回退的耗时增长比例')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'compare':
+        with open(args.base, encoding='utf-8') as f:
+            base = json.load(f)
+        with open(args.new, encoding='utf-8') as f:
+            new = json.load(f)
+        rows = compare(base, new, args.threshold)
+        print(f"{'layout':<10}{'scale':>10}  {'stage':<18}{'base_s':>10}{'new_s':>10}{'ratio':>8}")
+        for row in rows:
+            flag = '  ⚠️ 回退' if row['regression'] else ''
+            print(f"{row['layout']:<10}{row['scale']:>10}  {row['stage']:<18}"
+                  f"{row['base_s']:>10.3f}{row['new_s']:>10.3f}{row['ratio']:>8.2f}{flag}")
+        return 1 if any(row['regression'] for row in rows) else 0
+
+    layouts = [item.strip() for item in args.layouts.split(',')]
+    unknown = [item for item in layouts if item not in LAYOUTS]
+    if unknown:
+        parser.error(f"未知的图层布局: {', '.join(unknown)}")
+
+    # Shapefile 字段名截断等警告与性能无关，避免淹没输出
+    warnings.simplefilter('ignore')
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix='shp_bench_') as workdir:
+        for count in _parse_scales(args.scales):
+            for layout in layouts:
+                for record in run_scenario(layout, count, workdir, workers=args.workers):
+                    print(f"{layout:<10}{count:>10}  {record['stage']:<18}{record['wall_s']:>10.3f} 秒"
+                          f"{record['features_per_s'] or 0:>14.0f} 要素/秒"
+                          f"{record['peak_rss_mb'] or 0:>10.1f} MB", file=sys.stderr, flush=True)
+                    results.append(record)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({'environment': environment(), 'results': results}, f, ensure_ascii=False, indent=2)
+    print(f"结果已保存: {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,390 @@
+"""
+命令行入口模块
+无界面批量执行空间关联（不依赖 PyQt5 / Matplotlib）
+
+用法:
+    python -m src.cli join source.shp target.shp -o output.shp --workers 8
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import List, Optional
+
+
+# 退出码
+EXIT_OK = 0
+EXIT_FAILURE = 1
+EXIT_INTERRUPTED = 130
+
+# 支持的输出格式（按扩展名，与 core.exporter.EXPORT_FORMATS 一致）
+OUTPUT_FORMATS = ('.shp', '.gpkg', '.parquet', '.fgb', '.csv')
+# 流式处理支持的输出格式（可逐批追加写出）
+STREAMING_FORMATS = ('.shp', '.gpkg', '.csv')
+# 相交边表支持的输出格式（带相交几何时为 OVERLAP_GEOMETRY_FORMATS）
+OVERLAP_FORMATS = ('.parquet', '.csv')
+OVERLAP_GEOMETRY_FORMATS = ('.parquet', '.gpkg')
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    构建命令行参数解析器
+
+    Returns:
+        ArgumentParser 实例
+    """
+    parser = argparse.ArgumentParser(prog='python -m src.cli', description='空间关联分析工具（命令行版）')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    join_parser = subparsers.add_parser('join', help='执行两个面图层的空间关联')
+    join_parser.add_argument('source', help='源图层 Shapefile 路径')
+    join_parser.add_argument('target', help='目标图层 Shapefile 路径')
+    join_parser.add_argument('-o', '--output', required=True, help='输出文件路径（.shp、.gpkg、.parquet、.fgb 或 .csv）')
+    join_parser.add_argument('--workers', type=int, default=None, help='并行进程数（默认单进程）')
+    join_parser.add_argument('--engine', choices=('vectorized', 'loop'), default='vectorized', help='处理引擎')
+    join_parser.add_argument('--area-mode', choices=('planar', 'equal_area', 'geodesic'), default='planar',
+                             help='面积计算方式（地理坐标系图层请使用 equal_area 或 geodesic，单位为平方米）')
+    join_parser.add_argument('--io-engine', choices=('auto', 'pyogrio', 'fiona'), default='auto', help='读取引擎')
+    join_parser.add_argument('--cache-dir', default=None,
+                             help='图层缓存目录（按文件内容缓存修复后的图层，重复处理同一图层时跳过读取和修复）')
+    join_parser.add_argument('--source-id', default=None, help='源图层ID字段名（默认使用索引）')
+    join_parser.add_argument('--target-id', default=None, help='目标图层ID字段名（默认使用索引）')
+    join_parser.add_argument('--overlaps', action='store_true',
+                             help='输出所有相交的源×目标要素对（边表，含相交面积及占源、目标要素的比例；输出 .parquet 或 .csv）')
+    join_parser.add_argument('--overlap-geometry', action='store_true',
+                             help='边表同时输出每对的相交几何（源要素被目标裁剪后的部分；需配合 --overlaps，'
+                                  '输出 .parquet 或 .gpkg）')
+    join_parser.add_argument('--checkpoint-dir', default=None,
+                             help='检查点目录（定期保存已完成的结果，中断后以相同参数重新运行时从检查点继续）')
+    join_parser.add_argument('--batch-size', type=int, default=None,
+                             help='流式处理：每批读取的源要素数（内存受批大小限制，不支持 --workers）')
+    join_parser.add_argument('--timing', action='store_true',
+                             help='处理结束后输出各阶段耗时（墙钟、CPU）、调用计数和峰值内存')
+    join_parser.add_argument('--profile', default=None, metavar='FILE',
+                             help='用 cProfile 分析整个处理过程并将统计数据写入该文件（可用 pstats 或 snakeviz 查看）')
+    join_parser.add_argument('-q', '--quiet', action='store_true', help='不输出进度信息')
+    join_parser.set_defaults(handler=run_join)
+
+    return parser
+
+
+def _log(message: str, quiet: bool = False):
+    """输出一行日志到标准错误"""
+    if not quiet:
+        print(message, file=sys.stderr, flush=True)
+
+
+def _log_crs_report(report, quiet: bool = False):
+    """输出坐标系对齐信息（仅在发生重投影时）"""
+    if report and report['reprojected']:
+        layer = '源图层' if report['reprojected'] == 'source' else '目标图层'
+        _log(f"⚠️ 两个图层坐标系不一致，已将{layer}重投影，耗时 {report['elapsed']:.2f} 秒", quiet)
+
+
+def _log_instrumentation(instrumentation, enabled: bool):
+    """输出计量报告（指定 --timing 时，不受 --quiet 影响）"""
+    if enabled:
+        for line in instrumentation.format_report():
+            _log(f"⏱️ {line}")
+
+
+def _log_checkpoint_report(report, quiet: bool = False):
+    """输出检查点恢复和保存信息"""
+    if report:
+        _log(f"检查点: 恢复 {report['resumed']} 个要素，本次保存 {report['saved']} 个要素，"
+             f"额外耗时 {report['elapsed']:.2f} 秒", quiet)
+
+
+def run_join(args: argparse.Namespace) -> int:
+    """
+    执行 join 子命令
+
+    Args:
+        args: 解析后的命令行参数
+
+    Returns:
+        退出码
+    """
+    # 延迟导入，保证 --help 等命令启动迅速
+    from .core.loader import ShapefileLoader
+    from .core.validator import GeometryValidator
+    from .core.processor import SpatialJoinProcessor
+    from .core.exporter import ResultExporter
+
+    extension = os.path.splitext(args.output)[1].lower()
+    if extension not in OUTPUT_FORMATS:
+        _log(f"❌ 不支持的输出格式: {extension or args.output}（可选: {', '.join(OUTPUT_FORMATS)}）")
+        return EXIT_FAILURE
+
+    # 只解析文件头检查ID字段，避免处理完成后才发现字段不存在
+    from .utils.helpers import validate_shapefile_path
+    for label, path, id_field in (('源图层', args.source, args.source_id), ('目标图层', args.target, args.target_id)):
+        is_valid, errors = validate_shapefile_path(path, required_fields=[id_field] if id_field else None)
+        if not is_valid:
+            _log(f"❌ {label}无效: {errors[0]}")
+            return EXIT_FAILURE
+
+    total_start = time.perf_counter()
+    cache = None
+    if args.cache_dir is not None:
+        from .core.layer_cache import LayerCache
+        cache = LayerCache(args.cache_dir)
+    # 加载、修复、处理和导出共用一个计量实例
+    from .core.instrumentation import Instrumentation
+    loader = ShapefileLoader(engine=args.io_engine, cache=cache, instrumentation=Instrumentation())
+
+    if args.overlaps:
+        return run_overlap_join(args, loader, total_start)
+    if args.overlap_geometry:
+        _log("⚠️ --overlap-geometry 需配合 --overlaps 使用，已忽略", args.quiet)
+    if args.batch_size is not None:
+        return run_streaming_join(args, loader, total_start)
+
+    # 加载图层
+    start = time.perf_counter()
+    source_gdf, errors = loader.load_layer(args.source)
+    if errors:
+        _log(f"❌ 源图层加载失败: {errors[0]}")
+        return EXIT_FAILURE
+    target_gdf, errors = loader.load_layer(args.target)
+    if errors:
+        _log(f"❌ 目标图层加载失败: {errors[0]}")
+        return EXIT_FAILURE
+    _log(f"加载完成: 源图层 {len(source_gdf)} 个要素，目标图层 {len(target_gdf)} 个要素，"
+         f"耗时 {time.perf_counter() - start:.2f} 秒", args.quiet)
+
+    # 空间关联
+    instrumentation = loader.instrumentation
+    processor = SpatialJoinProcessor(GeometryValidator(instrumentation), engine=args.engine,
+                                     instrumentation=instrumentation)
+
+    def on_progress(done: int, total: int):
+        if not args.quiet and sys.stderr.isatty():
+            print(f"\r处理中: {done}/{total}", end='', file=sys.stderr, flush=True)
+
+    start = time.perf_counter()
+    try:
+        results = processor.process(
+            source_gdf,
+            target_gdf,
+            source_id_field=args.source_id,
+            target_id_field=args.target_id,
+            workers=args.workers,
+            progress_callback=on_progress,
+            area_mode=args.area_mode,
+            checkpoint_dir=args.checkpoint_dir
+        )
+    except Exception as e:
+        _log(f"\n❌ 处理失败: {str(e)}")
+        _log_checkpoint_report(processor.checkpoint_report if args.checkpoint_dir else None)
+        return EXIT_FAILURE
+    elapsed = time.perf_counter() - start
+    if not args.quiet and sys.stderr.isatty():
+        print(file=sys.stderr)
+
+    _log_checkpoint_report(processor.checkpoint_report if args.checkpoint_dir else None, args.quiet)
+    stats = processor.get_statistics(results)
+    report = processor.repair_report
+    _log(f"几何修复: 源图层 {report['source_repaired']} 个，目标图层 {report['target_repaired']} 个，"
+         f"耗时 {report['elapsed']:.2f} 秒", args.quiet)
+    _log_crs_report(processor.crs_report, args.quiet)
+    _log(f"处理完成: 完全包含 {stats['contained']}，部分重叠 {stats['partial_overlap']}，"
+         f"无相交 {stats['no_intersection']}，耗时 {elapsed:.2f} 秒，"
+         f"{stats['total'] / elapsed if elapsed > 0 else 0:.0f} 要素/秒", args.quiet)
+
+    # 导出
+    start = time.perf_counter()
+    success, errors = ResultExporter(instrumentation).export(source_gdf, results, args.output)
+    if not success:
+        _log(f"❌ 导出失败: {errors[0]}")
+        return EXIT_FAILURE
+    _log(f"结果已保存: {args.output}，耗时 {time.perf_counter() - start:.2f} 秒", args.quiet)
+    _log(f"总耗时 {time.perf_counter() - total_start:.2f} 秒", args.quiet)
+    _log_instrumentation(instrumentation, args.timing)
+
+    return EXIT_OK
+
+
+def run_overlap_join(args: argparse.Namespace, loader, total_start: float) -> int:
+    """
+    执行 join --overlaps：输出所有相交的源×目标要素对（逐块计算并写出）
+
+    Args:
+        args: 解析后的命令行参数
+        loader: 图层加载器
+        total_start: 开始时间
+
+    Returns:
+        退出码
+    """
+    from .core.validator import GeometryValidator
+    from .core.processor import SpatialJoinProcessor
+    from .core.exporter import ResultExporter
+
+    extension = os.path.splitext(args.output)[1].lower()
+    formats = OVERLAP_GEOMETRY_FORMATS if args.overlap_geometry else OVERLAP_FORMATS
+    if extension not in formats:
+        _log(f"❌ 边表不支持输出格式: {extension}（可选: {', '.join(formats)}）")
+        return EXIT_FAILURE
+    for option, ignored in (('--workers', args.workers is not None and args.workers > 1),
+                            ('--batch-size', args.batch_size is not None),
+                            ('--checkpoint-dir', args.checkpoint_dir is not None)):
+        if ignored:
+            _log(f"⚠️ 边表模式不支持 {option}，已忽略", args.quiet)
+
+    source_gdf, errors = loader.load_layer(args.source)
+    if errors:
+        _log(f"❌ 源图层加载失败: {errors[0]}")
+        return EXIT_FAILURE
+    target_gdf, errors = loader.load_layer(args.target)
+    if errors:
+        _log(f"❌ 目标图层加载失败: {errors[0]}")
+        return EXIT_FAILURE
+
+    instrumentation = loader.instrumentation
+    processor = SpatialJoinProcessor(GeometryValidator(instrumentation), engine=args.engine,
+                                     instrumentation=instrumentation)
+    pair_count = 0
+
+    def on_progress(done: int, total: int):
+        if not args.quiet and sys.stderr.isatty():
+            print(f"\r处理中: {done}/{total}，{pair_count} 对", end='', file=sys.stderr, flush=True)
+
+    def counted(tables):
+        nonlocal pair_count
+        for table in tables:
+            pair_count += len(table)
+            yield table
+
+    start = time.perf_counter()
+    try:
+        success, errors = ResultExporter(instrumentation).export_overlaps(
+            counted(processor.iter_overlaps(
+                source_gdf,
+                target_gdf,
+                source_id_field=args.source_id,
+                target_id_field=args.target_id,
+                progress_callback=on_progress,
+                area_mode=args.area_mode,
+                keep_geometry=args.overlap_geometry
+            )),
+            args.output
+        )
+    except Exception as e:
+        _log(f"\n❌ 处理失败: {str(e)}")
+        return EXIT_FAILURE
+    elapsed = time.perf_counter() - start
+    if not args.quiet and sys.stderr.isatty():
+        print(file=sys.stderr)
+    if not success:
+        _log(f"❌ 导出失败: {errors[0]}")
+        return EXIT_FAILURE
+
+    _log_crs_report(processor.crs_report, args.quiet)
+    _log(f"处理完成: {len(source_gdf)} 个源要素，{pair_count} 对相交要素，耗时 {elapsed:.2f} 秒", args.quiet)
+    _log(f"结果已保存: {args.output}", args.quiet)
+    _log(f"总耗时 {time.perf_counter() - total_start:.2f} 秒", args.quiet)
+    _log_instrumentation(instrumentation, args.timing)
+
+    return EXIT_OK
+
+
+def run_streaming_join(args: argparse.Namespace, loader, total_start: float) -> int:
+    """
+    以流式方式执行 join 子命令（源图层按批读取并逐批写出）
+
+    Args:
+        args: 解析后的命令行参数
+        loader: 图层加载器
+        total_start: 开始时间
+
+    Returns:
+        退出码
+    """
+    from .core.validator import GeometryValidator
+    from .core.processor import SpatialJoinProcessor
+    from .core.streaming import stream_join
+
+    if args.batch_size <= 0:
+        _log(f"❌ 批大小必须为正数: {args.batch_size}")
+        return EXIT_FAILURE
+    extension = os.path.splitext(args.output)[1].lower()
+    if extension not in STREAMING_FORMATS:
+        _log(f"❌ 流式处理不支持输出格式: {extension}（可选: {', '.join(STREAMING_FORMATS)}）")
+        return EXIT_FAILURE
+    if args.workers is not None and args.workers > 1:
+        _log("⚠️ 流式处理在单进程中执行，已忽略 --workers", args.quiet)
+    if args.checkpoint_dir is not None:
+        _log("⚠️ 流式处理不支持检查点，已忽略 --checkpoint-dir", args.quiet)
+
+    target_gdf, errors = loader.load_layer(args.target)
+    if errors:
+        _log(f"❌ 目标图层加载失败: {errors[0]}")
+        return EXIT_FAILURE
+
+    instrumentation = loader.instrumentation
+    processor = SpatialJoinProcessor(GeometryValidator(instrumentation), engine=args.engine,
+                                     instrumentation=instrumentation)
+
+    def on_progress(done: int, total: int):
+        if not args.quiet and sys.stderr.isatty():
+            print(f"\r处理中: {done}/{total}", end='', file=sys.stderr, flush=True)
+
+    start = time.perf_counter()
+    try:
+        stats = stream_join(
+            args.source,
+            target_gdf,
+            args.output,
+            processor,
+            loader=loader,
+            batch_size=args.batch_size,
+            source_id_field=args.source_id,
+            target_id_field=args.target_id,
+            progress_callback=on_progress,
+            area_mode=args.area_mode
+        )
+    except Exception as e:
+        _log(f"\n❌ 处理失败: {str(e)}")
+        return EXIT_FAILURE
+    elapsed = time.perf_counter() - start
+    if not args.quiet and sys.stderr.isatty():
+        print(file=sys.stderr)
+
+    report = processor.repair_report
+    _log(f"几何修复: 源图层 {report['source_repaired']} 个，目标图层 {report['target_repaired']} 个，"
+         f"耗时 {report['elapsed']:.2f} 秒", args.quiet)
+    _log_crs_report(processor.crs_report, args.quiet)
+    _log(f"处理完成: 完全包含 {stats['contained']}，部分重叠 {stats['partial_overlap']}，"
+         f"无相交 {stats['no_intersection']}，耗时 {elapsed:.2f} 秒，"
+         f"{stats['total'] / elapsed if elapsed > 0 else 0:.0f} 要素/秒", args.quiet)
+    _log(f"结果已保存: {args.output}", args.quiet)
+    _log(f"总耗时 {time.perf_counter() - total_start:.2f} 秒", args.quiet)
+    _log_instrumentation(instrumentation, args.timing)
+
+    return EXIT_OK
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    命令行主函数
+
+    Args:
+        argv: 命令行参数（默认使用 sys.argv）
+
+    Returns:
+        退出码
+    """
+    args = build_parser().parse_args(argv)
+    try:
+        from .core.instrumentation import profile_to
+        with profile_to(getattr(args, 'profile', None)):
+            return args.handler(args)
+    except KeyboardInterrupt:
+        _log("\n⚠️ 已中断")
+        return EXIT_INTERRUPTED
+
+
+if __name__ == '__main__':
+    sys.exit(main())
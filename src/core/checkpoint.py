@@ -0,0 +1,189 @@
+"""
+检查点模块
+长时间处理时定期将已完成的结果块写入工作目录，中断后可从最近的检查点继续
+"""
+
+from typing import Dict, Any, List, Tuple, Optional
+import hashlib
+import json
+import os
+import time
+import numpy as np
+import geopandas as gpd
+import shapely
+
+
+# 检查点格式版本，结果数组或清单格式变化时递增以使旧检查点失效
+CHECKPOINT_VERSION = 1
+
+MANIFEST_NAME = 'manifest.json'
+
+# 每个结果块保存的数组
+CHUNK_ARRAYS = ('positions', 'target_pos', 'relations', 'areas', 'source_areas')
+
+
+def layer_fingerprint(gdf: gpd.GeoDataFrame) -> str:
+    """
+    计算图层几何和坐标系的指纹（属性不影响关联结果，不参与计算）
+
+    直接对坐标数组和各几何的类型、部件数、内环数、坐标数取哈希，比逐要素转换为 WKB 快数倍。
+
+    Args:
+        gdf: 图层 GeoDataFrame
+
+    Returns:
+        十六进制哈希字符串
+    """
+    digest = hashlib.sha256()
+    digest.update(str(len(gdf)).encode())
+    digest.update((gdf.crs.to_wkt() if gdf.crs is not None else '').encode())
+    geoms = np.asarray(gdf.geometry.values)
+    for values in (
+        shapely.get_type_id(geoms),
+        shapely.get_num_geometries(geoms),
+        shapely.get_num_interior_rings(geoms),
+        shapely.get_num_coordinates(geoms),
+        shapely.get_coordinates(geoms),
+    ):
+        digest.update(np.ascontiguousarray(values).tobytes())
+    return digest.hexdigest()
+
+
+class JoinCheckpoint:
+    """空间关联检查点（结果块以 .npz 保存，进度清单以 JSON 保存）"""
+
+    def __init__(self, work_dir: str, fingerprint: Dict[str, Any], interval: float = 60.0):
+        """
+        打开检查点目录
+
+        目录中已有清单且指纹一致时沿用其中已完成的结果块，否则删除旧的结果块重新开始。
+
+        Args:
+            work_dir: 工作目录（不存在时自动创建）
+            fingerprint: 输入指纹（图层指纹和影响结果的处理参数，须可 JSON 序列化）
+            interval: 写出检查点的最短间隔（秒）
+        """
+        self.work_dir = work_dir
+        self.fingerprint = fingerprint
+        self.interval = interval
+        os.makedirs(work_dir, exist_ok=True)
+
+        self.chunks: List[Dict[str, Any]] = []
+        manifest = self._read_manifest()
+        if manifest is not None and manifest.get('version') == CHECKPOINT_VERSION \
+                and manifest.get('fingerprint') == fingerprint:
+            self.chunks = manifest['chunks']
+        else:
+            self.clear()
+
+        self._pending: List[Tuple[np.ndarray, ...]] = []
+        self._last_flush = time.perf_counter()
+        self.write_elapsed = 0.0
+
+    @property
+    def done_count(self) -> int:
+        """已写入检查点的要素数"""
+        return sum(chunk['count'] for chunk in self.chunks)
+
+    def load(self, count: int) -> Tuple[np.ndarray, ...]:
+        """
+        读取已完成的结果
+
+        Args:
+            count: 源要素总数
+
+        Returns:
+            (done, target_pos, relations, areas, source_areas): 已完成标记和各结果数组（长度为 count）
+
+        Raises:
+            ValueError: 结果块损坏或与源要素数不符
+        """
+        done = np.zeros(count, dtype=bool)
+        target_pos = np.full(count, -1, dtype=np.int64)
+        relations = np.zeros(count, dtype=np.int8)
+        areas = np.zeros(count, dtype=np.float64)
+        source_areas = np.zeros(count, dtype=np.float64)
+
+        for chunk in self.chunks:
+            with np.load(os.path.join(self.work_dir, chunk['file'])) as data:
+                positions = data['positions']
+                if len(positions) != chunk['count'] or (len(positions) and positions.max() >= count):
+                    raise ValueError(f"检查点结果块与源图层不符: {chunk['file']}")
+                done[positions] = True
+                target_pos[positions] = data['target_pos']
+                relations[positions] = data['relations']
+                areas[positions] = data['areas']
+                source_areas[positions] = data['source_areas']
+
+        return done, target_pos, relations, areas, source_areas
+
+    def add(
+        self,
+        positions: np.ndarray,
+        target_pos: np.ndarray,
+        relations: np.ndarray,
+        areas: np.ndarray,
+        source_areas: np.ndarray
+    ):
+        """
+        记录一块已完成的结果，距上次写出超过 interval 秒时写出检查点
+
+        Args:
+            positions: 这些结果对应的源要素位置
+            target_pos: 匹配目标下标
+            relations: 关联类型编码
+            areas: 相交面积
+            source_areas: 源要素面积
+        """
+        self._pending.append((positions, target_pos, relations, areas, source_areas))
+        if time.perf_counter() - self._last_flush >= self.interval:
+            self.flush()
+
+    def flush(self):
+        """将尚未写出的结果合并为一个结果块写出，并更新清单"""
+        self._last_flush = time.perf_counter()
+        if not self._pending:
+            return
+
+        start = time.perf_counter()
+        arrays = [np.concatenate(parts) for parts in zip(*self._pending)]
+        self._pending = []
+
+        name = f'chunk-{len(self.chunks):05d}.npz'
+        path = os.path.join(self.work_dir, name)
+        # 先写临时文件再替换，中途崩溃不会留下不完整的结果块
+        temp_path = path + '.tmp.npz'
+        np.savez(temp_path, **dict(zip(CHUNK_ARRAYS, arrays)))
+        os.replace(temp_path, path)
+
+        self.chunks.append({'file': name, 'count': int(len(arrays[0]))})
+        self._write_manifest()
+        self.write_elapsed += time.perf_counter() - start
+
+    def clear(self):
+        """删除全部结果块，清单重置为当前指纹"""
+        for name in os.listdir(self.work_dir):
+            if name.startswith('chunk-') and name.endswith('.npz'):
+                os.remove(os.path.join(self.work_dir, name))
+        self.chunks = []
+        self._write_manifest()
+
+    def _read_manifest(self) -> Optional[Dict[str, Any]]:
+        """读取清单（不存在或损坏时返回 None）"""
+        try:
+            with open(os.path.join(self.work_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_manifest(self):
+        """原子地写出清单"""
+        path = os.path.join(self.work_dir, MANIFEST_NAME)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': CHECKPOINT_VERSION,
+                'fingerprint': self.fingerprint,
+                'chunks': self.chunks,
+            }, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, path)
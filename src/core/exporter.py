@@ -3,19 +3,59 @@
 提供处理结果导出功能
 """
 
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Union, Iterable, Optional
 import geopandas as gpd
+import numpy as np
 import pandas as pd
+import shapely
+import json
 import os
 import urllib.parse
+from .result import JoinResult, OverlapTable, attribute_column_names
+from .instrumentation import Instrumentation
+
+# 可选依赖：pyogrio 在一个事务中批量写入 GeoPackage，pyarrow 用于写出 GeoParquet
+try:
+    import pyogrio
+except ImportError:
+    pyogrio = None
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+# 支持的输出格式：扩展名 -> 导出方法名
+EXPORT_FORMATS = {
+    '.shp': 'export_to_shapefile',
+    '.gpkg': 'export_to_geopackage',
+    '.parquet': 'export_to_geoparquet',
+    '.fgb': 'export_to_flatgeobuf',
+    '.csv': 'export_to_csv',
+}
+
+# 支持逐批追加写出的格式（流式处理）
+APPEND_FORMATS = ('.shp', '.gpkg', '.csv')
+
+# 相交边表支持的输出格式及字段
+OVERLAP_FORMATS = ('.parquet', '.csv', '.gpkg')
+# 带相交几何的边表支持的输出格式（.parquet 写出为 GeoParquet）
+OVERLAP_GEOMETRY_FORMATS = ('.parquet', '.gpkg')
+OVERLAP_COLUMNS = ['source_id', 'target_id', 'intersection_area', 'source_ratio', 'target_ratio']
 
 
 class ResultExporter:
     """结果导出器类"""
 
-    def __init__(self):
-        """初始化导出器"""
-        pass
+    def __init__(self, instrumentation: Optional[Instrumentation] = None):
+        """
+        初始化导出器
+
+        Args:
+            instrumentation: 计量实例（export、append_batch、export_overlaps 的写出记录为 export 阶段；默认新建）
+        """
+        self.instrumentation = instrumentation if instrumentation is not None else Instrumentation()
 
     @staticmethod
     def _encode_field_name(field_name: str, prefix: str = 't_') -> str:
@@ -92,10 +132,109 @@ class ResultExporter:
 
         return result
 
+    def _encode_field_names(self, field_names: List[str], prefix: str = 't_') -> Dict[str, str]:
+        """
+        按字段结构批量编码字段名（每个字段只编码一次）
+
+        Args:
+            field_names: 原始字段名列表
+            prefix: 字段前缀
+
+        Returns:
+            原始字段名到编码后字段名的映射
+        """
+        encoded = {}
+        for key in field_names:
+            col_name = self._encode_field_name(key, prefix=prefix)
+            if col_name == key:  # 仍然是中文名，编码失败
+                print(f"⚠️ 警告: 字段 '{key}' 未能正确编码")
+            encoded[key] = col_name
+        return encoded
+
+    def _target_field_names(self, field_names: List[str], encode_fields: bool = True) -> Dict[str, str]:
+        """
+        目标字段在输出图层中的字段名
+
+        Args:
+            field_names: 目标图层字段名列表
+            encode_fields: True 按 Shapefile 限制编码（前缀 't_'），False 保留完整字段名（前缀 'target_'）
+
+        Returns:
+            原始字段名到输出字段名的映射
+        """
+        if encode_fields:
+            return self._encode_field_names(field_names, prefix='t_')
+        return {key: f'target_{key}' for key in field_names}
+
+    def build_output_gdf(
+        self,
+        source_gdf: gpd.GeoDataFrame,
+        results: Union[JoinResult, List[Dict[str, Any]]],
+        encode_fields: bool = True
+    ) -> gpd.GeoDataFrame:
+        """
+        构建输出图层：源图层字段 + 目标字段 + 关联信息字段
+
+        所有新增字段按列一次性生成，结果按位置与源要素一一对应。
+
+        Args:
+            source_gdf: 源图层 GeoDataFrame
+            results: 关联结果（JoinResult 或旧的结果字典列表）
+            encode_fields: True 时目标字段名按 Shapefile 限制编码（短前缀 't_'），
+                False 时保留完整的 Unicode 字段名（前缀 'target_'）
+
+        Returns:
+            输出 GeoDataFrame
+        """
+        count = len(source_gdf)
+
+        if isinstance(results, JoinResult):
+            target_attrs = results.target_attributes()
+            relation_info = pd.DataFrame({
+                'relation_type': results.relation_type,
+                'intersection_area': results.intersection_area,
+                'overlap_ratio': results.overlap_ratio,
+            })
+        else:
+            results = results[:count]
+            target_attrs = pd.DataFrame.from_records(
+                [r['target_attributes'] for r in results], index=range(len(results))
+            )
+            relation_info = pd.DataFrame({
+                'relation_type': [r['relation_type'] for r in results],
+                'intersection_area': [r['intersection_area'] for r in results],
+                'overlap_ratio': [r['overlap_ratio'] for r in results],
+            })
+
+        # Shapefile 使用短前缀 't_' 而不是 'target_' 以节省空间（字段名最长 10 字符）
+        columns = {}
+        for key, col_name in self._target_field_names(list(target_attrs.columns), encode_fields).items():
+            columns[col_name] = target_attrs[key]
+        columns.update(relation_info.items())
+
+        # 结果条数少于源要素时，多出的源要素对应字段为空
+        extra = pd.DataFrame(columns).reindex(range(count))
+        extra.index = source_gdf.index
+
+        # 与源字段同名的列直接覆盖，其余列追加在末尾
+        output_gdf = source_gdf.copy()
+        existing = [col for col in extra.columns if col in output_gdf.columns]
+        for col in existing:
+            output_gdf[col] = extra[col]
+        new_columns = extra.drop(columns=existing)
+        if len(new_columns.columns):
+            output_gdf = gpd.GeoDataFrame(
+                pd.concat([output_gdf, new_columns], axis=1),
+                geometry=source_gdf.geometry.name,
+                crs=source_gdf.crs
+            )
+
+        return output_gdf
+
     def export_to_shapefile(
         self,
         source_gdf: gpd.GeoDataFrame,
-        results: List[Dict[str, Any]],
+        results: Union[JoinResult, List[Dict[str, Any]]],
         output_path: str,
         field_prefix: str = 'target_'
     ) -> Tuple[bool, List[str]]:
@@ -104,7 +243,7 @@ class ResultExporter:
 
         Args:
             source_gdf: 源图层 GeoDataFrame
-            results: 处理结果列表
+            results: 关联结果（JoinResult 或旧的结果字典列表）
             output_path: 输出文件路径
             field_prefix: 目标字段前缀
 
@@ -114,35 +253,7 @@ class ResultExporter:
         errors = []
 
         try:
-            # 复制源图层
-            output_gdf = source_gdf.copy()
-
-            # 添加目标字段
-            for idx, result in enumerate(results):
-                # 找到对应的源要素（按顺序）
-                if idx < len(output_gdf):
-                    # 添加目标属性（使用短前缀以节省空间）
-                    for key, value in result['target_attributes'].items():
-                        # 使用短前缀 't_' 而不是 'target_' 以节省空间
-                        col_name = self._encode_field_name(key, prefix='t_')
-
-                        # 调试信息（可以删除）
-                        if col_name == key:  # 仍然是中文名，编码失败
-                            print(f"⚠️ 警告: 字段 '{key}' 未能正确编码")
-
-                        if col_name not in output_gdf.columns:
-                            output_gdf[col_name] = None
-                        output_gdf.at[idx, col_name] = value
-
-                    # 添加关联信息字段
-                    output_gdf.at[idx, 'relation_type'] = result['relation_type']
-                    if 'intersection_area' not in output_gdf.columns:
-                        output_gdf['intersection_area'] = None
-                    output_gdf.at[idx, 'intersection_area'] = result['intersection_area']
-
-                    if 'overlap_ratio' not in output_gdf.columns:
-                        output_gdf['overlap_ratio'] = None
-                    output_gdf.at[idx, 'overlap_ratio'] = result['overlap_ratio']
+            output_gdf = self.build_output_gdf(source_gdf, results)
 
             # 确保输出目录存在
             output_dir = os.path.dirname(output_path)
@@ -158,16 +269,128 @@ class ResultExporter:
             errors.append(f"导出失败: {str(e)}")
             return False, errors
 
+    def export_to_geopackage(
+        self,
+        source_gdf: gpd.GeoDataFrame,
+        results: Union[JoinResult, List[Dict[str, Any]]],
+        output_path: str,
+        layer: str = None
+    ) -> Tuple[bool, List[str]]:
+        """
+        导出为 GeoPackage（保留完整字段名，使用 pyogrio 时在一个事务中批量写入）
+
+        Args:
+            source_gdf: 源图层 GeoDataFrame
+            results: 关联结果（JoinResult 或旧的结果字典列表）
+            output_path: 输出文件路径
+            layer: 图层名（默认使用文件名）
+
+        Returns:
+            (success, error_messages): 是否成功和错误信息列表
+        """
+        try:
+            output_gdf = self.build_output_gdf(source_gdf, results, encode_fields=False)
+            self._write_vector(output_gdf, output_path, 'GPKG', layer=layer)
+            return True, []
+
+        except Exception as e:
+            return False, [f"导出失败: {str(e)}"]
+
+    def export_to_geoparquet(
+        self,
+        source_gdf: gpd.GeoDataFrame,
+        results: Union[JoinResult, List[Dict[str, Any]]],
+        output_path: str,
+        compression: str = 'zstd'
+    ) -> Tuple[bool, List[str]]:
+        """
+        导出为 GeoParquet（列式压缩存储，保留完整字段名，附带外包框列便于按范围读取）
+
+        Args:
+            source_gdf: 源图层 GeoDataFrame
+            results: 关联结果（JoinResult 或旧的结果字典列表）
+            output_path: 输出文件路径
+            compression: 压缩算法（'zstd'、'snappy'、'gzip' 或 None）
+
+        Returns:
+            (success, error_messages): 是否成功和错误信息列表
+        """
+        if pyarrow is None:
+            return False, ["导出 GeoParquet 需要安装 pyarrow"]
+
+        try:
+            output_gdf = self.build_output_gdf(source_gdf, results, encode_fields=False)
+            self._ensure_output_dir(output_path)
+            output_gdf.to_parquet(output_path, index=False, compression=compression, write_covering_bbox=True)
+            return True, []
+
+        except Exception as e:
+            return False, [f"导出失败: {str(e)}"]
+
+    def export_to_flatgeobuf(
+        self,
+        source_gdf: gpd.GeoDataFrame,
+        results: Union[JoinResult, List[Dict[str, Any]]],
+        output_path: str
+    ) -> Tuple[bool, List[str]]:
+        """
+        导出为 FlatGeobuf（保留完整字段名，写入空间索引）
+
+        Args:
+            source_gdf: 源图层 GeoDataFrame
+            results: 关联结果（JoinResult 或旧的结果字典列表）
+            output_path: 输出文件路径
+
+        Returns:
+            (success, error_messages): 是否成功和错误信息列表
+        """
+        try:
+            output_gdf = self.build_output_gdf(source_gdf, results, encode_fields=False)
+            self._write_vector(output_gdf, output_path, 'FlatGeobuf', SPATIAL_INDEX='YES')
+            return True, []
+
+        except Exception as e:
+            return False, [f"导出失败: {str(e)}"]
+
+    def export(
+        self,
+        source_gdf: gpd.GeoDataFrame,
+        results: Union[JoinResult, List[Dict[str, Any]]],
+        output_path: str
+    ) -> Tuple[bool, List[str]]:
+        """
+        按扩展名选择格式导出（见 EXPORT_FORMATS）
+
+        Args:
+            source_gdf: 源图层 GeoDataFrame
+            results: 关联结果（JoinResult 或旧的结果字典列表）
+            output_path: 输出文件路径
+
+        Returns:
+            (success, error_messages): 是否成功和错误信息列表
+        """
+        extension = os.path.splitext(output_path)[1].lower()
+        if extension not in EXPORT_FORMATS:
+            return False, [f"不支持的输出格式: {extension or output_path}（可选: {', '.join(EXPORT_FORMATS)}）"]
+        with self.instrumentation.stage('export'):
+            if extension == '.csv':
+                success, errors = self.export_to_csv(results, output_path)
+            else:
+                success, errors = getattr(self, EXPORT_FORMATS[extension])(source_gdf, results, output_path)
+        if success:
+            self.instrumentation.count('features_written', len(results))
+        return success, errors
+
     def export_to_csv(
         self,
-        results: List[Dict[str, Any]],
+        results: Union[JoinResult, List[Dict[str, Any]]],
         output_path: str
     ) -> Tuple[bool, List[str]]:
         """
         导出为 CSV 报告
 
         Args:
-            results: 处理结果列表
+            results: 关联结果（JoinResult 或旧的结果字典列表）
             output_path: 输出文件路径
 
         Returns:
@@ -176,6 +399,10 @@ class ResultExporter:
         errors = []
 
         try:
+            # 列式结果直接生成报告表
+            if isinstance(results, JoinResult):
+                return self._write_csv(results.to_dataframe(), output_path)
+
             # 转换为 DataFrame
             rows = []
             for result in results:
@@ -187,28 +414,306 @@ class ResultExporter:
                     'overlap_ratio': result['overlap_ratio'],
                 }
 
-                # 添加源属性
-                for key, value in result['source_attributes'].items():
-                    row[f'source_{key}'] = value
-
-                # 添加目标属性
-                for key, value in result['target_attributes'].items():
-                    row[f'target_{key}'] = value
+                # 添加源属性、目标属性（与关联信息列重名的字段改名，见 attribute_column_names）
+                for side in ('source', 'target'):
+                    attributes = result[f'{side}_attributes']
+                    for key, col_name in attribute_column_names(side, list(attributes)).items():
+                        row[col_name] = attributes[key]
 
                 rows.append(row)
 
-            df = pd.DataFrame(rows)
+            return self._write_csv(pd.DataFrame(rows), output_path)
 
-            # 确保输出目录存在
+        except Exception as e:
+            errors.append(f"导出失败: {str(e)}")
+            return False, errors
+
+    def append_batch(
+        self,
+        source_gdf: gpd.GeoDataFrame,
+        results: JoinResult,
+        output_path: str,
+        append: bool
+    ) -> Tuple[bool, List[str]]:
+        """
+        将一批关联结果写入（或追加到）输出文件，用于流式处理
+
+        输出格式由扩展名决定（见 APPEND_FORMATS）。为保证各批次字段类型一致，目标字段的类型
+        取自目标图层，其中整数、布尔字段统一写为浮点数（无关联时为空值）。
+
+        Args:
+            source_gdf: 本批源要素 GeoDataFrame
+            results: 本批关联结果
+            output_path: 输出文件路径
+            append: False 表示新建（覆盖）文件，True 表示追加
+
+        Returns:
+            (success, error_messages): 是否成功和错误信息列表
+        """
+        errors = []
+        extension = os.path.splitext(output_path)[1].lower()
+
+        try:
             output_dir = os.path.dirname(output_path)
             if output_dir and not os.path.exists(output_dir):
                 os.makedirs(output_dir)
 
-            # 保存为 CSV
-            df.to_csv(output_path, index=False, encoding='utf-8-sig')
-
+            with self.instrumentation.stage('export'):
+                if extension == '.csv':
+                    df = results.to_dataframe()
+                    self._cast_target_columns(df, results, results.attribute_columns('target'))
+                    df.to_csv(
+                        output_path,
+                        index=False,
+                        mode='a' if append else 'w',
+                        header=not append,
+                        encoding='utf-8' if append else 'utf-8-sig'
+                    )
+                elif extension in ('.shp', '.gpkg'):
+                    encode_fields = extension == '.shp'
+                    output_gdf = self.build_output_gdf(source_gdf, results, encode_fields=encode_fields)
+                    self._cast_target_columns(
+                        output_gdf, results, self._target_field_names(results.target_fields, encode_fields)
+                    )
+                    if encode_fields:
+                        output_gdf.to_file(output_path, mode='a' if append else 'w')
+                    else:
+                        self._write_vector(output_gdf, output_path, 'GPKG', mode='a' if append else 'w')
+                else:
+                    errors.append(f"不支持的输出格式: {extension}")
+                    return False, errors
+
+            self.instrumentation.count('features_written', len(results))
             return True, []
 
         except Exception as e:
             errors.append(f"导出失败: {str(e)}")
             return False, errors
+
+    @staticmethod
+    def _cast_target_columns(df: pd.DataFrame, results: JoinResult, column_names: Dict[str, str]):
+        """
+        按目标图层的字段类型统一输出列的类型（就地修改）
+
+        追加写出时文件的字段类型由第一批决定，不能从本批的值推断（整批无关联时全为空值）。
+        整数、布尔字段写为浮点数以容纳空值，其他字段保持目标图层中的类型。
+
+        Args:
+            df: 本批输出表
+            results: 本批关联结果
+            column_names: 目标字段名 -> 输出列名
+        """
+        for key, col_name in column_names.items():
+            dtype = results.target_gdf[key].dtype
+            if dtype.kind in 'iub':
+                dtype = np.dtype('float64')
+            if df[col_name].dtype != dtype:
+                df[col_name] = df[col_name].astype(dtype)
+
+    def export_overlaps(
+        self,
+        tables: Union[OverlapTable, Iterable[OverlapTable]],
+        output_path: str
+    ) -> Tuple[bool, List[str]]:
+        """
+        导出相交边表（逐块写出，传入生成器时内存占用只取决于块大小）
+
+        .parquet 为压缩的列式文件（需要 pyarrow），.csv 为文本报告。边表保留了相交几何时
+        输出为 GeoParquet 或 GeoPackage（几何统一为多面，GeoPackage 在一个事务中写入一块）。
+
+        Args:
+            tables: 边表，或逐块产出边表的可迭代对象（如 SpatialJoinProcessor.iter_overlaps）
+            output_path: 输出文件路径
+
+        Returns:
+            (success, error_messages): 是否成功和错误信息列表
+        """
+        extension = os.path.splitext(output_path)[1].lower()
+        if extension not in OVERLAP_FORMATS:
+            return False, [f"不支持的边表输出格式: {extension or output_path}（可选: {', '.join(OVERLAP_FORMATS)}）"]
+        if extension == '.parquet' and pyarrow is None:
+            return False, ["导出 Parquet 需要安装 pyarrow"]
+        if isinstance(tables, OverlapTable):
+            tables = [tables]
+
+        writer = None
+        empty = None
+        written = False
+        with_geometry = None
+        try:
+            self._ensure_output_dir(output_path)
+
+            # 计算过程中的异常（如处理被取消）直接抛出，只有写出错误作为导出失败返回
+            for table in tables:
+                if with_geometry is None:
+                    with_geometry = table.has_geometry
+                    if with_geometry and extension not in OVERLAP_GEOMETRY_FORMATS:
+                        return False, [f"带相交几何的边表不支持输出格式: {extension}"
+                                       f"（可选: {', '.join(OVERLAP_GEOMETRY_FORMATS)}）"]
+                    if not with_geometry and extension not in ('.parquet', '.csv'):
+                        return False, ["输出 GeoPackage 边表需要保留相交几何"]
+
+                df = table.to_geodataframe() if with_geometry else table.to_dataframe()
+                # 空块无法推断ID列类型，只在全部为空时写出
+                if len(df) == 0:
+                    empty = df
+                    continue
+                try:
+                    with self.instrumentation.stage('export'):
+                        writer = self._write_overlap_chunk(df, output_path, extension, writer, append=written)
+                except Exception as e:
+                    return False, [f"导出失败: {str(e)}"]
+                self.instrumentation.count('features_written', len(df))
+                written = True
+
+            if not written:
+                if empty is None:
+                    if extension == '.gpkg':
+                        return False, ["输出 GeoPackage 边表需要保留相交几何"]
+                    empty = pd.DataFrame(columns=OVERLAP_COLUMNS)
+                try:
+                    writer = self._write_overlap_chunk(empty, output_path, extension, writer, append=False)
+                except Exception as e:
+                    return False, [f"导出失败: {str(e)}"]
+
+            return True, []
+
+        except OSError as e:
+            return False, [f"导出失败: {str(e)}"]
+
+        finally:
+            if writer is not None:
+                writer.close()
+
+    def _write_overlap_chunk(self, df: pd.DataFrame, output_path: str, extension: str, writer, append: bool):
+        """
+        写出一块边表
+
+        Args:
+            df: 边表 DataFrame（带相交几何时为 GeoDataFrame）
+            output_path: 输出文件路径
+            extension: 输出格式扩展名
+            writer: 已打开的 ParquetWriter（第一块时为 None）
+            append: 是否追加到已写出的内容之后
+
+        Returns:
+            ParquetWriter（CSV、GeoPackage 时为 None）
+        """
+        if extension == '.csv':
+            df.to_csv(
+                output_path,
+                index=False,
+                mode='a' if append else 'w',
+                header=not append,
+                encoding='utf-8' if append else 'utf-8-sig'
+            )
+            return None
+
+        if isinstance(df, gpd.GeoDataFrame):
+            # 各块几何类型须一致，面统一转为多面
+            df = df.set_geometry(self._to_multipolygons(np.asarray(df.geometry.values)), crs=df.crs)
+            if extension == '.gpkg':
+                self._write_vector(df, output_path, 'GPKG', mode='a' if append else 'w',
+                                   geometry_type='MultiPolygon')
+                return None
+            arrow_table = self._geoparquet_table(df)
+        else:
+            arrow_table = pyarrow.Table.from_pandas(df, preserve_index=False)
+
+        import pyarrow.parquet as pq
+        if writer is None:
+            writer = pq.ParquetWriter(output_path, arrow_table.schema, compression='zstd')
+        writer.write_table(arrow_table.cast(writer.schema))
+        return writer
+
+    @staticmethod
+    def _to_multipolygons(geoms: np.ndarray) -> np.ndarray:
+        """将面、多面几何数组统一转为多面"""
+        parts, index = shapely.get_parts(geoms, return_index=True)
+        return shapely.multipolygons(parts, indices=index)
+
+    @staticmethod
+    def _geoparquet_table(gdf: gpd.GeoDataFrame) -> 'pyarrow.Table':
+        """
+        将一块多面 GeoDataFrame 转换为 GeoParquet 的 Arrow 表（WKB 几何列和外包框列）
+
+        GeoParquet 元数据中不写整体外包框，逐块写出时第一块的元数据对整个文件仍然成立。
+
+        Args:
+            gdf: 几何均为多面的 GeoDataFrame
+
+        Returns:
+            带 geo 元数据的 Arrow 表
+        """
+        geoms = np.asarray(gdf.geometry.values)
+        bounds = shapely.bounds(geoms)
+        table = pyarrow.Table.from_pandas(pd.DataFrame(gdf.drop(columns=gdf.geometry.name)), preserve_index=False)
+        table = table.append_column('geometry', pyarrow.array(shapely.to_wkb(geoms), type=pyarrow.binary()))
+        table = table.append_column('bbox', pyarrow.StructArray.from_arrays(
+            [pyarrow.array(bounds[:, i], type=pyarrow.float64()) for i in range(4)],
+            names=['xmin', 'ymin', 'xmax', 'ymax']
+        ))
+        metadata = {
+            'version': '1.1.0',
+            'primary_column': 'geometry',
+            'columns': {
+                'geometry': {
+                    'encoding': 'WKB',
+                    'geometry_types': ['MultiPolygon'],
+                    'crs': gdf.crs.to_json_dict() if gdf.crs is not None else None,
+                    'covering': {'bbox': {key: ['bbox', key] for key in ('xmin', 'ymin', 'xmax', 'ymax')}},
+                },
+            },
+        }
+        return table.replace_schema_metadata({'geo': json.dumps(metadata)})
+
+    @staticmethod
+    def _ensure_output_dir(output_path: str):
+        """确保输出目录存在"""
+        output_dir = os.path.dirname(output_path)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+
+    def _write_vector(self, output_gdf: gpd.GeoDataFrame, output_path: str, driver: str, mode: str = 'w', **options):
+        """
+        通过 GDAL 驱动写出矢量文件（已安装 pyogrio 时使用 pyogrio，安装 pyarrow 时以 Arrow 表传输数据）
+
+        Args:
+            output_gdf: 输出图层
+            output_path: 输出文件路径
+            driver: GDAL 驱动名
+            mode: 'w' 新建（覆盖），'a' 追加
+            **options: 驱动的图层创建选项
+        """
+        self._ensure_output_dir(output_path)
+        # 新建时先删除旧文件，避免 GeoPackage 等格式在原文件中追加新图层
+        if mode == 'w' and os.path.exists(output_path):
+            os.remove(output_path)
+        if pyogrio is not None:
+            output_gdf.to_file(
+                output_path, driver=driver, engine='pyogrio', mode=mode, use_arrow=pyarrow is not None, **options
+            )
+        else:
+            output_gdf.to_file(output_path, driver=driver, engine='fiona', mode=mode, **options)
+
+    @staticmethod
+    def _write_csv(df: pd.DataFrame, output_path: str) -> Tuple[bool, List[str]]:
+        """
+        写出 CSV 文件
+
+        Args:
+            df: 报告表
+            output_path: 输出文件路径
+
+        Returns:
+            (success, error_messages): 是否成功和错误信息列表
+        """
+        # 确保输出目录存在
+        output_dir = os.path.dirname(output_path)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+
+        # 保存为 CSV
+        df.to_csv(output_path, index=False, encoding='utf-8-sig')
+
+        return True, []
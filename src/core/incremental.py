@@ -0,0 +1,79 @@
+"""
+增量处理模块
+通过逐要素几何哈希找出两个版本图层之间变化的要素
+"""
+
+from typing import Tuple
+import numpy as np
+import pandas as pd
+import shapely
+
+
+def geometry_hashes(geoms: np.ndarray) -> np.ndarray:
+    """
+    计算每个几何的哈希（基于 WKB，坐标完全相同时哈希相同）
+
+    Args:
+        geoms: 几何数组
+
+    Returns:
+        uint64 哈希数组
+    """
+    return pd.util.hash_array(shapely.to_wkb(geoms).astype(object))
+
+
+def align_features(old_ids: np.ndarray, new_ids: np.ndarray) -> np.ndarray:
+    """
+    按要素ID将新版本要素对应到旧版本
+
+    Args:
+        old_ids: 旧版本要素ID数组
+        new_ids: 新版本要素ID数组
+
+    Returns:
+        每个新要素在旧版本中的位置（新增要素为 -1）
+
+    Raises:
+        ValueError: ID 不唯一，无法对应
+    """
+    old_index = pd.Index(old_ids)
+    if not old_index.is_unique or not pd.Index(new_ids).is_unique:
+        raise ValueError("要素ID不唯一，无法进行增量处理")
+    return old_index.get_indexer(new_ids)
+
+
+def diff_geometries(
+    old_geoms: np.ndarray,
+    new_geoms: np.ndarray,
+    old_ids: np.ndarray,
+    new_ids: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    比较两个版本图层的几何
+
+    只比较几何：属性变化不影响关联关系（结果中的属性总是从新图层中读取）。
+
+    Args:
+        old_geoms: 旧版本几何数组
+        new_geoms: 新版本几何数组
+        old_ids: 旧版本要素ID数组
+        new_ids: 新版本要素ID数组
+
+    Returns:
+        (old_pos, changed, removed): 新要素在旧版本中的位置（新增为 -1）、
+        新要素是否为新增或几何已变化、旧要素是否已在新版本中删除或几何已变化
+
+    Raises:
+        ValueError: ID 不唯一，无法对应
+    """
+    old_pos = align_features(old_ids, new_ids)
+    matched = old_pos >= 0
+
+    changed = ~matched
+    changed[matched] = geometry_hashes(new_geoms[matched]) != geometry_hashes(old_geoms[old_pos[matched]])
+
+    # 旧版本中未被对应到的要素（已删除）与几何已变化的要素
+    removed = np.ones(len(old_geoms), dtype=bool)
+    removed[old_pos[matched]] = changed[matched]
+
+    return old_pos, changed, removed
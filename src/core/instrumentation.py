@@ -0,0 +1,246 @@
+"""
+计量模块
+记录处理各阶段的耗时（墙钟时间、CPU 时间）、关键操作的调用次数和进程峰值内存，
+并可用 cProfile 导出热点分析数据
+"""
+
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Iterator
+import cProfile
+import os
+import sys
+import threading
+import time
+
+
+# 阶段名称 -> 显示名称（报告按此顺序排列，未列出的阶段排在最后）
+# match 包含 predicate 和 intersection 两个子阶段
+STAGE_LABELS = {
+    'read': '读取图层',
+    'repair': '几何修复',
+    'align': '坐标系对齐',
+    'index': '建立空间索引',
+    'match': '匹配',
+    'predicate': '  谓词判断',
+    'intersection': '  相交计算',
+    'export': '写出结果',
+}
+
+# 计数名称 -> 显示名称
+COUNTER_LABELS = {
+    'features_read': '读取要素',
+    'validity_checks': '有效性检查',
+    'repairs': '修复要素',
+    'candidates': '外包框候选对',
+    'point_tests': '顶点检查',
+    'predicate_calls': '精确谓词调用',
+    'intersections': '相交几何计算',
+    'features_written': '写出要素',
+}
+
+
+def peak_memory() -> Optional[int]:
+    """
+    获取当前进程的峰值常驻内存
+
+    Returns:
+        峰值内存（字节）；当前平台无法获取时返回 None
+    """
+    try:
+        import resource
+    except ImportError:
+        resource = None
+
+    if resource is not None:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        # macOS 以字节为单位，其他系统以 KB 为单位
+        return usage.ru_maxrss if sys.platform == 'darwin' else usage.ru_maxrss * 1024
+
+    if sys.platform == 'win32':
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [
+                ('cb', wintypes.DWORD),
+                ('PageFaultCount', wintypes.DWORD),
+                ('PeakWorkingSetSize', ctypes.c_size_t),
+                ('WorkingSetSize', ctypes.c_size_t),
+                ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                ('PagefileUsage', ctypes.c_size_t),
+                ('PeakPagefileUsage', ctypes.c_size_t),
+            ]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return int(counters.PeakWorkingSetSize)
+
+    return None
+
+
+class Instrumentation:
+    """
+    处理过程计量
+
+    同一个实例可以同时传给 ShapefileLoader、GeometryValidator、SpatialJoinProcessor
+    和 ResultExporter，汇总一次完整处理的各阶段数据。各阶段按名称累计，可在多个线程中使用。
+    """
+
+    def __init__(self):
+        """初始化（各阶段和计数均为空）"""
+        self._lock = threading.Lock()
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, int] = {}
+        # 合并进来的其他进程报告中的最大峰值内存（字节）
+        self.worker_peak_memory: Optional[int] = None
+
+    def reset(self):
+        """清空已记录的数据"""
+        with self._lock:
+            self.stages = {}
+            self.counters = {}
+            self.worker_peak_memory = None
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        记录一个阶段的墙钟时间和 CPU 时间（同名阶段累计，调用次数加一）
+
+        CPU 时间为整个进程的 CPU 时间，其他线程同时运行时会计入。
+
+        Args:
+            name: 阶段名称（见 STAGE_LABELS）
+        """
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            self.add_stage(name, time.perf_counter() - wall, time.process_time() - cpu)
+
+    def add_stage(self, name: str, wall: float, cpu: float, calls: int = 1):
+        """
+        累计一个阶段的耗时
+
+        Args:
+            name: 阶段名称
+            wall: 墙钟时间（秒）
+            cpu: CPU 时间（秒）
+            calls: 调用次数
+        """
+        with self._lock:
+            stage = self.stages.setdefault(name, {'wall': 0.0, 'cpu': 0.0, 'calls': 0})
+            stage['wall'] += wall
+            stage['cpu'] += cpu
+            stage['calls'] += calls
+
+    def count(self, name: str, value: int = 1):
+        """
+        累计一个计数
+
+        Args:
+            name: 计数名称（见 COUNTER_LABELS）
+            value: 增加的数量
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + int(value)
+
+    def merge(self, report: Dict[str, Any]):
+        """
+        合并另一个计量实例的报告（如并行处理的工作进程返回的报告），其峰值内存计入 worker_peak_memory
+
+        Args:
+            report: report() 返回的字典
+        """
+        for name, stage in report['stages'].items():
+            self.add_stage(name, stage['wall'], stage['cpu'], stage['calls'])
+        for name, value in report['counters'].items():
+            self.count(name, value)
+        if report.get('peak_memory') is not None:
+            with self._lock:
+                self.worker_peak_memory = max(self.worker_peak_memory or 0, report['peak_memory'])
+
+    def report(self) -> Dict[str, Any]:
+        """
+        生成结构化报告
+
+        Returns:
+            {'stages': {阶段名称: {'wall', 'cpu', 'calls'}}, 'counters': {计数名称: 数量},
+             'peak_memory': 进程峰值内存（字节，无法获取时为 None）,
+             'peak_memory_workers': 合并的工作进程报告中的最大峰值内存（字节，没有时为 None）}
+        """
+        order = list(STAGE_LABELS)
+        with self._lock:
+            stages = {
+                name: dict(self.stages[name])
+                for name in sorted(self.stages, key=lambda n: order.index(n) if n in order else len(order))
+            }
+            counters = dict(self.counters)
+            worker_peak_memory = self.worker_peak_memory
+        return {
+            'stages': stages,
+            'counters': counters,
+            'peak_memory': peak_memory(),
+            'peak_memory_workers': worker_peak_memory,
+        }
+
+    def format_report(self) -> List[str]:
+        """
+        生成可读的报告文本
+
+        Returns:
+            报告行列表（每个阶段一行，计数和内存各一行）
+        """
+        report = self.report()
+        lines = []
+        for name, stage in report['stages'].items():
+            lines.append(
+                f"{STAGE_LABELS.get(name, name)}: 墙钟 {stage['wall']:.2f} 秒，"
+                f"CPU {stage['cpu']:.2f} 秒，{stage['calls']} 次"
+            )
+        if report['counters']:
+            lines.append('计数: ' + '，'.join(
+                f"{COUNTER_LABELS.get(name, name)} {value}" for name, value in report['counters'].items()
+            ))
+        memory = []
+        if report['peak_memory'] is not None:
+            memory.append(f"峰值内存 {report['peak_memory'] / 1024 ** 2:.0f} MB")
+        if report['peak_memory_workers'] is not None:
+            memory.append(f"工作进程峰值内存 {report['peak_memory_workers'] / 1024 ** 2:.0f} MB")
+        if memory:
+            lines.append('，'.join(memory))
+        return lines
+
+
+@contextmanager
+def profile_to(path: Optional[str]) -> Iterator[Optional[cProfile.Profile]]:
+    """
+    在代码块执行期间运行 cProfile，结束后将统计数据写入文件（可用 pstats 或 snakeviz 查看）
+
+    只分析当前进程，并行处理的工作进程不在其中。
+
+    Args:
+        path: 输出文件路径（None 表示不分析）
+
+    Yields:
+        Profile 实例（path 为 None 时为 None）
+    """
+    if path is None:
+        yield None
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        output_dir = os.path.dirname(path)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+        profiler.dump_stats(path)
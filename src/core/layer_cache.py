@@ -0,0 +1,175 @@
+"""
+图层缓存模块
+以文件内容哈希为键，将加载并修复后的图层以 GeoParquet 格式缓存到磁盘
+"""
+
+from typing import Optional, Dict, Any, List, Tuple
+import hashlib
+import json
+import os
+import geopandas as gpd
+
+# 可选依赖：GeoParquet 读写需要 pyarrow
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+# 参与内容哈希的 Shapefile 组成文件（.cpg 为可选的编码声明）
+HASHED_EXTENSIONS = ('.shp', '.dbf', '.prj', '.cpg')
+
+# 缓存格式版本，修复规则或存储格式变化时递增以使旧条目失效
+CACHE_VERSION = 1
+
+
+class LayerCache:
+    """图层磁盘缓存类（按内容寻址，按总大小 LRU 淘汰）"""
+
+    def __init__(self, cache_dir: str, max_bytes: int = 2 * 1024 ** 3):
+        """
+        初始化缓存
+
+        Args:
+            cache_dir: 缓存目录（不存在时自动创建）
+            max_bytes: 缓存文件总大小上限（字节）
+        """
+        if pyarrow is None:
+            raise ValueError("图层缓存需要安装 pyarrow")
+
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def key(self, file_path: str) -> str:
+        """
+        计算 Shapefile 的内容哈希
+
+        Args:
+            file_path: .shp 文件路径
+
+        Returns:
+            十六进制哈希字符串
+        """
+        digest = hashlib.sha256(f'v{CACHE_VERSION}'.encode())
+        base_path = os.path.splitext(file_path)[0]
+        for ext in HASHED_EXTENSIONS:
+            path = base_path + ext
+            if not os.path.exists(path):
+                continue
+            digest.update(ext.encode())
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(block)
+        return digest.hexdigest()
+
+    def get(
+        self,
+        key: str,
+        columns: Optional[List[str]] = None,
+        bbox: Optional[Tuple[float, float, float, float]] = None
+    ) -> Optional[gpd.GeoDataFrame]:
+        """
+        读取缓存的图层（内存映射读取）
+
+        Args:
+            key: 内容哈希
+            columns: 只读取这些属性字段（默认读取全部字段）
+            bbox: 只读取外包框与该范围相交的要素
+
+        Returns:
+            GeoDataFrame，未命中时为 None
+        """
+        path = self._entry_path(key)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            if columns is not None:
+                geometry_name = self._geometry_name(path)
+                columns = list(columns) + [geometry_name]
+            gdf = gpd.read_parquet(path, columns=columns, bbox=bbox, memory_map=True)
+        except Exception:
+            # 损坏的条目直接丢弃，按未命中处理
+            self._remove(path)
+            return None
+
+        # 更新访问时间，用于 LRU 淘汰
+        os.utime(path)
+        return gdf
+
+    def put(self, key: str, gdf: gpd.GeoDataFrame):
+        """
+        写入缓存（先写临时文件再原子替换，随后按大小淘汰旧条目）
+
+        每个要素的外包框作为 GeoParquet 的 bbox 覆盖列一并写出，
+        读取时可按范围过滤而不必解析几何。
+
+        Args:
+            key: 内容哈希
+            gdf: 修复后的图层
+        """
+        path = self._entry_path(key)
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        try:
+            gdf.to_parquet(temp_path, index=True, write_covering_bbox=True)
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        self.evict()
+
+    def evict(self):
+        """按最近访问时间淘汰条目，直到总大小不超过上限"""
+        entries = self._entries()
+        total = sum(entry['size'] for entry in entries)
+        for entry in sorted(entries, key=lambda e: e['mtime']):
+            if total <= self.max_bytes:
+                break
+            self._remove(entry['path'])
+            total -= entry['size']
+
+    def clear(self):
+        """删除所有缓存条目"""
+        for entry in self._entries():
+            self._remove(entry['path'])
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取缓存统计信息
+
+        Returns:
+            统计信息字典
+        """
+        entries = self._entries()
+        return {
+            'entries': len(entries),
+            'total_bytes': sum(entry['size'] for entry in entries),
+            'max_bytes': self.max_bytes,
+        }
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f'{key}.parquet')
+
+    def _entries(self) -> List[Dict[str, Any]]:
+        """列出缓存目录中的所有条目"""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith('.parquet'):
+                stat = entry.stat()
+                entries.append({'path': entry.path, 'size': stat.st_size, 'mtime': stat.st_mtime})
+        return entries
+
+    @staticmethod
+    def _geometry_name(path: str) -> str:
+        """读取 GeoParquet 元数据中的主几何字段名"""
+        import pyarrow.parquet as pq
+        metadata = pq.read_schema(path).metadata or {}
+        return json.loads(metadata[b'geo'])['primary_column']
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -3,25 +3,85 @@
 提供 Shapefile 图层加载功能
 """
 
-from typing import Tuple, List, Dict, Any, Optional
+from typing import Tuple, List, Dict, Any, Optional, Sequence, Iterator, Callable, Union
+import numpy as np
 import geopandas as gpd
+import pandas as pd
+import shapely
 import os
+import warnings
 from ..utils.helpers import validate_shapefile_path
+from ..utils.shapefile_header import read_shapefile_header
+from .layer_cache import LayerCache
+from .validator import GeometryValidator
+from .instrumentation import Instrumentation
+
+# 可选依赖：pyogrio 直接通过 GDAL 批量读取，pyarrow 可让 pyogrio 以 Arrow 批次传输数据
+try:
+    import pyogrio
+except ImportError:
+    pyogrio = None
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+# 读取引擎
+# auto: 已安装 pyogrio 时使用 pyogrio，否则使用 fiona
+# pyogrio: GDAL 批量读取（安装 pyarrow 时使用 Arrow 批次）
+# fiona: 逐条记录读取（兼容旧环境）
+IO_ENGINES = ('auto', 'pyogrio', 'fiona')
+
+# 带进度加载时的分批数和每批最少要素数
+PROGRESS_BATCHES = 20
+PROGRESS_MIN_BATCH_SIZE = 10_000
 
 
 class ShapefileLoader:
     """Shapefile 图层加载器类"""
 
-    def __init__(self):
-        """初始化加载器"""
-        pass
+    def __init__(
+        self,
+        engine: str = 'auto',
+        cache: Optional[LayerCache] = None,
+        instrumentation: Optional[Instrumentation] = None
+    ):
+        """
+        初始化加载器
+
+        Args:
+            engine: 读取引擎（'auto'、'pyogrio' 或 'fiona'）
+            cache: 图层磁盘缓存（启用后返回的是修复过无效几何的图层）
+            instrumentation: 计量实例（记录 read 阶段及读取要素数；默认新建）
+        """
+        if engine not in IO_ENGINES:
+            raise ValueError(f"不支持的读取引擎: {engine}，可选: {', '.join(IO_ENGINES)}")
+        if engine == 'pyogrio' and pyogrio is None:
+            raise ValueError("读取引擎 pyogrio 未安装")
+
+        self.engine = engine
+        self.cache = cache
+        self.instrumentation = instrumentation if instrumentation is not None else Instrumentation()
 
-    def load_layer(self, file_path: str) -> Tuple[Optional[gpd.GeoDataFrame], List[str]]:
+    def load_layer(
+        self,
+        file_path: str,
+        columns: Optional[Sequence[str]] = None,
+        bbox: Optional[Tuple[float, float, float, float]] = None,
+        mask=None,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> Tuple[Optional[gpd.GeoDataFrame], List[str]]:
         """
         加载 Shapefile 图层
 
         Args:
             file_path: Shapefile 文件路径
+            columns: 只读取这些属性字段（默认读取全部字段）
+            bbox: 只读取与该范围 (minx, miny, maxx, maxy) 相交的要素
+            mask: 只读取与该几何相交的要素（不能与 bbox 同时使用）
+            progress_callback: 进度回调 (已读取要素数, 总要素数)；读取完整图层时分批读取并逐批调用
 
         Returns:
             (geo_dataframe, error_messages): GeoDataFrame 和错误信息列表
@@ -31,9 +91,20 @@ class ShapefileLoader:
         if not is_valid:
             return None, errors
 
+        if bbox is not None and mask is not None:
+            errors.append("bbox 和 mask 不能同时使用")
+            return None, errors
+
         try:
-            # 读取 Shapefile
-            gdf = gpd.read_file(file_path)
+            # 读取 Shapefile（启用缓存时优先读取缓存）
+            with self.instrumentation.stage('read'):
+                if self.cache is not None and mask is None:
+                    gdf = self._read_cached(file_path, columns=columns, bbox=bbox)
+                elif progress_callback is not None and bbox is None and mask is None:
+                    gdf = self._read_with_progress(file_path, progress_callback, columns=columns)
+                else:
+                    gdf = self._read(file_path, columns=columns, bbox=bbox, mask=mask)
+            self.instrumentation.count('features_read', len(gdf))
 
             # 验证几何类型
             if not self._validate_geometry_type(gdf, errors):
@@ -45,6 +116,216 @@ class ShapefileLoader:
             errors.append(f"读取文件失败: {str(e)}")
             return None, errors
 
+    def _read_cached(self, file_path: str, columns=None, bbox=None) -> gpd.GeoDataFrame:
+        """
+        通过缓存读取图层，未命中时读取完整图层、修复几何并写入缓存（写入失败时发出警告）
+
+        Args:
+            file_path: 文件路径
+            columns: 属性字段投影
+            bbox: 范围过滤
+
+        Returns:
+            GeoDataFrame
+        """
+        key = self.cache.key(file_path)
+        gdf = self.cache.get(key, columns=columns, bbox=bbox)
+        if gdf is not None:
+            return gdf
+
+        gdf = self._read(file_path)
+        if not self._validate_geometry_type(gdf, []):
+            # 非面图层不缓存，由 load_layer 报告错误
+            return gdf
+
+        fixed, _ = GeometryValidator(self.instrumentation).fix_invalid_geometries(np.asarray(gdf.geometry.values))
+        gdf[gdf.geometry.name] = gpd.GeoSeries(fixed, index=gdf.index, crs=gdf.crs)
+        try:
+            self.cache.put(key, gdf)
+        except Exception as e:
+            # 缓存只是加速手段，写入失败（磁盘已满、目录不可写等）不影响本次加载
+            warnings.warn(f"写入图层缓存失败，已跳过: {e}", RuntimeWarning)
+
+        if bbox is not None:
+            gdf = gdf.iloc[gdf.sindex.query(shapely.box(*bbox))].sort_index()
+        if columns is not None:
+            gdf = gdf[list(columns) + [gdf.geometry.name]]
+        return gdf
+
+    def _read_with_progress(
+        self,
+        file_path: str,
+        progress_callback: Callable[[int, int], None],
+        columns=None
+    ) -> gpd.GeoDataFrame:
+        """
+        分批读取完整图层，每读完一批汇报一次进度
+
+        Args:
+            file_path: 文件路径
+            progress_callback: 进度回调 (已读取要素数, 总要素数)
+            columns: 属性字段投影
+
+        Returns:
+            GeoDataFrame（索引与一次性读取时一致）
+        """
+        total = self.count_features(file_path)
+        batch_size = max(-(-total // PROGRESS_BATCHES), PROGRESS_MIN_BATCH_SIZE)
+        if total <= batch_size:
+            gdf = self._read(file_path, columns=columns)
+            progress_callback(len(gdf), total)
+            return gdf
+
+        batches = []
+        for start in range(0, total, batch_size):
+            batches.append(self._read_range(file_path, start, min(start + batch_size, total), columns=columns))
+            progress_callback(min(start + batch_size, total), total)
+        return pd.concat(batches, ignore_index=True)
+
+    def read_info(self, file_path: str) -> Dict[str, Any]:
+        """
+        只解析文件头读取图层元数据（要素数、坐标系、几何类型、字段和范围），不读取要素
+
+        Args:
+            file_path: Shapefile 文件路径
+
+        Returns:
+            图层信息字典（字段同 get_layer_info，geometry_counts 为空）
+
+        Raises:
+            ValueError: 文件路径无效或文件头损坏
+        """
+        is_valid, errors = validate_shapefile_path(file_path)
+        if not is_valid:
+            raise ValueError(errors[0])
+
+        header = read_shapefile_header(file_path)
+        fields = header['fields'] + ['geometry']
+        return {
+            'feature_count': header['feature_count'],
+            'crs': header['crs'] or '未定义',
+            'geometry_type': header['geometry_type'],
+            'geometry_counts': {},
+            'fields': fields,
+            'field_count': len(fields),
+            'bounds': header['bounds'],
+        }
+
+    def count_features(self, file_path: str) -> int:
+        """
+        获取图层要素数（不读取几何和属性）
+
+        Args:
+            file_path: Shapefile 文件路径
+
+        Returns:
+            要素数
+        """
+        if self.engine != 'fiona' and pyogrio is not None:
+            return int(pyogrio.read_info(file_path)['features'])
+
+        import fiona
+        with fiona.open(file_path) as collection:
+            return len(collection)
+
+    def iter_batches(
+        self,
+        file_path: str,
+        batch_size: int,
+        columns: Optional[Sequence[str]] = None
+    ) -> Iterator[gpd.GeoDataFrame]:
+        """
+        按批读取图层，每次只在内存中保留一批要素
+
+        每批的索引为要素在整个图层中的序号，与一次性加载时的索引一致。
+
+        Args:
+            file_path: Shapefile 文件路径
+            batch_size: 每批要素数
+            columns: 只读取这些属性字段（默认读取全部字段）
+
+        Yields:
+            每批要素的 GeoDataFrame
+
+        Raises:
+            ValueError: 文件路径无效或图层包含非面要素
+        """
+        is_valid, errors = validate_shapefile_path(file_path)
+        if not is_valid:
+            raise ValueError(errors[0])
+        if batch_size <= 0:
+            raise ValueError(f"批大小必须为正数: {batch_size}")
+
+        total = self.count_features(file_path)
+        if total == 0:
+            raise ValueError("图层不包含任何要素")
+
+        for start in range(0, total, batch_size):
+            stop = min(start + batch_size, total)
+            with self.instrumentation.stage('read'):
+                gdf = self._read_range(file_path, start, stop, columns=columns)
+            self.instrumentation.count('features_read', len(gdf))
+            gdf.index = pd.RangeIndex(start, start + len(gdf))
+
+            errors = []
+            if not self._validate_geometry_type(gdf, errors):
+                raise ValueError(errors[0])
+            yield gdf
+
+    def _read_range(self, file_path: str, start: int, stop: int, columns=None) -> gpd.GeoDataFrame:
+        """
+        读取 [start, stop) 范围内的要素
+
+        Args:
+            file_path: 文件路径
+            start: 起始要素序号
+            stop: 结束要素序号（不含）
+            columns: 属性字段投影
+
+        Returns:
+            GeoDataFrame
+        """
+        if self.engine != 'fiona' and pyogrio is not None:
+            return pyogrio.read_dataframe(
+                file_path,
+                columns=list(columns) if columns is not None else None,
+                skip_features=start,
+                max_features=stop - start,
+                use_arrow=pyarrow is not None
+            )
+
+        gdf = gpd.read_file(file_path, rows=slice(start, stop), engine='fiona')
+        if columns is not None:
+            gdf = gdf[list(columns) + [gdf.geometry.name]]
+        return gdf
+
+    def _read(self, file_path: str, columns=None, bbox=None, mask=None) -> gpd.GeoDataFrame:
+        """
+        按所选引擎读取图层
+
+        Args:
+            file_path: 文件路径
+            columns: 属性字段投影
+            bbox: 范围过滤
+            mask: 几何过滤
+
+        Returns:
+            GeoDataFrame
+        """
+        if self.engine != 'fiona' and pyogrio is not None:
+            return pyogrio.read_dataframe(
+                file_path,
+                columns=list(columns) if columns is not None else None,
+                bbox=bbox,
+                mask=mask,
+                use_arrow=pyarrow is not None
+            )
+
+        gdf = gpd.read_file(file_path, bbox=bbox, mask=mask, engine='fiona')
+        if columns is not None:
+            gdf = gdf[list(columns) + [gdf.geometry.name]]
+        return gdf
+
     def _validate_geometry_type(self, gdf: gpd.GeoDataFrame, errors: List[str]) -> bool:
         """
         验证几何类型
@@ -71,16 +352,21 @@ class ShapefileLoader:
 
         return True
 
-    def get_layer_info(self, gdf: gpd.GeoDataFrame) -> Dict[str, Any]:
+    def get_layer_info(self, gdf: Union[gpd.GeoDataFrame, str]) -> Dict[str, Any]:
         """
         获取图层信息
 
+        传入文件路径时只解析文件头（见 read_info），不需要先加载图层。
+
         Args:
-            gdf: GeoDataFrame
+            gdf: GeoDataFrame 或 Shapefile 文件路径
 
         Returns:
             图层信息字典
         """
+        if isinstance(gdf, (str, os.PathLike)):
+            return self.read_info(os.fspath(gdf))
+
         geom_types = gdf.geometry.geom_type.value_counts().to_dict()
 
         return {
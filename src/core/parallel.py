@@ -0,0 +1,278 @@
+"""
+并行处理模块
+将源图层按空间位置分块，在多个进程中执行空间关联
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import List, Tuple, Dict, Any, Optional, Callable
+import numpy as np
+import shapely
+from shapely.strtree import STRtree
+
+
+# 工作进程内的状态（由 _init_worker 在每个进程中初始化一次）
+_worker_state: Dict[str, Any] = {}
+
+
+def hilbert_order(geoms: np.ndarray, level: int = 16) -> np.ndarray:
+    """
+    按外包框中心点的 Hilbert 曲线编码排序
+
+    Args:
+        geoms: 几何数组
+        level: Hilbert 曲线阶数（每个方向 2**level 个格子）
+
+    Returns:
+        排序后的下标数组
+    """
+    bounds = shapely.bounds(geoms)
+    centers_x = (bounds[:, 0] + bounds[:, 2]) / 2
+    centers_y = (bounds[:, 1] + bounds[:, 3]) / 2
+
+    # 空几何没有外包框，统一排在最后
+    missing = np.isnan(centers_x) | np.isnan(centers_y)
+    if missing.all():
+        return np.arange(len(geoms))
+
+    side = 2 ** level - 1
+    min_x, max_x = np.nanmin(centers_x), np.nanmax(centers_x)
+    min_y, max_y = np.nanmin(centers_y), np.nanmax(centers_y)
+    x = np.nan_to_num((centers_x - min_x) / ((max_x - min_x) or 1) * side).astype(np.int64)
+    y = np.nan_to_num((centers_y - min_y) / ((max_y - min_y) or 1) * side).astype(np.int64)
+
+    # 经典的 xy -> d 转换，按位逐级旋转（对整个数组同时计算）
+    distance = np.zeros(len(geoms), dtype=np.int64)
+    s = 2 ** (level - 1)
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        distance += s * s * ((3 * rx) ^ ry)
+        # 旋转象限
+        flip = ~ry & rx
+        x = np.where(flip, side - x, x)
+        y = np.where(flip, side - y, y)
+        swap = ~ry
+        x, y = np.where(swap, y, x), np.where(swap, x, y)
+        s //= 2
+
+    distance[missing] = np.iinfo(np.int64).max
+    return np.argsort(distance, kind='stable')
+
+
+def split_spatial_chunks(geoms: np.ndarray, chunk_count: int) -> List[np.ndarray]:
+    """
+    将几何按空间位置切分为若干连续块
+
+    Args:
+        geoms: 几何数组
+        chunk_count: 块数
+
+    Returns:
+        每块包含的原始下标数组列表
+    """
+    order = hilbert_order(geoms)
+    return [chunk for chunk in np.array_split(order, chunk_count) if len(chunk)]
+
+
+class SharedGeometryBuffer:
+    """以 WKB 形式存放在共享内存中的几何数组"""
+
+    def __init__(self, geoms: np.ndarray):
+        """
+        将几何写入共享内存
+
+        Args:
+            geoms: 几何数组
+        """
+        wkb = shapely.to_wkb(geoms)
+        lengths = np.array([len(item) if item is not None else 0 for item in wkb], dtype=np.int64)
+        self.offsets = np.concatenate([[0], np.cumsum(lengths)])
+
+        self._shm = shared_memory.SharedMemory(create=True, size=max(int(self.offsets[-1]), 1))
+        position = 0
+        for item in wkb:
+            if item is not None:
+                self._shm.buf[position:position + len(item)] = item
+                position += len(item)
+
+    @property
+    def name(self) -> str:
+        """共享内存名称"""
+        return self._shm.name
+
+    def close(self):
+        """释放共享内存"""
+        self._shm.close()
+        self._shm.unlink()
+
+
+def load_shared_geometries(name: str, offsets: np.ndarray) -> np.ndarray:
+    """
+    从共享内存读取几何数组
+
+    Args:
+        name: 共享内存名称
+        offsets: 各几何 WKB 的起止偏移（长度为几何数 + 1）
+
+    Returns:
+        几何数组
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        data = shm.buf
+        wkb = np.empty(len(offsets) - 1, dtype=object)
+        for idx in range(len(wkb)):
+            start, end = offsets[idx], offsets[idx + 1]
+            wkb[idx] = bytes(data[start:end]) if end > start else None
+        del data
+    finally:
+        shm.close()
+    return shapely.from_wkb(wkb)
+
+
+def _init_worker(
+    shm_name: str,
+    offsets: np.ndarray,
+    engine: str,
+    prepared_cache_vertices: int,
+    area_mode: str = 'planar',
+    crs: Optional[str] = None
+):
+    """
+    工作进程初始化：读取共享的目标几何，建立空间索引
+
+    Args:
+        shm_name: 共享内存名称
+        offsets: WKB 偏移数组
+        engine: 处理引擎
+        prepared_cache_vertices: 预处理缓存的顶点总数上限
+        area_mode: 面积计算方式
+        crs: 几何所在坐标系（WKT）
+    """
+    from .processor import SpatialJoinProcessor
+    from .validator import GeometryValidator
+    from .projection import AreaCalculator
+
+    target_geoms = load_shared_geometries(shm_name, offsets)
+    processor = SpatialJoinProcessor(
+        GeometryValidator(),
+        engine=engine,
+        prepared_cache_vertices=prepared_cache_vertices
+    )
+    processor.prepared_cache.bind(target_geoms)
+    processor.area_calculator = AreaCalculator(area_mode, crs)
+
+    _worker_state['processor'] = processor
+    _worker_state['target_geoms'] = target_geoms
+    _worker_state['tree'] = STRtree(target_geoms)
+
+
+def _match_chunk(positions: np.ndarray, source_wkb: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """
+    在工作进程中处理一块源要素
+
+    Args:
+        positions: 该块源要素在源图层中的下标
+        source_wkb: 该块源要素几何的 WKB
+
+    Returns:
+        (positions, target_pos, relations, areas, source_areas, report): report 为该块的计量报告
+    """
+    processor = _worker_state['processor']
+    processor.instrumentation.reset()
+    source_geoms = shapely.from_wkb(source_wkb)
+    return (positions,) + processor.match(
+        source_geoms,
+        _worker_state['target_geoms'],
+        _worker_state['tree']
+    ) + (processor.instrumentation.report(),)
+
+
+def match_parallel(
+    source_geoms: np.ndarray,
+    target_geoms: np.ndarray,
+    engine: str,
+    workers: int,
+    prepared_cache_vertices: int,
+    chunks_per_worker: int = 4,
+    chunk_size: Optional[int] = None,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    check_cancelled: Optional[Callable[[], None]] = None,
+    area_mode: str = 'planar',
+    crs: Optional[str] = None,
+    chunk_callback: Optional[Callable[..., None]] = None,
+    instrumentation=None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    多进程执行空间关联匹配
+
+    源要素按 Hilbert 曲线切分为空间上连续的块，目标几何只写入共享内存一次，
+    各工作进程启动时读取并建立自己的空间索引。结果按源要素原始顺序合并。
+
+    Args:
+        source_geoms: 源几何数组（已修复）
+        target_geoms: 目标几何数组（已修复）
+        engine: 处理引擎
+        workers: 进程数
+        prepared_cache_vertices: 每个进程的预处理缓存顶点总数上限
+        chunks_per_worker: 每个进程平均分到的最少块数
+        chunk_size: 每块源要素数上限（块数不少于 源要素数 / chunk_size）
+        progress_callback: 进度回调，每完成一块调用一次 (已完成数, 总数)
+        check_cancelled: 取消检查函数，需要停止时抛出异常；每完成一块调用一次
+        area_mode: 面积计算方式
+        crs: 几何所在坐标系（WKT，area_mode 不为 planar 时必须提供）
+        chunk_callback: 每完成一块调用一次 (positions, target_pos, relations, areas, source_areas)
+        instrumentation: 计量实例（合并各工作进程的阶段耗时和计数；阶段耗时为各进程之和）
+
+    Returns:
+        (target_pos, relations, areas, source_areas): 同 SpatialJoinProcessor.match
+    """
+    count = len(source_geoms)
+    target_pos = np.full(count, -1, dtype=np.int64)
+    relations = np.zeros(count, dtype=np.int8)
+    areas = np.zeros(count, dtype=np.float64)
+    source_areas = np.zeros(count, dtype=np.float64)
+
+    chunk_count = workers * chunks_per_worker
+    if chunk_size:
+        chunk_count = max(chunk_count, -(-count // chunk_size))
+    chunks = split_spatial_chunks(source_geoms, chunk_count)
+    source_wkb = shapely.to_wkb(source_geoms)
+
+    buffer = SharedGeometryBuffer(target_geoms)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(buffer.name, buffer.offsets, engine, prepared_cache_vertices, area_mode, crs)
+        ) as executor:
+            futures = [executor.submit(_match_chunk, chunk, source_wkb[chunk]) for chunk in chunks]
+            done = 0
+            try:
+                for future in as_completed(futures):
+                    (positions, chunk_target_pos, chunk_relations, chunk_areas, chunk_source_areas,
+                     report) = future.result()
+                    if instrumentation is not None:
+                        instrumentation.merge(report)
+                    target_pos[positions] = chunk_target_pos
+                    relations[positions] = chunk_relations
+                    areas[positions] = chunk_areas
+                    source_areas[positions] = chunk_source_areas
+                    if chunk_callback is not None:
+                        chunk_callback(positions, chunk_target_pos, chunk_relations, chunk_areas, chunk_source_areas)
+
+                    done += len(positions)
+                    if progress_callback is not None:
+                        progress_callback(done, count)
+                    if check_cancelled is not None:
+                        check_cancelled()
+            except BaseException:
+                # 取消或出错时不再启动尚未开始的块
+                for future in futures:
+                    future.cancel()
+                raise
+    finally:
+        buffer.close()
+
+    return target_pos, relations, areas, source_areas
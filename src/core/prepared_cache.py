@@ -0,0 +1,158 @@
+"""
+预处理几何缓存模块
+为反复参与谓词判断的目标几何缓存 Shapely 预处理（prepared）结构
+"""
+
+from collections import OrderedDict
+from typing import Dict, Any
+import numpy as np
+import shapely
+
+
+class PreparedGeometryCache:
+    """预处理几何缓存类（LRU 淘汰，按顶点数限制内存）"""
+
+    def __init__(self, max_vertices: int = 5_000_000):
+        """
+        初始化缓存
+
+        预处理结构的内存占用与几何顶点数大致成正比，因此以缓存中几何的
+        顶点总数作为内存预算。
+
+        Args:
+            max_vertices: 缓存中预处理几何的顶点总数上限
+        """
+        self.max_vertices = max_vertices
+        self._geoms = np.empty(0, dtype=object)
+        self._sizes = np.empty(0, dtype=np.int64)
+        # 绑定几何的外包框 (minx, miny, maxx, maxy)，供谓词判断前的外包框预筛选使用
+        self.bounds = np.empty((0, 4), dtype=np.float64)
+        self._external = np.empty(0, dtype=bool)
+        self._entries: "OrderedDict[int, int]" = OrderedDict()
+        self._cached_vertices = 0
+        self.hits = 0
+        self.misses = 0
+
+    def bind(self, geoms: np.ndarray):
+        """
+        绑定要缓存的几何数组（会清空原有缓存）
+
+        Args:
+            geoms: 目标几何数组
+        """
+        self.clear()
+        self._geoms = geoms
+        self._sizes = shapely.get_num_coordinates(geoms)
+        self.bounds = shapely.bounds(geoms)
+        # 调用方已自行预处理的几何不计入预算，也不由缓存释放
+        self._external = shapely.is_prepared(geoms)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, idx: int):
+        """
+        获取单个几何（预算允许时为预处理过的几何）
+
+        Args:
+            idx: 几何在绑定数组中的下标
+
+        Returns:
+            Shapely 几何对象
+        """
+        if self._external[idx]:
+            self.hits += 1
+        elif idx in self._entries:
+            self._entries.move_to_end(idx)
+            self.hits += 1
+        else:
+            self.misses += 1
+            if self._reserve(int(self._sizes[idx]), keep=()):
+                shapely.prepare(self._geoms[idx])
+                self._entries[idx] = int(self._sizes[idx])
+                self._cached_vertices += int(self._sizes[idx])
+        return self._geoms[idx]
+
+    def get_many(self, indices: np.ndarray) -> np.ndarray:
+        """
+        批量获取几何，供向量化谓词函数使用
+
+        Args:
+            indices: 下标数组（可重复）
+
+        Returns:
+            与 indices 对应的几何数组
+        """
+        unique = np.unique(indices)
+        cached = self._external[unique] | np.fromiter(
+            (idx in self._entries for idx in unique.tolist()), dtype=bool, count=len(unique)
+        )
+        self.hits += int(cached.sum())
+        self.misses += int((~cached).sum())
+
+        for idx in unique[cached].tolist():
+            if idx in self._entries:
+                self._entries.move_to_end(idx)
+
+        # 按下标顺序在预算范围内预处理新几何，超出预算的几何不预处理（结果不变，只是更慢）
+        keep = set(unique.tolist())
+        to_prepare = []
+        for idx in unique[~cached].tolist():
+            size = int(self._sizes[idx])
+            if not self._reserve(size, keep=keep):
+                break
+            self._entries[idx] = size
+            self._cached_vertices += size
+            to_prepare.append(idx)
+        if to_prepare:
+            shapely.prepare(self._geoms[to_prepare])
+
+        return self._geoms[indices]
+
+    def clear(self):
+        """释放所有缓存的预处理结构"""
+        if self._entries:
+            shapely.destroy_prepared(self._geoms[list(self._entries)])
+        self._entries.clear()
+        self._cached_vertices = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取缓存统计信息
+
+        Returns:
+            统计信息字典
+        """
+        return {
+            'cached': len(self._entries),
+            'cached_vertices': self._cached_vertices,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+    def _reserve(self, size: int, keep) -> bool:
+        """
+        为新几何腾出预算空间（按最近最少使用淘汰）
+
+        Args:
+            size: 新几何的顶点数
+            keep: 本次请求中不可淘汰的下标集合
+
+        Returns:
+            True 如果腾出了足够空间，False 否则
+        """
+        if size > self.max_vertices:
+            return False
+
+        evicted = []
+        if self._cached_vertices + size > self.max_vertices:
+            for idx in list(self._entries):
+                if self._cached_vertices + size <= self.max_vertices:
+                    break
+                if idx in keep:
+                    continue
+                self._cached_vertices -= self._entries.pop(idx)
+                evicted.append(idx)
+        if evicted:
+            shapely.destroy_prepared(self._geoms[evicted])
+
+        return self._cached_vertices + size <= self.max_vertices
@@ -3,31 +3,94 @@
 实现核心的空间关联算法
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Union, Callable, Iterable, Iterator
+import threading
+import time
+import numpy as np
 import geopandas as gpd
+import shapely
 from shapely.geometry import Polygon, MultiPolygon
+from shapely.strtree import STRtree
 from .validator import GeometryValidator
+from .prepared_cache import PreparedGeometryCache
+from .parallel import match_parallel
+from .incremental import diff_geometries
+from .checkpoint import JoinCheckpoint, layer_fingerprint
+from .projection import AreaCalculator, ReprojectionCache, transform_geometries
+from .instrumentation import Instrumentation
+from .result import JoinResult, OverlapTable, RELATION_NONE, RELATION_CONTAINED, RELATION_PARTIAL, RELATION_TYPES
+
+
+# 可选的处理引擎
+# loop: 逐要素循环（参考实现，用于交叉验证）
+# vectorized: 基于 Shapely 2.0 向量化接口的批量处理
+ENGINES = ('loop', 'vectorized')
+
+
+class ProcessingCancelled(Exception):
+    """处理被取消时抛出的异常"""
 
 
 class SpatialJoinProcessor:
     """空间关联处理器类"""
 
-    def __init__(self, validator: GeometryValidator):
+    def __init__(
+        self,
+        validator: GeometryValidator,
+        engine: str = 'vectorized',
+        prepared_cache_vertices: int = 5_000_000,
+        chunk_size: int = 5000,
+        instrumentation: Optional[Instrumentation] = None
+    ):
         """
         初始化处理器
 
         Args:
             validator: 几何验证器实例
+            engine: 处理引擎（'vectorized' 或 'loop'）
+            prepared_cache_vertices: 目标几何预处理缓存的顶点总数上限
+            chunk_size: 每块源要素数（进度汇报和取消检查的粒度）
+            instrumentation: 计量实例（记录 align、index、match 及其中 predicate、intersection 阶段，
+                外包框候选对、精确谓词调用和相交几何计算次数；默认与 validator 共用，几何修复由 validator 记录）
         """
+        if engine not in ENGINES:
+            raise ValueError(f"不支持的处理引擎: {engine}，可选: {', '.join(ENGINES)}")
+
         self.validator = validator
+        self.engine = engine
+        self.prepared_cache = PreparedGeometryCache(max_vertices=prepared_cache_vertices)
+        self.chunk_size = chunk_size
+        self.instrumentation = instrumentation if instrumentation is not None else validator.instrumentation
+        self._cancel_event = threading.Event()
+
+        # 当前处理使用的面积计算器（由 process 等方法按 area_mode 设置）
+        self.area_calculator = AreaCalculator()
+
+        # 坐标系不一致时的重投影结果缓存，及最近一次处理的坐标系对齐报告（见 align_layers）
+        self.reprojection_cache = ReprojectionCache()
+        self.crs_report: Optional[Dict[str, Any]] = None
+
+        # 最近一次处理的几何修复报告（见 repair_layers）
+        self.repair_report: Optional[Dict[str, Any]] = None
+
+        # 最近一次增量处理的变化统计（见 process_incremental）
+        self.incremental_report: Optional[Dict[str, Any]] = None
+
+        # 最近一次使用检查点的处理的恢复和写出统计（见 process 的 checkpoint_dir）
+        self.checkpoint_report: Optional[Dict[str, Any]] = None
 
     def process(
         self,
         source_gdf: gpd.GeoDataFrame,
         target_gdf: gpd.GeoDataFrame,
         source_id_field: str = None,
-        target_id_field: str = None
-    ) -> List[Dict[str, Any]]:
+        target_id_field: str = None,
+        workers: Optional[int] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        area_mode: str = 'planar',
+        checkpoint_dir: Optional[str] = None,
+        checkpoint_interval: float = 60.0
+    ) -> JoinResult:
         """
         执行空间关联处理
 
@@ -36,136 +99,1062 @@ class SpatialJoinProcessor:
             target_gdf: 目标图层 GeoDataFrame
             source_id_field: 源图层ID字段名（默认使用索引）
             target_id_field: 目标图层ID字段名（默认使用索引）
+            workers: 并行进程数（默认或 1 时在当前进程中处理）
+            progress_callback: 进度回调，每处理完一块源要素调用一次 (已完成数, 总数)
+            area_mode: 面积计算方式（'planar'、'equal_area' 或 'geodesic'，见 projection.AREA_MODES）。
+                地理坐标系下 planar 面积的单位为平方度，应使用 equal_area 或 geodesic；
+                两图层坐标系不一致时，planar 面积的单位为未被重投影的图层的坐标系单位
+            checkpoint_dir: 检查点工作目录。指定时已完成的结果块定期写入该目录，处理中断
+                （取消、出错或进程崩溃）后以相同输入再次调用会跳过已完成的源要素；
+                两个图层的几何、坐标系、处理引擎或面积计算方式不同时重新开始
+            checkpoint_interval: 两次写出检查点的最短间隔（秒）
 
         Returns:
-            处理结果列表，每个元素包含关联信息
+            列式的关联结果（可通过 to_records() 获得旧的逐要素字典列表）
+
+        Raises:
+            ProcessingCancelled: 处理过程中调用了 cancel()
         """
-        results = []
+        self._cancel_event.clear()
 
-        # 确定ID字段
-        if source_id_field is None:
-            source_ids = source_gdf.index.tolist()
-        else:
-            source_ids = source_gdf[source_id_field].tolist()
+        # 预处理：两个图层的无效几何统一修复一次，坐标系不一致时重投影较小的图层
+        source_geoms, target_geoms = self.repair_layers(
+            np.asarray(source_gdf.geometry.values),
+            np.asarray(target_gdf.geometry.values)
+        )
+        source_geoms, target_geoms, crs = self.align_layers(source_gdf, target_gdf, source_geoms, target_geoms)
+        self.area_calculator = AreaCalculator(area_mode, crs)
 
-        if target_id_field is None:
-            target_ids = target_gdf.index.tolist()
+        if checkpoint_dir is not None:
+            target_pos, relations, areas, source_areas = self._match_with_checkpoint(
+                source_gdf, target_gdf, source_geoms, target_geoms, workers, progress_callback, area_mode,
+                checkpoint_dir, checkpoint_interval
+            )
         else:
-            target_ids = target_gdf[target_id_field].tolist()
+            target_pos, relations, areas, source_areas = self._match_layers(
+                source_geoms, target_geoms, workers, progress_callback, area_mode
+            )
+
+        return self._build_result(
+            source_gdf, target_gdf, target_pos, relations, areas, source_areas,
+            source_id_field, target_id_field, area_mode
+        )
+
+    def _match_layers(
+        self,
+        source_geoms: np.ndarray,
+        target_geoms: np.ndarray,
+        workers: Optional[int],
+        progress_callback: Optional[Callable[[int, int], None]],
+        area_mode: str,
+        chunk_callback: Optional[Callable[..., None]] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        在当前进程中或多进程匹配全部源要素
+
+        Args:
+            source_geoms: 源几何数组（已修复、已对齐坐标系）
+            target_geoms: 目标几何数组（已修复、已对齐坐标系）
+            workers: 并行进程数
+            progress_callback: 进度回调
+            area_mode: 面积计算方式
+            chunk_callback: 每完成一块调用一次 (positions, target_pos, relations, areas, source_areas)
+
+        Returns:
+            (target_pos, relations, areas, source_areas): 同 match
+        """
+        with self.instrumentation.stage('match'):
+            if workers is not None and workers > 1 and len(source_geoms) > 1:
+                return match_parallel(
+                    source_geoms,
+                    target_geoms,
+                    engine=self.engine,
+                    workers=workers,
+                    prepared_cache_vertices=self.prepared_cache.max_vertices,
+                    chunk_size=self.chunk_size,
+                    progress_callback=progress_callback,
+                    check_cancelled=self._check_cancelled,
+                    area_mode=area_mode,
+                    crs=self.area_calculator.crs,
+                    chunk_callback=chunk_callback,
+                    instrumentation=self.instrumentation
+                )
+            return self._match_chunked(source_geoms, target_geoms, progress_callback, chunk_callback)
+
+    def _match_with_checkpoint(
+        self,
+        source_gdf: gpd.GeoDataFrame,
+        target_gdf: gpd.GeoDataFrame,
+        source_geoms: np.ndarray,
+        target_geoms: np.ndarray,
+        workers: Optional[int],
+        progress_callback: Optional[Callable[[int, int], None]],
+        area_mode: str,
+        checkpoint_dir: str,
+        checkpoint_interval: float
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        带检查点的匹配：恢复已完成的结果，只匹配其余源要素，并定期写出新完成的结果块
+
+        恢复数量、新写出数量及检查点的额外耗时（指纹计算、读取和写出）记录在 self.checkpoint_report 中。
+
+        Args:
+            source_gdf: 源图层 GeoDataFrame（用于计算指纹）
+            target_gdf: 目标图层 GeoDataFrame（用于计算指纹）
+            source_geoms: 源几何数组（已修复、已对齐坐标系）
+            target_geoms: 目标几何数组（已修复、已对齐坐标系）
+            workers: 并行进程数
+            progress_callback: 进度回调（已完成数包含恢复的要素）
+            area_mode: 面积计算方式
+            checkpoint_dir: 检查点工作目录
+            checkpoint_interval: 两次写出检查点的最短间隔（秒）
+
+        Returns:
+            (target_pos, relations, areas, source_areas): 同 match
+        """
+        start = time.perf_counter()
+        count = len(source_geoms)
+        checkpoint = JoinCheckpoint(
+            checkpoint_dir,
+            {
+                'source': layer_fingerprint(source_gdf),
+                'target': layer_fingerprint(target_gdf),
+                'engine': self.engine,
+                'area_mode': area_mode,
+            },
+            interval=checkpoint_interval
+        )
+        done, target_pos, relations, areas, source_areas = checkpoint.load(count)
+        resumed = int(done.sum())
+        remaining = np.flatnonzero(~done)
+        overhead = time.perf_counter() - start
+
+        def on_chunk(positions, *arrays):
+            checkpoint.add(remaining[positions], *arrays)
+
+        def on_progress(completed: int, total: int):
+            progress_callback(resumed + completed, count)
+
+        try:
+            if len(remaining):
+                matched = self._match_layers(
+                    source_geoms[remaining], target_geoms, workers,
+                    on_progress if progress_callback is not None else None, area_mode, on_chunk
+                )
+                for full, part in zip((target_pos, relations, areas, source_areas), matched):
+                    full[remaining] = part
+            elif progress_callback is not None:
+                progress_callback(count, count)
+        finally:
+            # 取消或出错时也写出已完成的部分
+            checkpoint.flush()
+            self.checkpoint_report = {
+                'resumed': resumed,
+                'saved': checkpoint.done_count - resumed,
+                'elapsed': overhead + checkpoint.write_elapsed,
+            }
+
+        return target_pos, relations, areas, source_areas
+
+    def process_batches(
+        self,
+        batches: Iterable[gpd.GeoDataFrame],
+        target_gdf: gpd.GeoDataFrame,
+        source_id_field: str = None,
+        target_id_field: str = None,
+        total: Optional[int] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        area_mode: str = 'planar'
+    ) -> Iterator[JoinResult]:
+        """
+        流式空间关联：逐批处理源要素
+
+        目标图层只修复一次并建立一次空间索引（预处理缓存在各批之间共用），
+        源要素每次只处理一批，处理完的批次结果立即交给调用方，
+        因此内存占用取决于批大小而不是源图层大小。
+
+        Args:
+            batches: 源要素批次（如 ShapefileLoader.iter_batches 的返回值）
+            target_gdf: 目标图层 GeoDataFrame
+            source_id_field: 源图层ID字段名（默认使用索引）
+            target_id_field: 目标图层ID字段名（默认使用索引）
+            total: 源要素总数（仅用于进度汇报）
+            progress_callback: 进度回调，每处理完一批调用一次 (已完成数, 总数)
+            area_mode: 面积计算方式（见 process）
+
+        Yields:
+            每批源要素的关联结果
+
+        Raises:
+            ProcessingCancelled: 处理过程中调用了 cancel()
+        """
+        self._cancel_event.clear()
+        self.area_calculator = AreaCalculator(area_mode, target_gdf.crs)
+        self.crs_report = {'reprojected': None, 'cached': False, 'elapsed': 0.0}
+
+        start = time.perf_counter()
+        target_geoms, target_repaired = self.validator.fix_invalid_geometries(
+            np.asarray(target_gdf.geometry.values)
+        )
+        self.repair_report = {
+            'source_repaired': 0,
+            'target_repaired': target_repaired,
+            'elapsed': time.perf_counter() - start,
+        }
+
+        with self.instrumentation.stage('index'):
+            tree = STRtree(target_geoms)
+        self.prepared_cache.bind(target_geoms)
+        done = 0
+        try:
+            for batch in batches:
+                self._check_cancelled()
+
+                start = time.perf_counter()
+                source_geoms, source_repaired = self.validator.fix_invalid_geometries(
+                    np.asarray(batch.geometry.values)
+                )
+                self.repair_report['source_repaired'] += source_repaired
+                self.repair_report['elapsed'] += time.perf_counter() - start
+
+                # 坐标系不一致时，每批源要素重投影到（已建立索引的）目标图层坐标系
+                if self._needs_reprojection(batch.crs, target_gdf.crs):
+                    start = time.perf_counter()
+                    with self.instrumentation.stage('align'):
+                        source_geoms = transform_geometries(source_geoms, batch.crs, target_gdf.crs)
+                    self.crs_report['reprojected'] = 'source'
+                    self.crs_report['elapsed'] += time.perf_counter() - start
+
+                with self.instrumentation.stage('match'):
+                    target_pos, relations, areas, source_areas = self.match(source_geoms, target_geoms, tree)
+                done += len(batch)
+                if progress_callback is not None:
+                    progress_callback(done, total if total is not None else done)
+
+                yield self._build_result(
+                    batch, target_gdf, target_pos, relations, areas, source_areas,
+                    source_id_field, target_id_field, area_mode
+                )
+        finally:
+            self.prepared_cache.clear()
+
+    def process_overlaps(
+        self,
+        source_gdf: gpd.GeoDataFrame,
+        target_gdf: gpd.GeoDataFrame,
+        source_id_field: str = None,
+        target_id_field: str = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        area_mode: str = 'planar',
+        keep_geometry: bool = False
+    ) -> OverlapTable:
+        """
+        多对多空间关联：输出所有相交面积大于 0 的源×目标要素对
+
+        Args:
+            source_gdf: 源图层 GeoDataFrame
+            target_gdf: 目标图层 GeoDataFrame
+            source_id_field: 源图层ID字段名（默认使用索引）
+            target_id_field: 目标图层ID字段名（默认使用索引）
+            progress_callback: 进度回调，每处理完一块源要素调用一次 (已完成数, 总数)
+            area_mode: 面积计算方式（见 process）
+            keep_geometry: 是否保留每对的相交几何（见 iter_overlaps）
+
+        Returns:
+            全部要素对的边表（按源要素、目标要素下标排序）
+
+        Raises:
+            ProcessingCancelled: 处理过程中调用了 cancel()
+        """
+        tables = list(self.iter_overlaps(
+            source_gdf, target_gdf, source_id_field, target_id_field, progress_callback, area_mode, keep_geometry
+        ))
+        if not tables:
+            empty = np.zeros(0)
+            crs = None
+            if keep_geometry:
+                crs = target_gdf.crs if self.crs_report['reprojected'] == 'source' or source_gdf.crs is None \
+                    else source_gdf.crs
+            return OverlapTable(source_gdf, target_gdf, empty, empty, empty, empty, empty,
+                                source_id_field, target_id_field, area_mode,
+                                geometry=np.empty(0, dtype=object) if keep_geometry else None, crs=crs)
+        return OverlapTable.concat(tables)
+
+    def iter_overlaps(
+        self,
+        source_gdf: gpd.GeoDataFrame,
+        target_gdf: gpd.GeoDataFrame,
+        source_id_field: str = None,
+        target_id_field: str = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        area_mode: str = 'planar',
+        keep_geometry: bool = False
+    ) -> Iterator[OverlapTable]:
+        """
+        多对多空间关联，逐块产出边表（要素对数量很大时配合 ResultExporter.export_overlaps 流式写出）
+
+        每块源要素通过一次批量空间索引查询得到候选对，用预处理过的目标几何判断相交；
+        源要素被目标完全包含时相交面积即为源要素面积，不再计算相交几何。
+
+        keep_geometry 为 True 时每对附带相交几何（源要素被目标裁剪后的部分，统一为面或多面），
+        面积由同一个几何计算，不重复求交；被完全包含的对直接引用源几何。几何只随所在的块产出，
+        配合 export_overlaps 逐块写出时内存占用不随要素对总数增长。
+
+        Args:
+            source_gdf: 源图层 GeoDataFrame
+            target_gdf: 目标图层 GeoDataFrame
+            source_id_field: 源图层ID字段名（默认使用索引）
+            target_id_field: 目标图层ID字段名（默认使用索引）
+            progress_callback: 进度回调，每处理完一块源要素调用一次 (已完成数, 总数)
+            area_mode: 面积计算方式（见 process）
+            keep_geometry: 是否保留每对的相交几何（坐标系为对齐后的坐标系）
+
+        Yields:
+            每块源要素的边表（块内按源要素、目标要素下标排序）
+
+        Raises:
+            ProcessingCancelled: 处理过程中调用了 cancel()
+        """
+        self._cancel_event.clear()
+
+        source_geoms, target_geoms = self.repair_layers(
+            np.asarray(source_gdf.geometry.values),
+            np.asarray(target_gdf.geometry.values)
+        )
+        source_geoms, target_geoms, crs = self.align_layers(source_gdf, target_gdf, source_geoms, target_geoms)
+        self.area_calculator = AreaCalculator(area_mode, crs)
+        target_areas = self.area_calculator(target_geoms)
+
+        count = len(source_geoms)
+        with self.instrumentation.stage('index'):
+            tree = STRtree(target_geoms)
+        self.prepared_cache.bind(target_geoms)
+        try:
+            for start in range(0, count, self.chunk_size):
+                self._check_cancelled()
+                stop = min(start + self.chunk_size, count)
+                with self.instrumentation.stage('match'):
+                    src_idx, tgt_idx, areas, source_ratio, pieces = self._match_overlaps(
+                        source_geoms[start:stop], target_geoms, tree, keep_geometry
+                    )
+                if progress_callback is not None:
+                    progress_callback(stop, count)
+
+                target_ratio = np.zeros(len(areas), dtype=np.float64)
+                positive = target_areas[tgt_idx] > 0
+                target_ratio[positive] = areas[positive] / target_areas[tgt_idx[positive]]
+                yield OverlapTable(
+                    source_gdf, target_gdf, src_idx + start, tgt_idx, areas, source_ratio, target_ratio,
+                    source_id_field, target_id_field, area_mode,
+                    geometry=pieces, crs=crs if keep_geometry else None
+                )
+        finally:
+            self.prepared_cache.clear()
+
+    def _match_overlaps(
+        self,
+        source_geoms: np.ndarray,
+        target_geoms: np.ndarray,
+        tree: STRtree,
+        keep_geometry: bool = False
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, Optional[np.ndarray]]:
+        """
+        找出一块源要素与目标要素之间的全部相交对
+
+        调用前需先将 target_geoms 绑定到 self.prepared_cache。
+
+        Args:
+            source_geoms: 源几何数组（已修复）
+            target_geoms: 目标几何数组（已修复）
+            tree: 目标几何的空间索引
+            keep_geometry: 是否返回相交几何
+
+        Returns:
+            (src_idx, tgt_idx, areas, source_ratio, pieces): 块内源下标、目标下标、相交面积、
+            相交面积 / 源要素面积、相交几何（keep_geometry 为 False 时为 None）
+            （按源、目标下标排序，只含面积大于 0 的对）
+        """
+        instrumentation = self.instrumentation
+        src_idx, tgt_idx = tree.query(source_geoms)
+        instrumentation.count('candidates', len(src_idx))
+        with instrumentation.stage('predicate'):
+            prepared_targets = self.prepared_cache.get_many(tgt_idx)
+            hit = shapely.intersects(prepared_targets, source_geoms[src_idx])
+            src_idx, tgt_idx, prepared_targets = src_idx[hit], tgt_idx[hit], prepared_targets[hit]
+            may_contain = self._may_contain(source_geoms, src_idx, tgt_idx, prepared_targets)
+            contained = np.zeros(len(src_idx), dtype=bool)
+            contained[may_contain] = shapely.contains(
+                prepared_targets[may_contain], source_geoms[src_idx[may_contain]]
+            )
+        instrumentation.count('predicate_calls', len(hit) + int(may_contain.sum()))
+
+        source_areas = self.area_calculator(source_geoms)
+        areas = np.empty(len(src_idx), dtype=np.float64)
+        areas[contained] = source_areas[src_idx[contained]]
+        partial = ~contained
+        with instrumentation.stage('intersection'):
+            intersections = shapely.intersection(source_geoms[src_idx[partial]], target_geoms[tgt_idx[partial]])
+            areas[partial] = self.area_calculator(intersections)
+        instrumentation.count('intersections', len(intersections))
+
+        pieces = None
+        if keep_geometry:
+            pieces = np.empty(len(src_idx), dtype=object)
+            pieces[contained] = source_geoms[src_idx[contained]]
+            pieces[partial] = intersections
+        del intersections
+
+        # 忽略面积为0的相交
+        keep = np.flatnonzero(areas > 0)
+        keep = keep[np.lexsort((tgt_idx[keep], src_idx[keep]))]
+        src_idx, tgt_idx, areas, contained = src_idx[keep], tgt_idx[keep], areas[keep], contained[keep]
+        if pieces is not None:
+            pieces = self._polygonal(pieces[keep])
+
+        source_ratio = np.zeros(len(areas), dtype=np.float64)
+        source_ratio[contained] = 1.0
+        partial = ~contained & (source_areas[src_idx] > 0)
+        source_ratio[partial] = areas[partial] / source_areas[src_idx[partial]]
+        return src_idx, tgt_idx, areas, source_ratio, pieces
+
+    @staticmethod
+    def _polygonal(geoms: np.ndarray) -> np.ndarray:
+        """
+        只保留相交结果中的面部分（边界接触产生的线、点被丢弃）
+
+        Args:
+            geoms: 面积大于 0 的相交几何数组
+
+        Returns:
+            面或多面几何数组
+        """
+        collections = np.flatnonzero(shapely.get_type_id(geoms) == 7)
+        if len(collections) == 0:
+            return geoms
+        parts, index = shapely.get_parts(geoms[collections], return_index=True)
+        polygonal = np.isin(shapely.get_type_id(parts), (3, 6))
+        # 几何集合中可能嵌套多面，再拆一次得到单个面
+        parts, part_index = shapely.get_parts(parts[polygonal], return_index=True)
+        geoms = geoms.copy()
+        geoms[collections] = shapely.multipolygons(parts, indices=index[polygonal][part_index])
+        return geoms
+
+    def process_incremental(
+        self,
+        previous: JoinResult,
+        source_gdf: gpd.GeoDataFrame,
+        target_gdf: gpd.GeoDataFrame,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> JoinResult:
+        """
+        增量空间关联：只重新计算受变化影响的源要素
+
+        新旧图层按要素ID（沿用上次结果的ID字段）对应，通过逐要素几何哈希找出变化：
+        - 新增或几何变化的源要素重新计算；
+        - 新增、删除或几何变化的目标要素，其外包框（新旧几何）覆盖到的源要素重新计算；
+        - 其余源要素沿用上次的结果（目标下标按ID映射到新图层中的位置）。
+        属性变化不需要重新计算，结果中的属性总是从新图层中读取。
+        面积计算方式沿用上次结果的 area_mode。
+
+        Args:
+            previous: 上次的关联结果（其中的图层须为上次处理时的版本）
+            source_gdf: 新版本源图层
+            target_gdf: 新版本目标图层
+            progress_callback: 进度回调 (已完成数, 需重新计算的总数)
+
+        Returns:
+            与对新图层调用 process 相同的关联结果
+
+        Raises:
+            ValueError: 要素ID不唯一
+            ProcessingCancelled: 处理过程中调用了 cancel()
+        """
+        self._cancel_event.clear()
+        start = time.perf_counter()
+
+        old_source_geoms = np.asarray(previous.source_gdf.geometry.values)
+        new_source_geoms = np.asarray(source_gdf.geometry.values)
+        old_target_geoms = np.asarray(previous.target_gdf.geometry.values)
+        new_target_geoms = np.asarray(target_gdf.geometry.values)
+
+        source_old_pos, source_changed, _ = diff_geometries(
+            old_source_geoms,
+            new_source_geoms,
+            self._layer_ids(previous.source_gdf, previous.source_id_field),
+            self._layer_ids(source_gdf, previous.source_id_field)
+        )
+        target_old_pos, target_changed, target_removed = diff_geometries(
+            old_target_geoms,
+            new_target_geoms,
+            self._layer_ids(previous.target_gdf, previous.target_id_field),
+            self._layer_ids(target_gdf, previous.target_id_field)
+        )
+
+        # 变化目标的新旧几何所覆盖的源要素都需要重新计算（先转换到源图层坐标系再查询）
+        recompute = source_changed.copy()
+        affected = np.concatenate([
+            self._to_crs(new_target_geoms[target_changed], target_gdf.crs, source_gdf.crs),
+            self._to_crs(old_target_geoms[target_removed], previous.target_gdf.crs, source_gdf.crs)
+        ])
+        if len(affected):
+            recompute[np.unique(STRtree(new_source_geoms).query(affected)[1])] = True
+
+        # 旧目标位置 -> 新目标位置
+        old_to_new = np.full(len(old_target_geoms), -1, dtype=np.int64)
+        matched_targets = target_old_pos >= 0
+        old_to_new[target_old_pos[matched_targets]] = np.flatnonzero(matched_targets)
+
+        count = len(new_source_geoms)
+        target_pos = np.full(count, -1, dtype=np.int64)
+        relations = np.full(count, RELATION_NONE, dtype=np.int8)
+        areas = np.zeros(count, dtype=np.float64)
+        overlap_ratio = np.zeros(count, dtype=np.float64)
 
-        # 遍历源要素
-        for idx, source_geom in enumerate(source_gdf.geometry):
-            source_id = source_ids[idx]
-            source_attrs = source_gdf.iloc[idx].to_dict()
+        # 沿用上次结果
+        keep = np.flatnonzero(~recompute)
+        old_keep = source_old_pos[keep]
+        previous_target = previous.target_index[old_keep]
+        target_pos[keep] = np.where(previous_target >= 0, old_to_new[previous_target], -1)
+        relations[keep] = previous.relations[old_keep]
+        areas[keep] = previous.intersection_area[old_keep]
+        overlap_ratio[keep] = previous.overlap_ratio[old_keep]
 
-            # 移除几何字段（避免序列化问题）
-            source_attrs.pop('geometry', None)
+        # 重新计算变化的部分
+        recompute_idx = np.flatnonzero(recompute)
+        source_geoms, target_geoms = self.repair_layers(new_source_geoms[recompute_idx], new_target_geoms)
+        source_geoms, target_geoms, crs = self.align_layers(source_gdf, target_gdf, source_geoms, target_geoms)
+        self.area_calculator = AreaCalculator(previous.area_mode, crs)
+        (target_pos[recompute_idx], relations[recompute_idx], areas[recompute_idx],
+         source_areas) = self._match_chunked(source_geoms, target_geoms, progress_callback)
+        overlap_ratio[recompute_idx] = self._overlap_ratio(relations[recompute_idx], areas[recompute_idx], source_areas)
 
-            # 修复几何错误
-            if not source_geom.is_valid:
-                source_geom = self.validator.fix_invalid_geometry(source_geom)
+        self.incremental_report = {
+            'source_changed': int(source_changed.sum()),
+            'target_changed': int(target_changed.sum()) + len(old_target_geoms) - int(matched_targets.sum()),
+            'recomputed': len(recompute_idx),
+            'reused': len(keep),
+            'elapsed': time.perf_counter() - start,
+        }
+
+        return JoinResult(
+            source_gdf,
+            target_gdf,
+            target_index=target_pos,
+            relations=relations,
+            intersection_area=areas,
+            overlap_ratio=overlap_ratio,
+            source_id_field=previous.source_id_field,
+            target_id_field=previous.target_id_field,
+            area_mode=previous.area_mode
+        )
+
+    @classmethod
+    def _to_crs(cls, geoms: np.ndarray, crs_from, crs_to) -> np.ndarray:
+        """将几何转换到指定坐标系（任一坐标系未定义或两者相同时原样返回）"""
+        if len(geoms) == 0 or not cls._needs_reprojection(crs_from, crs_to):
+            return geoms
+        return transform_geometries(geoms, crs_from, crs_to)
+
+    @staticmethod
+    def _layer_ids(gdf: gpd.GeoDataFrame, id_field: Optional[str]) -> np.ndarray:
+        """图层要素ID数组（id_field 为 None 时使用索引）"""
+        if id_field is None:
+            return gdf.index.to_numpy()
+        return gdf[id_field].to_numpy()
+
+    @staticmethod
+    def _overlap_ratio(relations: np.ndarray, areas: np.ndarray, source_areas: np.ndarray) -> np.ndarray:
+        """
+        计算重叠比例：完全包含为 1，部分重叠为相交面积 / 源要素面积
+
+        Args:
+            relations: 关联类型编码
+            areas: 相交面积
+            source_areas: 源要素面积
+
+        Returns:
+            重叠比例数组
+        """
+        overlap_ratio = np.zeros(len(relations), dtype=np.float64)
+        overlap_ratio[relations == RELATION_CONTAINED] = 1.0
+        partial = (relations == RELATION_PARTIAL) & (source_areas > 0)
+        overlap_ratio[partial] = areas[partial] / source_areas[partial]
+        return overlap_ratio
+
+    @classmethod
+    def _build_result(
+        cls,
+        source_gdf: gpd.GeoDataFrame,
+        target_gdf: gpd.GeoDataFrame,
+        target_pos: np.ndarray,
+        relations: np.ndarray,
+        areas: np.ndarray,
+        source_areas: np.ndarray,
+        source_id_field: Optional[str],
+        target_id_field: Optional[str],
+        area_mode: str = 'planar'
+    ) -> JoinResult:
+        """
+        由匹配数组组装关联结果
+
+        Args:
+            source_gdf: 源图层 GeoDataFrame
+            target_gdf: 目标图层 GeoDataFrame
+            target_pos: 匹配目标下标
+            relations: 关联类型编码
+            areas: 相交面积
+            source_areas: 源要素面积
+            source_id_field: 源图层ID字段名
+            target_id_field: 目标图层ID字段名
+            area_mode: 面积计算方式
+
+        Returns:
+            JoinResult
+        """
+        return JoinResult(
+            source_gdf,
+            target_gdf,
+            target_index=target_pos,
+            relations=relations,
+            intersection_area=areas,
+            overlap_ratio=cls._overlap_ratio(relations, areas, source_areas),
+            source_id_field=source_id_field,
+            target_id_field=target_id_field,
+            area_mode=area_mode
+        )
+
+    def cancel(self):
+        """请求取消正在进行的处理（可在其他线程中调用）"""
+        self._cancel_event.set()
+
+    def _check_cancelled(self):
+        """
+        检查是否已请求取消
+
+        Raises:
+            ProcessingCancelled: 已请求取消
+        """
+        if self._cancel_event.is_set():
+            raise ProcessingCancelled("处理已取消")
+
+    def _match_chunked(
+        self,
+        source_geoms: np.ndarray,
+        target_geoms: np.ndarray,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        chunk_callback: Optional[Callable[..., None]] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        在当前进程中按块匹配源要素，每块之间汇报进度并检查取消
+
+        Args:
+            source_geoms: 源几何数组（已修复）
+            target_geoms: 目标几何数组（已修复）
+            progress_callback: 进度回调
+            chunk_callback: 每完成一块调用一次 (positions, target_pos, relations, areas, source_areas)
+
+        Returns:
+            (target_pos, relations, areas, source_areas): 同 match
+        """
+        count = len(source_geoms)
+        target_pos = np.full(count, -1, dtype=np.int64)
+        relations = np.full(count, RELATION_NONE, dtype=np.int8)
+        areas = np.zeros(count, dtype=np.float64)
+        source_areas = np.zeros(count, dtype=np.float64)
+
+        # 空间索引只建一次；目标几何按需预处理，包含判断和相交判断两个阶段共用
+        with self.instrumentation.stage('index'):
+            tree = STRtree(target_geoms)
+        self.prepared_cache.bind(target_geoms)
+        try:
+            for start in range(0, count, self.chunk_size):
+                self._check_cancelled()
+                chunk = slice(start, min(start + self.chunk_size, count))
+                (target_pos[chunk], relations[chunk], areas[chunk],
+                 source_areas[chunk]) = self.match(source_geoms[chunk], target_geoms, tree)
+                if chunk_callback is not None:
+                    chunk_callback(
+                        np.arange(chunk.start, chunk.stop),
+                        target_pos[chunk], relations[chunk], areas[chunk], source_areas[chunk]
+                    )
+                if progress_callback is not None:
+                    progress_callback(chunk.stop, count)
+        finally:
+            self.prepared_cache.clear()
+
+        return target_pos, relations, areas, source_areas
+
+    def align_layers(
+        self,
+        source_gdf: gpd.GeoDataFrame,
+        target_gdf: gpd.GeoDataFrame,
+        source_geoms: np.ndarray,
+        target_geoms: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, Any]:
+        """
+        对齐两个图层的坐标系
+
+        坐标系不一致时，将坐标点数较少的图层批量重投影到另一图层的坐标系。
+        整个图层的重投影结果按图层缓存在 self.reprojection_cache 中，同一参考图层
+        再次参与处理时不再转换。是否重投影、是否命中缓存及耗时记录在 self.crs_report 中。
+
+        Args:
+            source_gdf: 源图层 GeoDataFrame（用于读取坐标系和识别图层）
+            target_gdf: 目标图层 GeoDataFrame
+            source_geoms: 源几何数组（已修复，可为源图层的一部分）
+            target_geoms: 目标几何数组（已修复）
+
+        Returns:
+            (source_geoms, target_geoms, crs): 对齐后的几何数组及其所在坐标系
+        """
+        with self.instrumentation.stage('align'):
+            start = time.perf_counter()
+            self.crs_report = {'reprojected': None, 'cached': False, 'elapsed': 0.0}
+
+            if not self._needs_reprojection(source_gdf.crs, target_gdf.crs):
+                return source_geoms, target_geoms, source_gdf.crs if source_gdf.crs is not None else target_gdf.crs
+
+            source_size = int(shapely.get_num_coordinates(np.asarray(source_gdf.geometry.values)).sum())
+            target_size = int(shapely.get_num_coordinates(np.asarray(target_gdf.geometry.values)).sum())
+            if source_size <= target_size:
+                source_geoms = self._reproject(source_gdf, source_geoms, target_gdf.crs)
+                self.crs_report['reprojected'] = 'source'
+                crs = target_gdf.crs
+            else:
+                target_geoms = self._reproject(target_gdf, target_geoms, source_gdf.crs)
+                self.crs_report['reprojected'] = 'target'
+                crs = source_gdf.crs
+
+            self.crs_report['elapsed'] = time.perf_counter() - start
+            return source_geoms, target_geoms, crs
+
+    @staticmethod
+    def _needs_reprojection(source_crs, target_crs) -> bool:
+        """两个坐标系均已定义且不相同时需要重投影"""
+        return source_crs is not None and target_crs is not None and source_crs != target_crs
+
+    def _reproject(self, gdf: gpd.GeoDataFrame, geoms: np.ndarray, crs_to) -> np.ndarray:
+        """
+        将图层几何重投影到指定坐标系（整个图层的结果会被缓存）
+
+        Args:
+            gdf: 几何所属的图层
+            geoms: 要重投影的几何数组（已修复）
+            crs_to: 目标坐标系
+
+        Returns:
+            重投影后的几何数组
+        """
+        layer_geoms = gdf.geometry.values
+        whole_layer = len(geoms) == len(gdf)
+        if whole_layer:
+            cached = self.reprojection_cache.get(layer_geoms, gdf.crs, crs_to)
+            if cached is not None:
+                self.crs_report['cached'] = True
+                return cached
+
+        projected = transform_geometries(geoms, gdf.crs, crs_to)
+        if whole_layer:
+            self.reprojection_cache.put(layer_geoms, gdf.crs, crs_to, projected)
+        return projected
+
+    def repair_layers(
+        self,
+        source_geoms: np.ndarray,
+        target_geoms: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        批量验证并修复源、目标图层的几何
+
+        修复只在处理开始时进行一次，后续匹配阶段不再重复修复。
+        修复数量和耗时记录在 self.repair_report 中。
+
+        Args:
+            source_geoms: 源几何数组
+            target_geoms: 目标几何数组
+
+        Returns:
+            (source_geoms, target_geoms): 修复后的几何数组
+        """
+        start = time.perf_counter()
+
+        source_geoms, source_repaired = self.validator.fix_invalid_geometries(source_geoms)
+        target_geoms, target_repaired = self.validator.fix_invalid_geometries(target_geoms)
+
+        self.repair_report = {
+            'source_repaired': source_repaired,
+            'target_repaired': target_repaired,
+            'elapsed': time.perf_counter() - start,
+        }
+
+        return source_geoms, target_geoms
+
+    def match(
+        self,
+        source_geoms: np.ndarray,
+        target_geoms: np.ndarray,
+        tree: STRtree
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        使用当前引擎为每个源几何匹配目标几何
+
+        调用前需先将 target_geoms 绑定到 self.prepared_cache。
+
+        Args:
+            source_geoms: 源几何数组（已修复）
+            target_geoms: 目标几何数组（已修复）
+            tree: 目标几何的空间索引
+
+        Returns:
+            (target_pos, relations, areas, source_areas): 匹配目标下标（无匹配为 -1）、
+            关联类型编码、相交面积、源要素面积
+        """
+        if self.engine == 'loop':
+            return self._match_loop(source_geoms, target_geoms, tree)
+        return self._match_vectorized(source_geoms, target_geoms, tree)
+
+    def _match_loop(
+        self,
+        source_geoms: np.ndarray,
+        target_geoms: np.ndarray,
+        tree: STRtree
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        逐要素循环匹配（参考实现）
+
+        Args:
+            source_geoms: 源几何数组（已修复）
+            target_geoms: 目标几何数组（已修复）
+            tree: 目标几何的空间索引
+
+        Returns:
+            (target_pos, relations, areas, source_areas): 同 match
+        """
+        count = len(source_geoms)
+        target_pos = np.full(count, -1, dtype=np.int64)
+        relations = np.full(count, RELATION_NONE, dtype=np.int8)
+        areas = np.zeros(count, dtype=np.float64)
+        source_areas = np.zeros(count, dtype=np.float64)
+        candidate_count = predicate_calls = intersection_count = 0
+        source_bounds = shapely.bounds(source_geoms).tolist()
+        target_bounds = self.prepared_cache.bounds.tolist()
+
+        # 遍历源要素，每个源要素仅检查外包框相交的候选目标
+        for idx, source_geom in enumerate(source_geoms):
+            source_areas[idx] = self.area_calculator.area(source_geom)
+
+            # 候选目标按原始顺序排列，保证与逐个扫描时的结果一致
+            candidates = np.sort(tree.query(source_geom)).tolist()
+            candidate_count += len(candidates)
 
             # 优先级1：检查是否完全落入某个目标面
-            contained_target = None
-            for target_idx, target_geom in enumerate(target_gdf.geometry):
-                # 修复目标几何
-                if not target_geom.is_valid:
-                    target_geom = self.validator.fix_invalid_geometry(target_geom)
-
-                # 检测完全包含
-                if source_geom.within(target_geom):
-                    contained_target = {
-                        'index': target_idx,
-                        'id': target_ids[target_idx],
-                        'geometry': target_geom,
-                        'attributes': target_gdf.iloc[target_idx].to_dict()
-                    }
+            min_x, min_y, max_x, max_y = source_bounds[idx]
+            contained_idx = None
+            for target_idx in candidates:
+                # 目标外包框须包含源要素外包框（包含的必要条件），否则跳过精确判断
+                bounds = target_bounds[target_idx]
+                if not (bounds[0] <= min_x and bounds[1] <= min_y and bounds[2] >= max_x and bounds[3] >= max_y):
+                    continue
+                target_geom = self.prepared_cache.get(target_idx)
+
+                # 检测完全包含（等价于 source_geom.within(target_geom)，但可利用目标的预处理结构）
+                predicate_calls += 1
+                if target_geom.contains(source_geom):
+                    contained_idx = target_idx
                     break  # 找到第一个包含的面就停止
 
             # 如果完全包含，直接关联
-            if contained_target:
-                target_attrs = contained_target['attributes'].copy()
-                target_attrs.pop('geometry', None)
-
-                results.append({
-                    'source_id': source_id,
-                    'source_attributes': source_attrs,
-                    'target_id': contained_target['id'],
-                    'target_attributes': target_attrs,
-                    'relation_type': 'contained',
-                    'intersection_area': source_geom.area,
-                    'overlap_ratio': 1.0,
-                })
+            if contained_idx is not None:
+                target_pos[idx] = contained_idx
+                relations[idx] = RELATION_CONTAINED
+                areas[idx] = source_areas[idx]
                 continue
 
             # 优先级2：计算相交面积，找最大的
-            intersects = []
-            for target_idx, target_geom in enumerate(target_gdf.geometry):
-                # 修复目标几何
-                if not target_geom.is_valid:
-                    target_geom = self.validator.fix_invalid_geometry(target_geom)
+            best_idx = None
+            best_area = 0.0
+            for target_idx in candidates:
+                target_geom = self.prepared_cache.get(target_idx)
 
                 # 检测相交
-                if source_geom.intersects(target_geom):
-                    # 计算相交面积
-                    intersection = source_geom.intersection(target_geom)
-                    area = intersection.area
-
-                    if area > 0:  # 忽略面积为0的相交
-                        target_attrs = target_gdf.iloc[target_idx].to_dict()
-                        target_attrs.pop('geometry', None)
-
-                        intersects.append({
-                            'target_id': target_ids[target_idx],
-                            'area': area,
-                            'attributes': target_attrs
-                        })
-
-            # 如果有相交，选择面积最大的
-            if intersects:
-                best_match = max(intersects, key=lambda x: x['area'])
-
-                results.append({
-                    'source_id': source_id,
-                    'source_attributes': source_attrs,
-                    'target_id': best_match['target_id'],
-                    'target_attributes': best_match['attributes'],
-                    'relation_type': 'partial_overlap',
-                    'intersection_area': best_match['area'],
-                    'overlap_ratio': best_match['area'] / source_geom.area if source_geom.area > 0 else 0,
-                })
-            else:
-                # 无相交
-                # 获取目标图层的所有字段
-                target_fields = {k: None for k in target_gdf.columns if k != 'geometry'}
+                predicate_calls += 1
+                if target_geom.intersects(source_geom):
+                    # 计算相交面积，忽略面积为0的相交；面积相同时保留先出现的目标
+                    intersection_count += 1
+                    area = self.area_calculator.area(source_geom.intersection(target_geom))
+                    if area > 0 and (best_idx is None or area > best_area):
+                        best_idx = target_idx
+                        best_area = area
 
-                results.append({
-                    'source_id': source_id,
-                    'source_attributes': source_attrs,
-                    'target_id': None,
-                    'target_attributes': target_fields,
-                    'relation_type': 'no_intersection',
-                    'intersection_area': 0,
-                    'overlap_ratio': 0,
-                })
+            if best_idx is not None:
+                target_pos[idx] = best_idx
+                relations[idx] = RELATION_PARTIAL
+                areas[idx] = best_area
 
-        return results
+        self.instrumentation.count('candidates', candidate_count)
+        self.instrumentation.count('predicate_calls', predicate_calls)
+        self.instrumentation.count('intersections', intersection_count)
+        return target_pos, relations, areas, source_areas
 
-    def get_statistics(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _match_vectorized(
+        self,
+        source_geoms: np.ndarray,
+        target_geoms: np.ndarray,
+        tree: STRtree
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        批量向量化匹配
+
+        候选对通过空间索引一次批量查询得到，包含判断和相交面积均由 Shapely
+        向量化函数完成，再按源要素分组取最优目标，规则与逐要素循环完全一致。
+
+        Args:
+            source_geoms: 源几何数组（已修复）
+            target_geoms: 目标几何数组（已修复）
+            tree: 目标几何的空间索引
+
+        Returns:
+            (target_pos, relations, areas, source_areas): 同 match
+        """
+        count = len(source_geoms)
+        target_pos = np.full(count, -1, dtype=np.int64)
+        relations = np.full(count, RELATION_NONE, dtype=np.int8)
+        areas = np.zeros(count, dtype=np.float64)
+        source_areas = self.area_calculator(source_geoms)
+
+        instrumentation = self.instrumentation
+
+        # 一次批量查询得到所有外包框相交的候选对，谓词判断使用预处理过的目标几何
+        src_idx, tgt_idx = tree.query(source_geoms)
+        instrumentation.count('candidates', len(src_idx))
+        with instrumentation.stage('predicate'):
+            prepared_targets = self.prepared_cache.get_many(tgt_idx)
+
+            # 优先级1：完全包含，多个目标包含时取下标最小者（只对预筛选后可能包含的候选对做精确判断）
+            may_contain = self._may_contain(source_geoms, src_idx, tgt_idx, prepared_targets)
+            contained = np.zeros(len(src_idx), dtype=bool)
+            contained[may_contain] = shapely.contains(
+                prepared_targets[may_contain], source_geoms[src_idx[may_contain]]
+            )
+        instrumentation.count('predicate_calls', int(may_contain.sum()))
+        if contained.any():
+            src_first, tgt_first = self._first_per_source(src_idx[contained], tgt_idx[contained])
+            target_pos[src_first] = tgt_first
+            relations[src_first] = RELATION_CONTAINED
+            areas[src_first] = source_areas[src_first]
+
+        # 优先级2：其余要素计算相交面积，取面积最大者（面积相同取下标最小者）
+        remaining = relations[src_idx] == RELATION_NONE
+        src_idx, tgt_idx, prepared_targets = src_idx[remaining], tgt_idx[remaining], prepared_targets[remaining]
+        with instrumentation.stage('predicate'):
+            hit = shapely.intersects(prepared_targets, source_geoms[src_idx])
+        instrumentation.count('predicate_calls', len(src_idx))
+        src_idx, tgt_idx = src_idx[hit], tgt_idx[hit]
+        with instrumentation.stage('intersection'):
+            pair_areas = self.area_calculator(
+                shapely.intersection(source_geoms[src_idx], target_geoms[tgt_idx])
+            )
+        instrumentation.count('intersections', len(src_idx))
+
+        # 忽略面积为0的相交
+        positive = pair_areas > 0
+        src_idx, tgt_idx, pair_areas = src_idx[positive], tgt_idx[positive], pair_areas[positive]
+
+        if len(src_idx):
+            order = np.lexsort((tgt_idx, -pair_areas, src_idx))
+            src_sorted = src_idx[order]
+            _, first = np.unique(src_sorted, return_index=True)
+            best = order[first]
+            target_pos[src_idx[best]] = tgt_idx[best]
+            relations[src_idx[best]] = RELATION_PARTIAL
+            areas[src_idx[best]] = pair_areas[best]
+
+        return target_pos, relations, areas, source_areas
+
+    def _may_contain(
+        self,
+        source_geoms: np.ndarray,
+        src_idx: np.ndarray,
+        tgt_idx: np.ndarray,
+        targets: np.ndarray
+    ) -> np.ndarray:
+        """
+        包含判断的预筛选：排除不可能包含源要素的候选对
+
+        目标包含源要素的两个必要条件：目标外包框包含源要素外包框；目标覆盖源要素的每个顶点。
+        外包框比较是数组运算，几乎没有开销；同一源要素仍有多个候选时，再检查其第一个顶点
+        是否落在目标内（点面判断比面面包含判断便宜），只剩一个候选时这次精确判断本就省不掉。
+        两项都是必要条件，因此不会漏掉包含关系，也不改变候选对的顺序；
+        目标图层互不重叠时，每个被包含的源要素只需一次精确判断。
+
+        调用前需先将目标几何绑定到 self.prepared_cache（使用其中的外包框）。
+
+        Args:
+            source_geoms: 源几何数组
+            src_idx: 候选对的源下标
+            tgt_idx: 候选对的目标下标
+            targets: 候选对的目标几何
+
+        Returns:
+            每个候选对是否可能包含（布尔数组）
+        """
+        source_bounds = shapely.bounds(source_geoms)[src_idx]
+        target_bounds = self.prepared_cache.bounds[tgt_idx]
+        may_contain = (
+            np.all(target_bounds[:, :2] <= source_bounds[:, :2], axis=1)
+            & np.all(target_bounds[:, 2:] >= source_bounds[:, 2:], axis=1)
+        )
+
+        # 空几何的外包框为 NaN，已被排除，下面每个源要素至少有一个顶点
+        pairs = np.flatnonzero(may_contain)
+        _, inverse, counts = np.unique(src_idx[pairs], return_inverse=True, return_counts=True)
+        pairs = pairs[counts[inverse] > 1]
+        if len(pairs):
+            sources, inverse = np.unique(src_idx[pairs], return_inverse=True)
+            coords, owner = shapely.get_coordinates(source_geoms[sources], return_index=True)
+            first = coords[np.searchsorted(owner, np.arange(len(sources)))]
+            may_contain[pairs] = shapely.intersects_xy(targets[pairs], first[inverse, 0], first[inverse, 1])
+            self.instrumentation.count('point_tests', len(pairs))
+        return may_contain
+
+    @staticmethod
+    def _first_per_source(src_idx: np.ndarray, tgt_idx: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        对 (源, 目标) 下标对按源分组，取每组中目标下标最小的一对
+
+        Args:
+            src_idx: 源下标数组
+            tgt_idx: 目标下标数组
+
+        Returns:
+            (src_first, tgt_first): 去重后的源下标及其对应的最小目标下标
+        """
+        order = np.lexsort((tgt_idx, src_idx))
+        src_sorted = src_idx[order]
+        _, first = np.unique(src_sorted, return_index=True)
+        return src_sorted[first], tgt_idx[order][first]
+
+    def get_statistics(self, results: Union[JoinResult, List[Dict[str, Any]]]) -> Dict[str, Any]:
         """
         获取处理统计信息
 
         Args:
-            results: 处理结果列表
+            results: 关联结果（JoinResult 或旧的结果字典列表）
 
         Returns:
             统计信息字典
         """
         total = len(results)
 
-        contained = sum(1 for r in results if r['relation_type'] == 'contained')
-        partial_overlap = sum(1 for r in results if r['relation_type'] == 'partial_overlap')
-        no_intersection = sum(1 for r in results if r['relation_type'] == 'no_intersection')
+        if isinstance(results, JoinResult):
+            counts = np.bincount(results.relations, minlength=len(RELATION_TYPES))
+            contained = int(counts[RELATION_CONTAINED])
+            partial_overlap = int(counts[RELATION_PARTIAL])
+            no_intersection = int(counts[RELATION_NONE])
+        else:
+            contained = sum(1 for r in results if r['relation_type'] == 'contained')
+            partial_overlap = sum(1 for r in results if r['relation_type'] == 'partial_overlap')
+            no_intersection = sum(1 for r in results if r['relation_type'] == 'no_intersection')
 
         return {
             'total': total,
@@ -0,0 +1,269 @@
+"""
+坐标投影模块
+提供带缓存的批量坐标转换和多种面积计算方式
+"""
+
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional, Any
+import weakref
+import numpy as np
+import shapely
+from pyproj import CRS, Transformer
+
+
+# 面积计算方式
+# planar: 直接在图层坐标系中计算（单位为坐标系单位，地理坐标系下为平方度）
+# equal_area: 投影到全球等积投影后计算（平方米）
+# geodesic: 在椭球面上计算测地线面积（平方米）
+AREA_MODES = ('planar', 'equal_area', 'geodesic')
+
+# 全球等积投影（WGS 84 / NSIDC EASE-Grid 2.0 Global，圆柱等积投影）
+EQUAL_AREA_CRS = 'EPSG:6933'
+
+# 测地线面积按数组运算计算时边的最大跨度（度），含更长边的环逐环精确计算
+GEODESIC_MAX_EDGE = 1.0
+
+
+def crs_key(crs: Any) -> str:
+    """
+    将坐标系统一转换为可哈希的 WKT 字符串（用作缓存键）
+
+    Args:
+        crs: 任意 pyproj 可识别的坐标系表示
+
+    Returns:
+        WKT 字符串
+    """
+    return CRS.from_user_input(crs).to_wkt()
+
+
+@lru_cache(maxsize=32)
+def _cached_transformer(crs_from: str, crs_to: str) -> Transformer:
+    return Transformer.from_crs(crs_from, crs_to, always_xy=True)
+
+
+def get_transformer(crs_from: Any, crs_to: Any) -> Transformer:
+    """
+    获取坐标转换器（每对坐标系只创建一次）
+
+    Args:
+        crs_from: 源坐标系
+        crs_to: 目标坐标系
+
+    Returns:
+        pyproj Transformer（x 为经度/东向，y 为纬度/北向）
+    """
+    return _cached_transformer(crs_key(crs_from), crs_key(crs_to))
+
+
+def transform_geometries(geoms: np.ndarray, crs_from: Any, crs_to: Any) -> np.ndarray:
+    """
+    批量转换几何坐标（所有几何的坐标一次性交给 pyproj 转换）
+
+    Args:
+        geoms: 几何数组
+        crs_from: 源坐标系
+        crs_to: 目标坐标系
+
+    Returns:
+        转换后的几何数组
+    """
+    transformer = get_transformer(crs_from, crs_to)
+
+    def transform(coords: np.ndarray) -> np.ndarray:
+        x, y = transformer.transform(coords[:, 0], coords[:, 1])
+        return np.column_stack([x, y])
+
+    return shapely.transform(geoms, transform)
+
+
+def geodesic_areas(geoms: np.ndarray, crs: Any) -> np.ndarray:
+    """
+    计算几何在椭球面上的测地线面积
+
+    坐标先换算为等积（authalic）纬度，在与椭球面积相等的球面上按边累加球面角盈，
+    全部为数组运算；边的跨度不超过 GEODESIC_MAX_EDGE 度时与逐环精确计算
+    （pyproj Geod，Karney 算法）的相对差小于 1e-6。含更长的边或环绕极点的环
+    仍逐环精确计算。
+
+    Args:
+        geoms: 面几何数组
+        crs: 几何所在的坐标系
+
+    Returns:
+        面积数组（平方米）
+    """
+    crs = CRS.from_user_input(crs)
+    geographic = crs.geodetic_crs
+    if not crs.is_geographic:
+        geoms = transform_geometries(geoms, crs, geographic)
+    geod = geographic.get_geod()
+
+    # 按环计算面积：外环为正、内环为负，再按几何累加
+    parts, part_index = shapely.get_parts(geoms, return_index=True)
+    rings, ring_index = shapely.get_rings(parts, return_index=True)
+    areas = np.zeros(len(geoms), dtype=np.float64)
+    if len(rings) == 0:
+        return areas
+    coords, coord_index = shapely.get_coordinates(rings, return_index=True)
+    is_exterior = np.r_[True, ring_index[1:] != ring_index[:-1]]
+
+    # 环内相邻两点构成一条边
+    start = np.flatnonzero(coord_index[1:] == coord_index[:-1])
+    edge_ring = coord_index[start]
+    lon1, lat1 = coords[start, 0], coords[start, 1]
+    lon2, lat2 = coords[start + 1, 0], coords[start + 1, 1]
+    delta_lon = (lon2 - lon1 + 180) % 360 - 180
+
+    # 每条边与赤道（等积纬度）围成的球面梯形面积之和即为环的面积
+    e2 = geod.es
+    t1 = np.tan(_authalic_latitude(np.radians(lat1), e2) / 2)
+    t2 = np.tan(_authalic_latitude(np.radians(lat2), e2) / 2)
+    excess = 2 * np.arctan2(np.tan(np.radians(delta_lon) / 2) * (t1 + t2), 1 + t1 * t2)
+    ring_areas = np.abs(np.bincount(edge_ring, weights=excess, minlength=len(rings))) * _authalic_radius2(geod.a, e2)
+
+    # 长边、环绕极点（经度差累计为 ±360°）的环逐环精确计算
+    long_edge = np.maximum(np.abs(delta_lon), np.abs(lat2 - lat1)) > GEODESIC_MAX_EDGE
+    exact = np.bincount(edge_ring, weights=long_edge, minlength=len(rings)) > 0
+    exact |= np.abs(np.bincount(edge_ring, weights=delta_lon, minlength=len(rings))) > 180
+    bounds = np.searchsorted(coord_index, np.arange(len(rings) + 1))
+    for idx in np.flatnonzero(exact):
+        ring = coords[bounds[idx]:bounds[idx + 1]]
+        area, _ = geod.polygon_area_perimeter(ring[:, 0], ring[:, 1])
+        ring_areas[idx] = abs(area)
+
+    ring_areas[~is_exterior] *= -1
+    np.add.at(areas, part_index[ring_index], ring_areas)
+    return areas
+
+
+def _authalic_q(sin_lat: np.ndarray, e2: float) -> np.ndarray:
+    """等积纬度换算中的 q 函数（e2 为第一偏心率平方，大于 0）"""
+    e = np.sqrt(e2)
+    return (1 - e2) * (sin_lat / (1 - e2 * sin_lat ** 2) - np.log((1 - e * sin_lat) / (1 + e * sin_lat)) / (2 * e))
+
+
+def _authalic_latitude(lat: np.ndarray, e2: float) -> np.ndarray:
+    """大地纬度（弧度）换算为等积纬度（弧度）"""
+    if e2 == 0:
+        return lat
+    return np.arcsin(np.clip(_authalic_q(np.sin(lat), e2) / _authalic_q(np.float64(1.0), e2), -1, 1))
+
+
+def _authalic_radius2(a: float, e2: float) -> float:
+    """与椭球面积相等的球（等积球）半径的平方"""
+    if e2 == 0:
+        return a * a
+    return a * a * float(_authalic_q(np.float64(1.0), e2)) / 2
+
+
+class ReprojectionCache:
+    """重投影结果缓存类（按图层几何数组对象缓存，LRU 淘汰）"""
+
+    def __init__(self, max_entries: int = 4):
+        """
+        初始化缓存
+
+        以原始几何数组对象本身为键（弱引用，图层被释放后条目自动失效），
+        因此同一个参考图层反复参与处理时只需转换一次。缓存期间图层不应被原地修改。
+
+        Args:
+            max_entries: 最多缓存的图层数
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+    def get(self, layer_geoms: Any, crs_from: Any, crs_to: Any) -> Optional[np.ndarray]:
+        """
+        获取缓存的重投影结果
+
+        Args:
+            layer_geoms: 原始图层的几何数组（如 gdf.geometry.values）
+            crs_from: 源坐标系
+            crs_to: 目标坐标系
+
+        Returns:
+            重投影后的几何数组，未命中时为 None
+        """
+        key = (id(layer_geoms), crs_key(crs_from), crs_key(crs_to))
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        ref, projected = entry
+        if ref() is not layer_geoms:
+            # 原图层已释放，id 被其他对象复用
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return projected
+
+    def put(self, layer_geoms: Any, crs_from: Any, crs_to: Any, projected: np.ndarray):
+        """
+        写入重投影结果
+
+        Args:
+            layer_geoms: 原始图层的几何数组
+            crs_from: 源坐标系
+            crs_to: 目标坐标系
+            projected: 重投影后的几何数组
+        """
+        key = (id(layer_geoms), crs_key(crs_from), crs_key(crs_to))
+        self._entries[key] = (weakref.ref(layer_geoms), projected)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """清空缓存"""
+        self._entries.clear()
+
+
+class AreaCalculator:
+    """面积计算类（按所选方式批量计算面积）"""
+
+    def __init__(self, mode: str = 'planar', crs: Optional[Any] = None):
+        """
+        初始化面积计算器
+
+        Args:
+            mode: 面积计算方式（见 AREA_MODES）
+            crs: 几何所在的坐标系（planar 以外的方式必须提供）
+        """
+        if mode not in AREA_MODES:
+            raise ValueError(f"不支持的面积计算方式: {mode}，可选: {', '.join(AREA_MODES)}")
+        if mode != 'planar' and crs is None:
+            raise ValueError(f"面积计算方式 {mode} 需要图层定义坐标系")
+
+        self.mode = mode
+        self.crs = crs_key(crs) if crs is not None else None
+
+    def __call__(self, geoms: np.ndarray) -> np.ndarray:
+        """
+        批量计算面积
+
+        Args:
+            geoms: 几何数组
+
+        Returns:
+            面积数组
+        """
+        if self.mode == 'equal_area':
+            return shapely.area(transform_geometries(geoms, self.crs, EQUAL_AREA_CRS))
+        if self.mode == 'geodesic':
+            return geodesic_areas(geoms, self.crs)
+        return shapely.area(geoms)
+
+    def area(self, geom) -> float:
+        """
+        计算单个几何的面积
+
+        Args:
+            geom: Shapely 几何对象
+
+        Returns:
+            面积
+        """
+        if self.mode == 'planar':
+            return geom.area
+        return float(self(np.array([geom], dtype=object))[0])
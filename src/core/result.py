@@ -0,0 +1,397 @@
+"""
+关联结果模块
+以列式数组保存空间关联结果，属性按需从原始图层关联
+"""
+
+from typing import List, Dict, Any, Iterator, Optional
+import numpy as np
+import pandas as pd
+import geopandas as gpd
+
+
+# 关联类型编码（数组中的取值即为此元组的下标）
+RELATION_NONE = 0
+RELATION_CONTAINED = 1
+RELATION_PARTIAL = 2
+RELATION_TYPES = ('no_intersection', 'contained', 'partial_overlap')
+
+# 报告表（JoinResult.to_dataframe）中的关联信息列
+REPORT_COLUMNS = ('source_id', 'target_id', 'relation_type', 'intersection_area', 'overlap_ratio')
+
+# 含缺失值时整数、布尔列使用的可空类型（按 numpy dtype.kind）
+NULLABLE_DTYPES = {'i': 'Int64', 'u': 'UInt64', 'b': 'boolean'}
+
+
+def attribute_column_names(side: str, fields: List[str]) -> Dict[str, str]:
+    """
+    报告表中源或目标属性字段的列名
+
+    列名为 前缀 + 字段名；与关联信息列重名时（如源图层的 id 字段得到 source_id）
+    改为 前缀 + attr_ + 字段名（source_attr_id）。
+
+    Args:
+        side: 'source' 或 'target'
+        fields: 属性字段名列表
+
+    Returns:
+        字段名 -> 列名
+    """
+    taken = set(REPORT_COLUMNS)
+    columns = {}
+    for key in fields:
+        col_name = f'{side}_{key}'
+        while col_name in taken:
+            col_name = f'{side}_attr_{col_name[len(side) + 1:]}'
+        taken.add(col_name)
+        columns[key] = col_name
+    return columns
+
+
+class JoinResult:
+    """空间关联结果类（列式存储）"""
+
+    def __init__(
+        self,
+        source_gdf: gpd.GeoDataFrame,
+        target_gdf: gpd.GeoDataFrame,
+        target_index: np.ndarray,
+        relations: np.ndarray,
+        intersection_area: np.ndarray,
+        overlap_ratio: np.ndarray,
+        source_id_field: Optional[str] = None,
+        target_id_field: Optional[str] = None,
+        area_mode: str = 'planar'
+    ):
+        """
+        初始化关联结果
+
+        结果只保存下标和数值数组，源、目标属性在需要时才从原始图层中取出，
+        因此原始 GeoDataFrame 在结果使用期间不应被修改。
+
+        Args:
+            source_gdf: 源图层 GeoDataFrame
+            target_gdf: 目标图层 GeoDataFrame
+            target_index: 每个源要素关联到的目标要素位置下标（无关联为 -1）
+            relations: 关联类型编码（见 RELATION_TYPES）
+            intersection_area: 相交面积
+            overlap_ratio: 重叠比例
+            source_id_field: 源图层ID字段名（None 表示使用索引）
+            target_id_field: 目标图层ID字段名（None 表示使用索引）
+            area_mode: 计算面积时使用的方式（见 projection.AREA_MODES）
+        """
+        self.source_gdf = source_gdf
+        self.target_gdf = target_gdf
+        self.source_index = np.arange(len(source_gdf), dtype=np.int64)
+        self.target_index = np.asarray(target_index, dtype=np.int64)
+        self.relations = np.asarray(relations, dtype=np.int8)
+        self.intersection_area = np.asarray(intersection_area, dtype=np.float64)
+        self.overlap_ratio = np.asarray(overlap_ratio, dtype=np.float64)
+        self.source_id_field = source_id_field
+        self.target_id_field = target_id_field
+        self.area_mode = area_mode
+
+    def __len__(self) -> int:
+        return len(self.source_index)
+
+    def __getitem__(self, idx: int) -> Dict[str, Any]:
+        """按位置获取单条结果（兼容旧的字典格式）"""
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError(f"结果下标越界: {idx}")
+
+        # 先取出单行再去掉几何字段，避免复制整个图层
+        target_idx = int(self.target_index[idx])
+        source_attrs = self.source_gdf.iloc[idx].drop(self.source_gdf.geometry.name).to_dict()
+        if target_idx >= 0:
+            target_attrs = self.target_gdf.iloc[target_idx].drop(self.target_gdf.geometry.name).to_dict()
+            target_id = self._all_target_ids()[target_idx:target_idx + 1].tolist()[0]
+        else:
+            target_attrs = {k: None for k in self.target_fields}
+            target_id = None
+
+        source_id = self.source_ids[idx:idx + 1].tolist()[0]
+        return self._make_record(idx, source_id, source_attrs, target_id, target_attrs)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.to_records())
+
+    @property
+    def target_fields(self) -> List[str]:
+        """目标图层属性字段名（不含几何字段）"""
+        return [k for k in self.target_gdf.columns if k != self.target_gdf.geometry.name]
+
+    @property
+    def relation_type(self) -> np.ndarray:
+        """关联类型名称数组"""
+        return np.asarray(RELATION_TYPES, dtype=object)[self.relations]
+
+    @property
+    def source_ids(self) -> np.ndarray:
+        """源要素ID数组"""
+        if self.source_id_field is None:
+            return self.source_gdf.index.to_numpy()
+        return self.source_gdf[self.source_id_field].to_numpy()
+
+    @property
+    def target_ids(self) -> np.ndarray:
+        """关联到的目标要素ID数组（无关联为 None）"""
+        ids = np.full(len(self), None, dtype=object)
+        matched = self.target_index >= 0
+        ids[matched] = self._all_target_ids()[self.target_index[matched]]
+        return ids
+
+    def source_attributes(self) -> pd.DataFrame:
+        """
+        获取源要素属性表
+
+        Returns:
+            与结果逐行对应的源属性 DataFrame（不含几何字段）
+        """
+        return pd.DataFrame(self.source_gdf.drop(columns=self.source_gdf.geometry.name)).reset_index(drop=True)
+
+    def target_attributes(self) -> pd.DataFrame:
+        """
+        获取关联到的目标要素属性表
+
+        Returns:
+            与结果逐行对应的目标属性 DataFrame（不含几何字段，无关联的行为空值；
+            整数、布尔字段为可空的 Int64、UInt64、boolean 类型）
+        """
+        return self._take(pd.DataFrame(self.target_gdf.drop(columns=self.target_gdf.geometry.name)))
+
+    def attribute_columns(self, side: str) -> Dict[str, str]:
+        """
+        报告表中源或目标属性字段的列名（见 attribute_column_names）
+
+        Args:
+            side: 'source' 或 'target'
+
+        Returns:
+            字段名 -> 列名
+        """
+        gdf = self.source_gdf if side == 'source' else self.target_gdf
+        return attribute_column_names(side, [k for k in gdf.columns if k != gdf.geometry.name])
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        转换为扁平的报告表
+
+        Returns:
+            包含关联信息、源属性（前缀 source_）和目标属性（前缀 target_）的 DataFrame，
+            属性列名见 attribute_columns
+        """
+        base = pd.DataFrame({
+            'source_id': self.source_ids,
+            'target_id': self.target_ids,
+            'relation_type': self.relation_type,
+            'intersection_area': self.intersection_area,
+            'overlap_ratio': self.overlap_ratio,
+        })
+        return pd.concat([
+            base,
+            self.source_attributes().rename(columns=self.attribute_columns('source')),
+            self.target_attributes().rename(columns=self.attribute_columns('target')),
+        ], axis=1)
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """
+        转换为旧的逐要素字典列表（兼容视图）
+
+        Returns:
+            结果列表，每个元素包含 source_id、source_attributes、target_id、
+            target_attributes、relation_type、intersection_area、overlap_ratio
+        """
+        source_ids = self.source_ids.tolist()
+        target_ids = self.target_ids.tolist()
+        source_records = self.source_attributes().to_dict('records')
+        # 目标属性按目标要素各转换一次，保持原始的 Python 类型（无关联时为 None）
+        target_rows = pd.DataFrame(self.target_gdf.drop(columns=self.target_gdf.geometry.name)).to_dict('records')
+        empty = {k: None for k in self.target_fields}
+        return [
+            self._make_record(
+                idx, source_ids[idx], source_records[idx], target_ids[idx],
+                dict(target_rows[target_idx] if target_idx >= 0 else empty)
+            )
+            for idx, target_idx in enumerate(self.target_index.tolist())
+        ]
+
+    def _all_target_ids(self) -> np.ndarray:
+        """目标图层全部要素的ID数组"""
+        if self.target_id_field is None:
+            return self.target_gdf.index.to_numpy()
+        return self.target_gdf[self.target_id_field].to_numpy()
+
+    def _make_record(
+        self,
+        idx: int,
+        source_id: Any,
+        source_attrs: Dict[str, Any],
+        target_id: Any,
+        target_attrs: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """组装单条字典格式的结果"""
+        relation = int(self.relations[idx])
+        return {
+            'source_id': source_id,
+            'source_attributes': source_attrs,
+            'target_id': target_id,
+            'target_attributes': target_attrs,
+            'relation_type': RELATION_TYPES[relation],
+            'intersection_area': float(self.intersection_area[idx]) if relation != RELATION_NONE else 0,
+            'overlap_ratio': float(self.overlap_ratio[idx]) if relation != RELATION_NONE else 0,
+        }
+
+    def _take(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        按 target_index 从目标数据中取行，无关联的行填充空值
+
+        Args:
+            data: 与目标图层逐行对应的 DataFrame
+
+        Returns:
+            与结果逐行对应的 DataFrame
+        """
+        data = data.reset_index(drop=True)
+        matched = self.target_index >= 0
+        if matched.all():
+            return data.iloc[self.target_index].reset_index(drop=True)
+
+        # 整数、布尔列转为可空类型，避免因缺失值变成浮点数（导出时仍为整数、布尔字段）；
+        # 文本列缺失值为 None，其他列保持原类型，缺失值为 NaN / NaT
+        dtypes = {}
+        for col, dtype in data.dtypes.items():
+            if isinstance(dtype, np.dtype) and dtype.kind in NULLABLE_DTYPES:
+                dtypes[col] = NULLABLE_DTYPES[dtype.kind]
+            elif pd.api.types.is_string_dtype(dtype):
+                dtypes[col] = object
+        taken = data.astype(dtypes).reindex(self.target_index).reset_index(drop=True)
+        text = [col for col, dtype in dtypes.items() if dtype is object]
+        if text:
+            taken.loc[~matched, text] = None
+        return taken
+
+
+class OverlapTable:
+    """源×目标相交边表（列式存储，每行为一对面积大于 0 的相交要素）"""
+
+    def __init__(
+        self,
+        source_gdf: gpd.GeoDataFrame,
+        target_gdf: gpd.GeoDataFrame,
+        source_index: np.ndarray,
+        target_index: np.ndarray,
+        intersection_area: np.ndarray,
+        source_ratio: np.ndarray,
+        target_ratio: np.ndarray,
+        source_id_field: Optional[str] = None,
+        target_id_field: Optional[str] = None,
+        area_mode: str = 'planar',
+        geometry: Optional[np.ndarray] = None,
+        crs=None
+    ):
+        """
+        初始化边表
+
+        Args:
+            source_gdf: 源图层 GeoDataFrame
+            target_gdf: 目标图层 GeoDataFrame
+            source_index: 每对的源要素位置下标
+            target_index: 每对的目标要素位置下标
+            intersection_area: 相交面积
+            source_ratio: 相交面积 / 源要素面积
+            target_ratio: 相交面积 / 目标要素面积
+            source_id_field: 源图层ID字段名（None 表示使用索引）
+            target_id_field: 目标图层ID字段名（None 表示使用索引）
+            area_mode: 计算面积时使用的方式（见 projection.AREA_MODES）
+            geometry: 每对的相交几何（None 表示不保留几何）
+            crs: 相交几何的坐标系
+        """
+        self.source_gdf = source_gdf
+        self.target_gdf = target_gdf
+        self.source_index = np.asarray(source_index, dtype=np.int64)
+        self.target_index = np.asarray(target_index, dtype=np.int64)
+        self.intersection_area = np.asarray(intersection_area, dtype=np.float64)
+        self.source_ratio = np.asarray(source_ratio, dtype=np.float64)
+        self.target_ratio = np.asarray(target_ratio, dtype=np.float64)
+        self.source_id_field = source_id_field
+        self.target_id_field = target_id_field
+        self.area_mode = area_mode
+        self.geometry = geometry
+        self.crs = crs
+
+    def __len__(self) -> int:
+        return len(self.source_index)
+
+    @property
+    def has_geometry(self) -> bool:
+        """是否保留了相交几何"""
+        return self.geometry is not None
+
+    @property
+    def source_ids(self) -> np.ndarray:
+        """每对的源要素ID数组"""
+        ids = self.source_gdf.index if self.source_id_field is None else self.source_gdf[self.source_id_field]
+        return ids.to_numpy()[self.source_index]
+
+    @property
+    def target_ids(self) -> np.ndarray:
+        """每对的目标要素ID数组"""
+        ids = self.target_gdf.index if self.target_id_field is None else self.target_gdf[self.target_id_field]
+        return ids.to_numpy()[self.target_index]
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        转换为边表 DataFrame
+
+        Returns:
+            包含 source_id、target_id、intersection_area、source_ratio、target_ratio 的 DataFrame
+        """
+        return pd.DataFrame({
+            'source_id': self.source_ids,
+            'target_id': self.target_ids,
+            'intersection_area': self.intersection_area,
+            'source_ratio': self.source_ratio,
+            'target_ratio': self.target_ratio,
+        })
+
+    def to_geodataframe(self) -> gpd.GeoDataFrame:
+        """
+        转换为带相交几何的边表 GeoDataFrame
+
+        Returns:
+            to_dataframe() 的各列加上相交几何列 geometry
+
+        Raises:
+            ValueError: 边表未保留相交几何
+        """
+        if self.geometry is None:
+            raise ValueError("边表未保留相交几何（计算时需指定 keep_geometry=True）")
+        return gpd.GeoDataFrame(self.to_dataframe(), geometry=self.geometry, crs=self.crs)
+
+    @classmethod
+    def concat(cls, tables: List['OverlapTable']) -> 'OverlapTable':
+        """
+        合并同一对图层的多个边表（如逐块计算的结果）
+
+        Args:
+            tables: 边表列表（至少一个）
+
+        Returns:
+            合并后的边表
+        """
+        first = tables[0]
+        return cls(
+            first.source_gdf,
+            first.target_gdf,
+            np.concatenate([t.source_index for t in tables]),
+            np.concatenate([t.target_index for t in tables]),
+            np.concatenate([t.intersection_area for t in tables]),
+            np.concatenate([t.source_ratio for t in tables]),
+            np.concatenate([t.target_ratio for t in tables]),
+            first.source_id_field,
+            first.target_id_field,
+            first.area_mode,
+            geometry=np.concatenate([t.geometry for t in tables]) if first.has_geometry else None,
+            crs=first.crs
+        )
@@ -0,0 +1,85 @@
+"""
+流式处理模块
+按批读取源图层、逐批关联并追加写出，内存占用取决于批大小而不是图层大小
+"""
+
+from typing import Dict, Any, Optional, Callable
+import geopandas as gpd
+from .loader import ShapefileLoader
+from .processor import SpatialJoinProcessor
+from .exporter import ResultExporter
+
+
+# 默认每批源要素数
+DEFAULT_BATCH_SIZE = 50_000
+
+
+def stream_join(
+    source_path: str,
+    target_gdf: gpd.GeoDataFrame,
+    output_path: str,
+    processor: SpatialJoinProcessor,
+    loader: Optional[ShapefileLoader] = None,
+    exporter: Optional[ResultExporter] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    source_id_field: str = None,
+    target_id_field: str = None,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    area_mode: str = 'planar'
+) -> Dict[str, Any]:
+    """
+    流式执行空间关联并写出结果
+
+    目标图层整体保留在内存中并建立空间索引；源图层每次只读取一批，
+    每批的关联结果立即追加到输出文件（.shp、.gpkg 或 .csv）后释放。
+
+    Args:
+        source_path: 源图层 Shapefile 路径
+        target_gdf: 目标图层 GeoDataFrame
+        output_path: 输出文件路径
+        processor: 空间关联处理器
+        loader: 图层加载器（默认新建，与 processor 共用计量实例）
+        exporter: 结果导出器（默认新建，与 processor 共用计量实例）
+        batch_size: 每批源要素数
+        source_id_field: 源图层ID字段名（默认使用要素序号）
+        target_id_field: 目标图层ID字段名（默认使用索引）
+        progress_callback: 进度回调，每处理完一批调用一次 (已完成数, 总数)
+        area_mode: 面积计算方式（见 SpatialJoinProcessor.process）
+
+    Returns:
+        统计信息字典（格式同 SpatialJoinProcessor.get_statistics）
+
+    Raises:
+        ValueError: 源图层无效
+        RuntimeError: 写出失败
+        ProcessingCancelled: 处理过程中调用了 processor.cancel()
+    """
+    loader = loader or ShapefileLoader(instrumentation=processor.instrumentation)
+    exporter = exporter or ResultExporter(processor.instrumentation)
+
+    total = loader.count_features(source_path)
+    batches = loader.iter_batches(source_path, batch_size)
+
+    stats = {'total': 0, 'contained': 0, 'partial_overlap': 0, 'no_intersection': 0}
+    for results in processor.process_batches(
+        batches,
+        target_gdf,
+        source_id_field=source_id_field,
+        target_id_field=target_id_field,
+        total=total,
+        progress_callback=progress_callback,
+        area_mode=area_mode
+    ):
+        success, errors = exporter.append_batch(
+            results.source_gdf, results, output_path, append=stats['total'] > 0
+        )
+        if not success:
+            raise RuntimeError(errors[0])
+
+        batch_stats = processor.get_statistics(results)
+        for key in stats:
+            stats[key] += batch_stats[key]
+
+    matched = stats['contained'] + stats['partial_overlap']
+    stats['success_rate'] = matched / stats['total'] if stats['total'] > 0 else 0
+    return stats
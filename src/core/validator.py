@@ -3,16 +3,24 @@
 提供几何验证和修复功能
 """
 
-from typing import Tuple, List
+from typing import Tuple, List, Optional
+import numpy as np
+import shapely
 from shapely.geometry import Polygon, MultiPolygon, GeometryCollection, shape
+from .instrumentation import Instrumentation
 
 
 class GeometryValidator:
     """几何验证和修复类"""
 
-    def __init__(self):
-        """初始化验证器"""
-        pass
+    def __init__(self, instrumentation: Optional[Instrumentation] = None):
+        """
+        初始化验证器
+
+        Args:
+            instrumentation: 计量实例（记录 repair 阶段及有效性检查、修复数量；默认新建）
+        """
+        self.instrumentation = instrumentation if instrumentation is not None else Instrumentation()
 
     def fix_invalid_geometry(self, geom):
         """
@@ -49,6 +57,58 @@ class GeometryValidator:
 
         return fixed
 
+    def fix_invalid_geometries(self, geoms) -> Tuple[np.ndarray, int]:
+        """
+        批量修复无效几何
+
+        使用向量化的 shapely.is_valid 找出无效要素，再统一用 shapely.make_valid 修复；
+        修复结果若为几何集合，只保留其中的面部分。
+
+        Args:
+            geoms: 几何数组（或可转换为数组的序列）
+
+        Returns:
+            (fixed_geoms, repaired_count): 修复后的几何数组（不修改输入）和修复的要素数
+        """
+        geoms = np.asarray(geoms, dtype=object)
+        with self.instrumentation.stage('repair'):
+            invalid = np.flatnonzero(~shapely.is_valid(geoms) & ~shapely.is_missing(geoms))
+            self.instrumentation.count('validity_checks', len(geoms))
+            if len(invalid) == 0:
+                return geoms, 0
+            self.instrumentation.count('repairs', len(invalid))
+            return self._repair(geoms, invalid), len(invalid)
+
+    @staticmethod
+    def _repair(geoms: np.ndarray, invalid: np.ndarray) -> np.ndarray:
+        """
+        修复指定下标的几何
+
+        Args:
+            geoms: 几何数组
+            invalid: 无效几何的下标
+
+        Returns:
+            修复后的几何数组（不修改输入）
+        """
+        fixed = geoms.copy()
+        repaired = shapely.make_valid(geoms[invalid])
+
+        # 几何集合中可能混有线、点，提取其中的面
+        collections = np.flatnonzero(
+            shapely.get_type_id(repaired) == shapely.GeometryType.GEOMETRYCOLLECTION
+        )
+        for idx in collections:
+            parts = shapely.get_parts(repaired[idx])
+            polygons = parts[np.isin(
+                shapely.get_type_id(parts),
+                [shapely.GeometryType.POLYGON, shapely.GeometryType.MULTIPOLYGON]
+            )]
+            repaired[idx] = shapely.union_all(polygons) if len(polygons) else Polygon()
+
+        fixed[invalid] = repaired
+        return fixed
+
     def validate_geometry(self, geom) -> Tuple[bool, List[str]]:
         """
         验证几何对象
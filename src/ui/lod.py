@@ -0,0 +1,280 @@
+"""
+多级细节（LOD）模块
+为地图预览生成多级简化几何，并按可见范围裁剪为绘制路径
+"""
+
+from typing import Dict, List, Tuple, Any
+import numpy as np
+import shapely
+
+
+# 路径指令（与 matplotlib.path.Path.MOVETO / LINETO / CLOSEPOLY 取值相同）
+MOVETO = 1
+LINETO = 2
+CLOSEPOLY = 79
+
+
+class GeometryPyramid:
+    """简化几何金字塔（第 k 级的简化误差约为整幅图层显示在 base_pixels * 2**k 像素宽时的 1 像素）"""
+
+    def __init__(self, geoms: np.ndarray, levels: int = 8, base_pixels: int = 256):
+        """
+        初始化金字塔
+
+        几何拆分为环后按顶点展开存储一次；各简化级别在第一次被使用时由原始顶点
+        生成（按容差大小的网格合并相邻顶点），之后缓存复用。
+
+        Args:
+            geoms: 面几何数组
+            levels: 简化级数（另有一级原始精度）
+            base_pixels: 最粗一级对应的图层显示宽度（像素）
+        """
+        self._full = self._split_rings(np.asarray(geoms))
+        self.bounds = tuple(shapely.total_bounds(np.asarray(geoms)))
+        span = max(self.bounds[2] - self.bounds[0], self.bounds[3] - self.bounds[1])
+        if not np.isfinite(span) or span <= 0:
+            span = 1.0
+        self.tolerances = [span / (base_pixels * 2 ** k) for k in range(levels)]
+        self._levels: Dict[int, Dict[str, Any]] = {self.full_level: self._full}
+
+    @property
+    def full_level(self) -> int:
+        """原始精度级别的编号"""
+        return len(self.tolerances)
+
+    def select_level(self, pixel_size: float) -> int:
+        """
+        选择简化误差不超过一个像素的最粗级别
+
+        Args:
+            pixel_size: 当前视图中一个像素对应的地图单位长度
+
+        Returns:
+            级别编号
+        """
+        for level, tolerance in enumerate(self.tolerances):
+            if tolerance <= pixel_size:
+                return level
+        return self.full_level
+
+    def visible_paths(
+        self,
+        extent: Tuple[float, float, float, float],
+        pixel_size: float,
+        vertex_budget: int = 50_000,
+        max_path_vertices: int = 20_000
+    ) -> Tuple[List[np.ndarray], List[np.ndarray], np.ndarray]:
+        """
+        获取当前视图中需要绘制的内容
+
+        与视图范围相交的环先裁剪到视图范围（外扩两个像素），视图外的顶点不计入预算；
+        再按外包框从大到小在顶点预算内绘制为矢量路径（放不下的环跳过，不影响后面
+        较小的环），合并为若干条复合路径（环首为 MOVETO、环尾为 CLOSEPOLY），可直接
+        交给 PolyCollection.set_verts_and_codes；超出预算或简化后退化的小环
+        （通常只有几个像素大）只返回中心点，由调用方按像素绘制。
+
+        Args:
+            extent: 视图范围 (minx, miny, maxx, maxy)
+            pixel_size: 一个像素对应的地图单位长度
+            vertex_budget: 绘制为矢量路径的顶点数上限（决定重绘耗时）
+            max_path_vertices: 每条复合路径的顶点数上限（过长的路径会超出渲染器的限制）
+
+        Returns:
+            (verts, codes, points): 各复合路径的顶点数组和路径指令数组列表，
+            以及按像素绘制的小环中心点 (n, 2)
+        """
+        level = self._get_level(self.select_level(pixel_size))
+        bounds = self._full['bounds']
+        counts = level['counts']
+        min_x, min_y, max_x, max_y = extent
+        visible = np.flatnonzero(
+            (bounds[:, 2] >= min_x) & (bounds[:, 0] <= max_x) &
+            (bounds[:, 3] >= min_y) & (bounds[:, 1] <= max_y)
+        )
+
+        # 跨越视图边界的环裁剪到视图范围（外扩两个像素，裁剪产生的边不可见），
+        # 视图外的顶点不占用预算，深度放大时大面仍能绘制
+        margin = 2 * pixel_size
+        clip_box = (min_x - margin, min_y - margin, max_x + margin, max_y + margin)
+        crossing = (
+            (bounds[visible, 0] < clip_box[0]) | (bounds[visible, 1] < clip_box[1]) |
+            (bounds[visible, 2] > clip_box[2]) | (bounds[visible, 3] > clip_box[3])
+        ) & (counts[visible] >= 4)
+        rings = self._level_rings(level, visible[~crossing])
+        if crossing.any():
+            rings = self._concat_rings(rings, self._clip_rings(level, visible[crossing], clip_box))
+
+        # 大环优先占用顶点预算（尺寸相同时保持原有顺序，外环先于内环）；
+        # 放不下的环跳过，预算留给后面较小的环
+        sizes = np.maximum(rings['bounds'][:, 2] - rings['bounds'][:, 0], rings['bounds'][:, 3] - rings['bounds'][:, 1])
+        order = np.argsort(-sizes, kind='stable')
+        order = order[rings['counts'][order] >= 4]
+        drawn = np.zeros(len(rings['counts']), dtype=bool)
+        drawn[order[self._fit_budget(rings['counts'][order], vertex_budget)]] = True
+        small = np.flatnonzero(~drawn)
+        points = np.column_stack([
+            (rings['bounds'][small, 0] + rings['bounds'][small, 2]) / 2,
+            (rings['bounds'][small, 1] + rings['bounds'][small, 3]) / 2,
+        ])
+
+        if not drawn.any():
+            return [], [], points
+
+        vertex_mask = np.repeat(drawn, rings['counts'])
+        coords = rings['coords'][vertex_mask]
+        codes = rings['codes'][vertex_mask]
+
+        # 按环边界切分，每段的顶点数不超过 max_path_vertices（单个环超过上限时独占一段）
+        drawn_counts = rings['counts'][drawn]
+        ring_ends = np.cumsum(drawn_counts)
+        groups = (ring_ends - drawn_counts) // max_path_vertices
+        splits = ring_ends[:-1][np.diff(groups) > 0]
+        return np.split(coords, splits), np.split(codes, splits), points
+
+    @staticmethod
+    def _fit_budget(counts: np.ndarray, budget: int) -> np.ndarray:
+        """
+        按顺序挑选能放入顶点预算的环（放不下的环跳过，继续尝试后面的环）
+
+        Args:
+            counts: 按优先顺序排列的各环顶点数
+            budget: 顶点预算
+
+        Returns:
+            与 counts 对应的是否绘制标记
+        """
+        take = np.zeros(len(counts), dtype=bool)
+        candidates = np.arange(len(counts))
+        while len(candidates):
+            candidates = candidates[counts[candidates] <= budget]
+            # 筛选后第一个环必能放下；取能放下的最长前缀，紧随其后的环此后也放不下
+            fits = int((np.cumsum(counts[candidates]) <= budget).sum())
+            take[candidates[:fits]] = True
+            budget -= int(counts[candidates[:fits]].sum())
+            candidates = candidates[fits + 1:]
+        return take
+
+    @staticmethod
+    def _level_rings(level: Dict[str, Any], indices: np.ndarray) -> Dict[str, Any]:
+        """取出某一级中指定环的顶点（按环的原有顺序，origin 为环的编号）"""
+        indices = np.sort(indices)
+        vertex_mask = np.repeat(np.isin(np.arange(len(level['counts'])), indices), level['counts'])
+        return {
+            'coords': level['coords'][vertex_mask],
+            'codes': level['codes'][vertex_mask],
+            'counts': level['counts'][indices],
+            'bounds': level['bounds'][indices],
+            'origin': indices,
+        }
+
+    def _clip_rings(self, level: Dict[str, Any], indices: np.ndarray, clip_box: Tuple[float, ...]) -> Dict[str, Any]:
+        """
+        将环裁剪到矩形范围内，裁剪结果保持原环的方向（内环仍为内环）
+
+        Args:
+            level: 级别数据
+            indices: 要裁剪的环（每个环至少 4 个顶点）
+            clip_box: 裁剪范围 (minx, miny, maxx, maxy)
+
+        Returns:
+            裁剪后的环（结构同 _split_rings）
+        """
+        indices = np.sort(indices)
+        part = self._level_rings(level, indices)
+        ring_index = np.repeat(np.arange(len(part['counts'])), part['counts'])
+        rings = shapely.linearrings(part['coords'], indices=ring_index)
+        clipped = shapely.clip_by_rect(shapely.polygons(rings), *clip_box)
+
+        pieces, piece_index = shapely.get_parts(clipped, return_index=True)
+        nonempty = ~shapely.is_empty(pieces)
+        pieces, piece_index = shapely.get_exterior_ring(pieces[nonempty]), piece_index[nonempty]
+        # 方向与原环不一致的片段反转顶点顺序
+        flip = shapely.is_ccw(pieces) != shapely.is_ccw(rings)[piece_index]
+        pieces[flip] = shapely.reverse(pieces[flip])
+
+        clipped_rings = self._split_rings(shapely.polygons(pieces))
+        clipped_rings['origin'] = indices[piece_index]
+        return clipped_rings
+
+    @staticmethod
+    def _concat_rings(first: Dict[str, Any], second: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        合并两组环，按原环编号排序（裁剪片段回到原环的位置，外环与其内环在复合路径中相邻）
+        """
+        counts = np.concatenate([first['counts'], second['counts']])
+        origin = np.concatenate([first['origin'], second['origin']])
+        order = np.argsort(origin, kind='stable')
+        starts = np.cumsum(counts) - counts
+        new_counts = counts[order]
+        new_starts = np.cumsum(new_counts) - new_counts
+        vertex_index = (
+            np.arange(int(new_counts.sum()))
+            - np.repeat(new_starts, new_counts) + np.repeat(starts[order], new_counts)
+        )
+        return {
+            'coords': np.concatenate([first['coords'], second['coords']])[vertex_index],
+            'codes': np.concatenate([first['codes'], second['codes']])[vertex_index],
+            'counts': new_counts,
+            'bounds': np.concatenate([first['bounds'], second['bounds']])[order],
+            'origin': origin[order],
+        }
+
+    def _get_level(self, level: int) -> Dict[str, Any]:
+        """
+        获取（必要时生成）某一级的顶点
+
+        简化时把顶点归入边长为容差的网格，同一环中连续落在同一网格的顶点只保留第一个，
+        环的首尾顶点始终保留。简化只用于显示，不保持拓扑。
+        """
+        if level not in self._levels:
+            full = self._full
+            tolerance = self.tolerances[level]
+            cells = np.floor(full['coords'] / tolerance).astype(np.int64)
+
+            keep = np.ones(len(cells), dtype=bool)
+            keep[1:] = np.any(cells[1:] != cells[:-1], axis=1)
+            ends = np.cumsum(full['counts'])
+            nonempty = full['counts'] > 0
+            keep[(ends - full['counts'])[nonempty]] = True
+            keep[ends[nonempty] - 1] = True
+
+            ring_index = np.repeat(np.arange(len(full['counts'])), full['counts'])
+            self._levels[level] = {
+                'coords': full['coords'][keep],
+                'codes': full['codes'][keep],
+                'counts': np.bincount(ring_index[keep], minlength=len(full['counts'])),
+                'bounds': full['bounds'],
+            }
+        return self._levels[level]
+
+    @staticmethod
+    def _split_rings(geoms: np.ndarray) -> Dict[str, Any]:
+        """
+        将面几何拆分为环，按顶点展开存储
+
+        Args:
+            geoms: 面几何数组
+
+        Returns:
+            {'coords': 全部顶点, 'codes': 路径指令, 'counts': 各环顶点数,
+             'bounds': 各环外包框, 'sizes': 各环外包框的长边}
+        """
+        parts = shapely.get_parts(geoms)
+        rings = shapely.get_rings(parts[~shapely.is_empty(parts)])
+        coords, ring_index = shapely.get_coordinates(rings, return_index=True)
+        counts = np.bincount(ring_index, minlength=len(rings))
+
+        # 与 matplotlib.path.Path 的指令编码一致
+        codes = np.full(len(coords), LINETO, dtype=np.uint8)
+        ends = np.cumsum(counts)
+        codes[ends[counts > 0] - 1] = CLOSEPOLY
+        codes[(ends - counts)[counts > 0]] = MOVETO
+
+        bounds = shapely.bounds(rings).reshape(-1, 4)
+        return {
+            'coords': coords,
+            'codes': codes,
+            'counts': counts,
+            'bounds': bounds,
+            'sizes': np.maximum(bounds[:, 2] - bounds[:, 0], bounds[:, 3] - bounds[:, 1]),
+        }
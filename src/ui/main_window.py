@@ -2,18 +2,21 @@
 主窗口模块
 """
 
+import os
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QGroupBox,
     QCheckBox, QFileDialog, QMessageBox, QStatusBar, QLabel, QHBoxLayout, QPushButton
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QThreadPool
 from .widgets import FileSelector, LogViewer, ProcessingProgress
 from .map_viewer import MapViewer
+from .workers import ProcessingWorker, LayerLoadTask
 from .styles import get_stylesheet
 from ..core.loader import ShapefileLoader
 from ..core.processor import SpatialJoinProcessor
 from ..core.validator import GeometryValidator
-from ..core.exporter import ResultExporter
+from ..core.exporter import ResultExporter, EXPORT_FORMATS
+from ..core.instrumentation import Instrumentation
 from ..utils.constants import APP_CONFIG, SIZES
 
 
@@ -23,10 +26,17 @@ class MainWindow(QMainWindow):
         self.source_gdf = None
         self.target_gdf = None
         self.results = None
-        self.loader = ShapefileLoader()
-        self.validator = GeometryValidator()
-        self.processor = SpatialJoinProcessor(self.validator)
-        self.exporter = ResultExporter()
+        self.worker = None
+        # 加载、修复、处理和导出共用一个计量实例，处理和保存完成后输出到日志
+        self.instrumentation = Instrumentation()
+        self.loader = ShapefileLoader(instrumentation=self.instrumentation)
+        self.validator = GeometryValidator(self.instrumentation)
+        self.processor = SpatialJoinProcessor(self.validator, instrumentation=self.instrumentation)
+        self.exporter = ResultExporter(self.instrumentation)
+        # 图层在线程池中加载，源图层和目标图层可同时加载
+        self.load_pool = QThreadPool(self)
+        self.load_pool.setMaxThreadCount(2)
+        self._load_tasks = {}
         self._setup_ui()
         self._connect_signals()
 
@@ -93,6 +103,11 @@ class MainWindow(QMainWindow):
         self.start_btn.setMinimumWidth(120)
         self.start_btn.clicked.connect(self._on_start_processing)
         layout.addWidget(self.start_btn)
+        self.cancel_btn = QPushButton("⏹️ 取消")
+        self.cancel_btn.setMinimumWidth(120)
+        self.cancel_btn.setEnabled(False)
+        self.cancel_btn.clicked.connect(self._on_cancel_processing)
+        layout.addWidget(self.cancel_btn)
         self.save_btn = QPushButton("💾 保存结果")
         self.save_btn.setMinimumWidth(120)
         self.save_btn.setEnabled(False)
@@ -118,35 +133,75 @@ class MainWindow(QMainWindow):
         self.target_selector.file_selected.connect(self._on_target_selected)
 
     def _on_source_selected(self, file_path):
-        self.log_viewer.add_log(f"正在加载源图层: {file_path}", "INFO")
-        gdf, errors = self.loader.load_layer(file_path)
-        if errors:
-            self.log_viewer.add_log(f"加载失败: {errors[0]}", "ERROR")
-            self.source_selector.set_status("❌ 加载失败", is_error=True)
-            return
-        self.source_gdf = gdf
-        info = self.loader.get_layer_info(gdf)
-        self.log_viewer.add_log(f"✅ 源图层已加载: {info['feature_count']} 个要素", "SUCCESS")
-        self.source_selector.set_status(f"✅ {info['feature_count']} 个要素")
-        self._update_map_preview()
+        self._start_loading('source', file_path)
 
     def _on_target_selected(self, file_path):
-        self.log_viewer.add_log(f"正在加载目标图层: {file_path}", "INFO")
-        gdf, errors = self.loader.load_layer(file_path)
-        if errors:
-            self.log_viewer.add_log(f"加载失败: {errors[0]}", "ERROR")
-            self.target_selector.set_status("❌ 加载失败", is_error=True)
+        self._start_loading('target', file_path)
+
+    def _layer_label(self, name):
+        return '源图层' if name == 'source' else '目标图层'
+
+    def _layer_selector(self, name):
+        return self.source_selector if name == 'source' else self.target_selector
+
+    def _start_loading(self, name, file_path):
+        # 同一图层重新选择文件时，之前的加载结果不再使用
+        previous = self._load_tasks.pop(name, None)
+        if previous is not None:
+            previous.cancel()
+        setattr(self, f'{name}_gdf', None)
+
+        self.log_viewer.add_log(f"正在加载{self._layer_label(name)}: {file_path}", "INFO")
+        self._layer_selector(name).set_status("⏳ 加载中...")
+        task = LayerLoadTask(self.loader, name, file_path)
+        task.signals.info_ready.connect(self._on_layer_info_ready)
+        task.signals.progress.connect(self._on_layer_load_progress)
+        task.signals.succeeded.connect(self._on_layer_loaded)
+        task.signals.failed.connect(self._on_layer_load_failed)
+        self._load_tasks[name] = task
+        self.load_pool.start(task)
+
+    def _is_current_task(self, name):
+        # 已被新任务取代的加载任务仍可能有排队中的信号，按发送者过滤
+        task = self._load_tasks.get(name)
+        return task is not None and self.sender() is task.signals
+
+    def _on_layer_info_ready(self, name, info):
+        if not self._is_current_task(name):
             return
-        self.target_gdf = gdf
+        self.log_viewer.add_log(
+            f"{self._layer_label(name)}信息: {info['feature_count']} 个要素，{info['geometry_type']}，"
+            f"{info['field_count']} 个字段，坐标系 {info['crs']}", "INFO")
+        self._layer_selector(name).set_progress(0, info['feature_count'])
+
+    def _on_layer_load_progress(self, name, done, total):
+        if self._is_current_task(name):
+            self._layer_selector(name).set_progress(done, total)
+
+    def _on_layer_loaded(self, name, gdf):
+        if not self._is_current_task(name):
+            return
+        del self._load_tasks[name]
+        setattr(self, f'{name}_gdf', gdf)
         info = self.loader.get_layer_info(gdf)
-        self.log_viewer.add_log(f"✅ 目标图层已加载: {info['feature_count']} 个要素", "SUCCESS")
-        self.target_selector.set_status(f"✅ {info['feature_count']} 个要素")
+        self.log_viewer.add_log(f"✅ {self._layer_label(name)}已加载: {info['feature_count']} 个要素", "SUCCESS")
+        self._layer_selector(name).set_status(f"✅ {info['feature_count']} 个要素")
         self._update_map_preview()
 
+    def _on_layer_load_failed(self, name, message):
+        if not self._is_current_task(name):
+            return
+        del self._load_tasks[name]
+        self.log_viewer.add_log(f"加载失败: {message}", "ERROR")
+        self._layer_selector(name).set_status("❌ 加载失败", is_error=True)
+
     def _update_map_preview(self):
         self.map_viewer.plot_layers(source_gdf=self.source_gdf, target_gdf=self.target_gdf)
 
     def _on_start_processing(self):
+        if self._load_tasks:
+            QMessageBox.warning(self, "警告", "图层正在加载，请稍候！")
+            return
         if self.source_gdf is None:
             QMessageBox.warning(self, "警告", "请先选择源图层！")
             return
@@ -155,35 +210,99 @@ class MainWindow(QMainWindow):
             return
         self.start_btn.setEnabled(False)
         self.start_btn.setText("⏳ 处理中...")
+        self.cancel_btn.setEnabled(True)
+        self.save_btn.setEnabled(False)
+        self.progress_widget.reset()
+        self.progress_widget.set_state('normal')
         self.log_viewer.add_log("开始处理...", "INFO")
-        try:
-            self.results = self.processor.process(self.source_gdf, self.target_gdf)
-            stats = self.processor.get_statistics(self.results)
-            self.log_viewer.add_log(f"✅ 处理完成! 成功: {stats['contained'] + stats['partial_overlap']}", "SUCCESS")
-            self.save_btn.setEnabled(True)
-        except Exception as e:
-            self.log_viewer.add_log(f"❌ 处理失败: {str(e)}", "ERROR")
-            QMessageBox.critical(self, "错误", f"处理失败: {str(e)}")
-        finally:
-            self.start_btn.setEnabled(True)
-            self.start_btn.setText("▶️ 开始处理")
+        self.worker = ProcessingWorker(self.processor, self.source_gdf, self.target_gdf, self)
+        self.worker.progress.connect(self._on_processing_progress)
+        self.worker.succeeded.connect(self._on_processing_succeeded)
+        self.worker.failed.connect(self._on_processing_failed)
+        self.worker.cancelled.connect(self._on_processing_cancelled)
+        self.worker.finished.connect(self._on_processing_finished)
+        self.worker.start()
+
+    def _on_cancel_processing(self):
+        if self.worker is not None and self.worker.isRunning():
+            self.cancel_btn.setEnabled(False)
+            self.log_viewer.add_log("正在取消处理...", "WARNING")
+            self.worker.cancel()
+
+    def _on_processing_progress(self, done, total, rate, eta):
+        self.progress_widget.set_progress(
+            done, total, f"已处理 {done}/{total} 个要素，{rate:.0f} 要素/秒，预计剩余 {eta:.0f} 秒"
+        )
+
+    def _on_processing_succeeded(self, results):
+        self.results = results
+        report = self.processor.repair_report
+        self.log_viewer.add_log(
+            f"几何修复: 源图层 {report['source_repaired']} 个，目标图层 {report['target_repaired']} 个，"
+            f"耗时 {report['elapsed']:.2f} 秒", "INFO")
+        crs_report = self.processor.crs_report
+        if crs_report and crs_report['reprojected']:
+            layer = '源图层' if crs_report['reprojected'] == 'source' else '目标图层'
+            cached = '（使用缓存）' if crs_report['cached'] else ''
+            self.log_viewer.add_log(
+                f"⚠️ 两个图层坐标系不一致，已将{layer}重投影{cached}，耗时 {crs_report['elapsed']:.2f} 秒", "WARNING")
+        stats = self.processor.get_statistics(self.results)
+        self.log_viewer.add_log(f"✅ 处理完成! 成功: {stats['contained'] + stats['partial_overlap']}", "SUCCESS")
+        self._log_instrumentation()
+        self.progress_widget.set_state('success')
+        self.save_btn.setEnabled(True)
+
+    def _log_instrumentation(self):
+        """将上次输出以来的各阶段耗时、调用计数和峰值内存写入日志"""
+        for line in self.instrumentation.format_report():
+            self.log_viewer.add_log(f"⏱️ {line}", "INFO")
+        self.instrumentation.reset()
+
+    def _on_processing_failed(self, message):
+        self.progress_widget.set_state('error')
+        self.log_viewer.add_log(f"❌ 处理失败: {message}", "ERROR")
+        QMessageBox.critical(self, "错误", f"处理失败: {message}")
+
+    def _on_processing_cancelled(self):
+        self.progress_widget.set_state('warning')
+        self.progress_widget.set_progress(0, 1, "处理已取消")
+        self.log_viewer.add_log("⚠️ 处理已取消", "WARNING")
+
+    def _on_processing_finished(self):
+        self.worker.deleteLater()
+        self.worker = None
+        self.start_btn.setEnabled(True)
+        self.start_btn.setText("▶️ 开始处理")
+        self.cancel_btn.setEnabled(False)
+
+    def closeEvent(self, event):
+        # 退出前停止后台处理线程和图层加载任务
+        if self.worker is not None and self.worker.isRunning():
+            self.worker.cancel()
+            self.worker.wait()
+        for task in self._load_tasks.values():
+            task.cancel()
+        self._load_tasks = {}
+        self.load_pool.waitForDone()
+        super().closeEvent(event)
 
     def _on_save_results(self):
         if self.results is None:
             return
-        file_path, _ = QFileDialog.getSaveFileName(self, "保存处理结果", "", "Shapefile (*.shp);;CSV 报告 (*.csv)")
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "保存处理结果", "",
+            "GeoPackage (*.gpkg);;GeoParquet (*.parquet);;FlatGeobuf (*.fgb);;Shapefile (*.shp);;CSV 报告 (*.csv)"
+        )
         if not file_path:
             return
         try:
-            if file_path.endswith('.shp'):
-                success, errors = self.exporter.export_to_shapefile(self.source_gdf, self.results, file_path)
-            elif file_path.endswith('.csv'):
-                success, errors = self.exporter.export_to_csv(self.results, file_path)
-            else:
+            if os.path.splitext(file_path)[1].lower() not in EXPORT_FORMATS:
                 QMessageBox.warning(self, "警告", "不支持的文件格式")
                 return
+            success, errors = self.exporter.export(self.source_gdf, self.results, file_path)
             if success:
                 self.log_viewer.add_log(f"✅ 结果已保存: {file_path}", "SUCCESS")
+                self._log_instrumentation()
                 QMessageBox.information(self, "成功", f"结果已保存")
             else:
                 self.log_viewer.add_log(f"❌ 保存失败: {errors[0]}", "ERROR")
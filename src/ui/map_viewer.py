@@ -11,13 +11,40 @@ from PyQt5.QtCore import Qt, QSize
 from PyQt5.QtGui import QIcon
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
 from matplotlib.figure import Figure
+from matplotlib.collections import PolyCollection
+from matplotlib.colors import to_rgba
+from matplotlib.image import AxesImage
+from matplotlib.patches import Patch
 import matplotlib.pyplot as plt
+import numpy as np
 import geopandas as gpd
 from ..utils.constants import COLORS
+from .lod import GeometryPyramid
 
 
 class MapCanvas(FigureCanvasQTAgg):
-    """地图画布"""
+    """
+    地图画布（多级细节渲染）
+
+    每个图层使用一个 PolyCollection 绘制，每次重绘前按缩放级别选择简化级别、
+    按可见范围裁剪，并限制矢量绘制的顶点数；超出预算的小要素（只有几个像素大）
+    按像素绘制到同一图层的一幅栅格图像中。
+    """
+
+    # 每个图层绘制为矢量路径的顶点数上限
+    VERTEX_BUDGET = 50_000
+    # 小要素栅格的单元大小（像素）
+    POINT_CELL_PIXELS = 2
+
+    # 图层绘制顺序和样式：(名称, 图例标签, PolyCollection 样式)
+    LAYER_STYLES = (
+        ('target', '目标图层', {
+            'facecolor': (1.0, 0.6, 0.0, 0.3), 'edgecolor': COLORS['warning'], 'linewidth': 1}),
+        ('source', '源图层', {
+            'facecolor': 'none', 'edgecolor': COLORS['primary'], 'linewidth': 1.5}),
+        ('joined', '已关联', {
+            'facecolor': (0.3, 0.85, 0.4, 0.5), 'edgecolor': COLORS['success'], 'linewidth': 2}),
+    )
 
     def __init__(self, parent=None, width=5, height=4, dpi=100):
         self.fig = Figure(figsize=(width, height), dpi=dpi)
@@ -39,6 +66,12 @@ class MapCanvas(FigureCanvasQTAgg):
         self.target_gdf = None
         self.joined_gdf = None
 
+        # 图层名称 -> (GeoDataFrame, 简化几何金字塔)；同一图层重复绘制时复用
+        self._pyramids = {}
+        # 图层名称 -> (PolyCollection, 小要素栅格图像, 栅格颜色)
+        self._collections = {}
+        self._extent = None
+
     def plot_layers(self, source_gdf=None, target_gdf=None, joined_gdf=None):
         """
         绘制图层
@@ -49,56 +82,65 @@ class MapCanvas(FigureCanvasQTAgg):
             joined_gdf: 已关联的要素
         """
         self.axes.clear()
+        self._collections = {}
 
         self.source_gdf = source_gdf
         self.target_gdf = target_gdf
         self.joined_gdf = joined_gdf
-
-        # 绘制目标图层（橙色半透明）
-        if target_gdf is not None and len(target_gdf) > 0:
-            target_gdf.plot(
-                ax=self.axes,
-                facecolor=(1.0, 0.6, 0.0, 0.3),
-                edgecolor=COLORS['warning'],
-                linewidth=1,
-                label='目标图层'
-            )
-
-        # 绘制源图层（蓝色）
-        if source_gdf is not None and len(source_gdf) > 0:
-            source_gdf.plot(
-                ax=self.axes,
-                facecolor='none',
-                edgecolor=COLORS['primary'],
-                linewidth=1.5,
-                label='源图层'
-            )
-
-        # 绘制已关联要素（绿色高亮）
-        if joined_gdf is not None and len(joined_gdf) > 0:
-            joined_gdf.plot(
-                ax=self.axes,
-                facecolor=(0.3, 0.85, 0.4, 0.5),
-                edgecolor=COLORS['success'],
-                linewidth=2,
-                label='已关联'
-            )
+        layers = {'source': source_gdf, 'target': target_gdf, 'joined': joined_gdf}
+
+        handles = []
+        extents = []
+        for zorder, (name, label, style) in enumerate(self.LAYER_STYLES, start=1):
+            gdf = layers[name]
+            if gdf is None or len(gdf) == 0:
+                self._pyramids.pop(name, None)
+                continue
+
+            cached = self._pyramids.get(name)
+            if cached is None or cached[0] is not gdf:
+                self._pyramids[name] = (gdf, GeometryPyramid(gdf.geometry.values))
+            pyramid = self._pyramids[name][1]
+            extents.append(pyramid.bounds)
+
+            collection = PolyCollection([], closed=True, zorder=zorder, **style)
+            self.axes.add_collection(collection)
+            image = AxesImage(self.axes, origin='lower', interpolation='nearest', zorder=zorder)
+            image.set_visible(False)
+            self.axes.add_image(image)
+            color = style['edgecolor'] if style['facecolor'] == 'none' else style['facecolor']
+            self._collections[name] = (collection, image, to_rgba(color, alpha=0.6))
+            handles.append(Patch(label=label, **style))
 
         # 设置图例
-        self.axes.legend(
-            loc='upper right',
-            frameon=True,
-            facecolor='white',
-            edgecolor=COLORS['border'],
-            fontsize=10
-        )
+        if handles:
+            self.axes.legend(
+                handles=handles,
+                loc='upper right',
+                frameon=True,
+                facecolor='white',
+                edgecolor=COLORS['border'],
+                fontsize=10
+            )
 
         # 设置坐标轴
         self.axes.set_xlabel('经度', fontsize=11)
         self.axes.set_ylabel('纬度', fontsize=11)
         self.axes.grid(True, linestyle='--', alpha=0.3)
+        self.axes.set_aspect('equal', adjustable='datalim')
 
-        self.draw()
+        if extents:
+            extents = np.array(extents)
+            self._extent = (extents[:, 0].min(), extents[:, 1].min(), extents[:, 2].max(), extents[:, 3].max())
+        else:
+            self._extent = None
+
+        self.fit_view()
+
+    def draw(self):
+        """重绘（每次绘制前按当前视图范围和缩放级别更新要绘制的环，缩放、平移后自动生效）"""
+        self._update_collections()
+        super().draw()
 
     def zoom_in(self):
         """放大"""
@@ -112,7 +154,7 @@ class MapCanvas(FigureCanvasQTAgg):
 
         self.axes.set_xlim(new_xlim)
         self.axes.set_ylim(new_ylim)
-        self.draw()
+        self.draw_idle()
 
     def zoom_out(self):
         """缩小"""
@@ -126,12 +168,66 @@ class MapCanvas(FigureCanvasQTAgg):
 
         self.axes.set_xlim(new_xlim)
         self.axes.set_ylim(new_ylim)
-        self.draw()
+        self.draw_idle()
 
     def fit_view(self):
         """适应视图"""
-        self.axes.autoscale()
-        self.draw()
+        if self._extent is None:
+            self.axes.autoscale()
+        else:
+            min_x, min_y, max_x, max_y = self._extent
+            margin_x = (max_x - min_x) * 0.05 or 1.0
+            margin_y = (max_y - min_y) * 0.05 or 1.0
+            self.axes.set_xlim(min_x - margin_x, max_x + margin_x)
+            self.axes.set_ylim(min_y - margin_y, max_y + margin_y)
+        self.draw_idle()
+
+    def _update_collections(self):
+        """按当前视图范围和缩放级别更新各图层要绘制的内容"""
+        if not self._collections:
+            return
+
+        # datalim 模式下实际显示范围可能大于设置的范围，按应用纵横比后的范围裁剪
+        self.axes.apply_aspect()
+        min_x, max_x = sorted(self.axes.get_xlim())
+        min_y, max_y = sorted(self.axes.get_ylim())
+        extent = (min_x, min_y, max_x, max_y)
+        pixel_size = (max_x - min_x) / max(self.axes.bbox.width, 1.0)
+
+        for name, (collection, image, color) in self._collections.items():
+            pyramid = self._pyramids[name][1]
+            verts, codes, points = pyramid.visible_paths(extent, pixel_size, vertex_budget=self.VERTEX_BUDGET)
+            collection.set_verts_and_codes(verts, codes)
+
+            if len(points):
+                image.set_data(self._rasterize_points(points, extent, color))
+                image.set_extent((min_x, max_x, min_y, max_y))
+                image.set_visible(True)
+            else:
+                image.set_visible(False)
+
+    def _rasterize_points(self, points: np.ndarray, extent, color) -> np.ndarray:
+        """
+        将小要素中心点栅格化为 RGBA 图像（有要素的单元着色，其余透明）
+
+        Args:
+            points: 中心点坐标 (n, 2)
+            extent: 视图范围 (minx, miny, maxx, maxy)
+            color: RGBA 颜色
+
+        Returns:
+            RGBA 图像数组 (行, 列, 4)
+        """
+        min_x, min_y, max_x, max_y = extent
+        columns = max(int(self.axes.bbox.width / self.POINT_CELL_PIXELS), 1)
+        rows = max(int(self.axes.bbox.height / self.POINT_CELL_PIXELS), 1)
+        col = ((points[:, 0] - min_x) / ((max_x - min_x) or 1) * columns).astype(np.int64).clip(0, columns - 1)
+        row = ((points[:, 1] - min_y) / ((max_y - min_y) or 1) * rows).astype(np.int64).clip(0, rows - 1)
+
+        occupied = np.bincount(row * columns + col, minlength=rows * columns).reshape(rows, columns) > 0
+        rgba = np.zeros((rows, columns, 4), dtype=np.float32)
+        rgba[occupied] = color
+        return rgba
 
 
 class MapViewer(QWidget):
@@ -40,8 +40,16 @@ class FileSelector(QWidget):
         self.status_label = QLabel("")
         self.status_label.setFixedHeight(SIZES['input_height'])
 
+        # 加载进度（加载期间显示）
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setFixedWidth(160)
+        self.progress_bar.setFixedHeight(SIZES['progress_height'])
+        self.progress_bar.setFormat("%v/%m 要素")
+        self.progress_bar.hide()
+
         layout.addWidget(self.path_edit, 1)
         layout.addWidget(self.browse_btn)
+        layout.addWidget(self.progress_bar)
         layout.addWidget(self.status_label)
 
     def _on_browse_clicked(self):
@@ -53,7 +61,14 @@ class FileSelector(QWidget):
             self.path_edit.setText(file_path)
             self.file_selected.emit(file_path)
 
+    def set_progress(self, value: int, total: int):
+        """显示加载进度（直到下一次 set_status）"""
+        self.progress_bar.setMaximum(max(total, 1))
+        self.progress_bar.setValue(value)
+        self.progress_bar.show()
+
     def set_status(self, message: str, is_error: bool = False):
+        self.progress_bar.hide()
         self.status_label.setText(message)
         color = COLORS['error'] if is_error else COLORS['success']
         self.status_label.setStyleSheet(f"color: {color}")
@@ -64,6 +79,7 @@ class FileSelector(QWidget):
     def clear(self):
         self.file_path = ""
         self.path_edit.clear()
+        self.progress_bar.hide()
         self.status_label.clear()
 
 
@@ -0,0 +1,105 @@
+"""
+后台任务模块
+在工作线程中执行耗时处理，通过信号向界面汇报进度
+"""
+
+import time
+from PyQt5.QtCore import QThread, QObject, QRunnable, pyqtSignal
+from ..core.loader import ShapefileLoader
+from ..core.processor import SpatialJoinProcessor, ProcessingCancelled
+
+
+class ProcessingWorker(QThread):
+    """空间关联处理线程"""
+
+    # 已完成要素数, 总要素数, 处理速度（要素/秒）, 预计剩余时间（秒）
+    progress = pyqtSignal(int, int, float, float)
+    succeeded = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, processor: SpatialJoinProcessor, source_gdf, target_gdf, parent=None):
+        super().__init__(parent)
+        self.processor = processor
+        self.source_gdf = source_gdf
+        self.target_gdf = target_gdf
+        self._start_time = 0.0
+
+    def run(self):
+        self._start_time = time.perf_counter()
+        try:
+            results = self.processor.process(
+                self.source_gdf,
+                self.target_gdf,
+                progress_callback=self._on_progress
+            )
+        except ProcessingCancelled:
+            self.cancelled.emit()
+        except Exception as e:
+            self.failed.emit(str(e))
+        else:
+            self.succeeded.emit(results)
+
+    def cancel(self):
+        """请求取消（处理器在当前块完成后停止）"""
+        self.processor.cancel()
+
+    def _on_progress(self, done: int, total: int):
+        elapsed = time.perf_counter() - self._start_time
+        rate = done / elapsed if elapsed > 0 else 0.0
+        eta = (total - done) / rate if rate > 0 else 0.0
+        self.progress.emit(done, total, rate, eta)
+
+
+class LayerLoadSignals(QObject):
+    """图层加载任务的信号（QRunnable 不能直接定义信号）"""
+
+    # 图层名称, 元数据（读取文件头后立即发出）
+    info_ready = pyqtSignal(str, object)
+    # 图层名称, 已读取要素数, 总要素数
+    progress = pyqtSignal(str, int, int)
+    # 图层名称, GeoDataFrame
+    succeeded = pyqtSignal(str, object)
+    # 图层名称, 错误信息
+    failed = pyqtSignal(str, str)
+
+
+class LayerLoadTask(QRunnable):
+    """
+    图层加载任务（在线程池中执行，源图层和目标图层可同时加载）
+
+    取消后任务仍会运行到当前批读取完成，但不再发出任何信号。
+    """
+
+    def __init__(self, loader: ShapefileLoader, name: str, file_path: str):
+        super().__init__()
+        self.loader = loader
+        self.name = name
+        self.file_path = file_path
+        self.signals = LayerLoadSignals()
+        self._cancelled = False
+
+    def run(self):
+        try:
+            info = self.loader.read_info(self.file_path)
+        except Exception:
+            # 元数据读取失败时不影响加载，错误由 load_layer 报告
+            info = None
+        if info is not None and not self._cancelled:
+            self.signals.info_ready.emit(self.name, info)
+
+        gdf, errors = self.loader.load_layer(self.file_path, progress_callback=self._on_progress)
+        if self._cancelled:
+            return
+        if errors:
+            self.signals.failed.emit(self.name, errors[0])
+        else:
+            self.signals.succeeded.emit(self.name, gdf)
+
+    def cancel(self):
+        """请求取消（不再发出信号）"""
+        self._cancelled = True
+
+    def _on_progress(self, done: int, total: int):
+        if not self._cancelled:
+            self.signals.progress.emit(self.name, done, total)
@@ -4,15 +4,25 @@
 """
 
 import os
-from typing import List, Tuple
+from typing import List, Tuple, Optional, Sequence
+from .shapefile_header import read_shapefile_header, POLYGON_SHAPE_TYPES
 
 
-def validate_shapefile_path(file_path: str) -> Tuple[bool, List[str]]:
+def validate_shapefile_path(
+    file_path: str,
+    required_fields: Optional[Sequence[str]] = None,
+    require_polygon: bool = False
+) -> Tuple[bool, List[str]]:
     """
     验证 Shapefile 文件路径
 
+    指定 required_fields 或 require_polygon 时还会解析文件头检查字段和几何类型
+    （不读取要素，耗时与图层大小无关）。
+
     Args:
         file_path: Shapefile 文件路径
+        required_fields: 必须存在的属性字段
+        require_polygon: 是否要求图层为面图层
 
     Returns:
         (is_valid, error_messages): 验证结果和错误信息列表
@@ -37,6 +47,22 @@ def validate_shapefile_path(file_path: str) -> Tuple[bool, List[str]]:
         if not os.path.exists(base_path + ext):
             errors.append(f"缺少关联文件: {os.path.basename(base_path + ext)}")
 
+    if errors or (not required_fields and not require_polygon):
+        return len(errors) == 0, errors
+
+    # 检查文件头中的字段和几何类型
+    try:
+        header = read_shapefile_header(file_path)
+    except (OSError, ValueError) as e:
+        errors.append(f"读取文件头失败: {str(e)}")
+        return False, errors
+
+    for field in required_fields or []:
+        if field not in header['fields']:
+            errors.append(f"缺少字段: {field}（可用字段: {', '.join(header['fields'])}）")
+    if require_polygon and header['shape_type'] not in POLYGON_SHAPE_TYPES:
+        errors.append(f"图层不是面图层: {header['geometry_type']}")
+
     return len(errors) == 0, errors
 
 
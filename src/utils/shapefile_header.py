@@ -0,0 +1,211 @@
+"""
+Shapefile 文件头模块
+只解析 .shp / .shx / .dbf 文件头和 .prj 文件获取图层元数据，不读取任何要素
+"""
+
+import codecs
+import os
+import struct
+from typing import Dict, Any, Optional
+
+
+# .shp / .shx 文件头长度（字节）及 .shx 中每条索引记录的长度
+SHP_HEADER_SIZE = 100
+SHX_RECORD_SIZE = 8
+SHP_FILE_CODE = 9994
+
+# 形状类型编码 -> 几何类型名称（与 GDAL 的命名一致）
+SHAPE_TYPES = {
+    0: 'None',
+    1: 'Point',
+    3: 'LineString',
+    5: 'Polygon',
+    8: 'MultiPoint',
+    11: 'Point Z',
+    13: 'LineString Z',
+    15: 'Polygon Z',
+    18: 'MultiPoint Z',
+    21: 'Point M',
+    23: 'LineString M',
+    25: 'Polygon M',
+    28: 'MultiPoint M',
+    31: 'MultiPatch',
+}
+
+# 面类型的形状编码
+POLYGON_SHAPE_TYPES = (5, 15, 25)
+
+# dBASE 语言驱动编码（LDID）-> 字符编码（没有 .cpg 文件时使用）
+DBF_LANGUAGE_DRIVERS = {
+    0x01: 'cp437',
+    0x03: 'cp1252',
+    0x4D: 'cp936',
+    0x57: 'cp1252',
+    0x7A: 'cp936',
+}
+
+# dBASE 字段类型 -> 读取后的数据类型
+DBF_FIELD_TYPES = {
+    'C': 'object',
+    'N': 'int64',
+    'F': 'float64',
+    'L': 'bool',
+    'D': 'datetime64[ms]',
+}
+
+
+def read_shp_header(shp_path: str) -> Dict[str, Any]:
+    """
+    读取 .shp（或 .shx）文件头
+
+    Args:
+        shp_path: .shp 或 .shx 文件路径
+
+    Returns:
+        {'file_length': 文件长度（字节）, 'shape_type': 形状类型编码,
+         'bounds': [minx, miny, maxx, maxy]}
+
+    Raises:
+        ValueError: 文件头不完整或文件标识不正确
+    """
+    with open(shp_path, 'rb') as f:
+        header = f.read(SHP_HEADER_SIZE)
+    if len(header) < SHP_HEADER_SIZE:
+        raise ValueError(f"文件头不完整: {os.path.basename(shp_path)}")
+
+    # 前 28 字节为大端序，其余为小端序；文件长度以 16 位字为单位
+    file_code, = struct.unpack('>i', header[0:4])
+    file_length, = struct.unpack('>i', header[24:28])
+    if file_code != SHP_FILE_CODE:
+        raise ValueError(f"不是有效的 Shapefile 文件: {os.path.basename(shp_path)}")
+    shape_type, = struct.unpack('<i', header[32:36])
+    bounds = list(struct.unpack('<4d', header[36:68]))
+
+    return {'file_length': file_length * 2, 'shape_type': shape_type, 'bounds': bounds}
+
+
+def read_cpg(cpg_path: str) -> Optional[str]:
+    """
+    读取 .cpg 文件中的字符编码
+
+    Args:
+        cpg_path: .cpg 文件路径
+
+    Returns:
+        Python 编码名称；文件不存在或编码无法识别时返回 None
+    """
+    if not os.path.exists(cpg_path):
+        return None
+    with open(cpg_path, 'r', encoding='ascii', errors='ignore') as f:
+        name = f.read().strip()
+    # 纯数字为代码页编号（如 936）
+    if name.isdigit():
+        name = f'cp{name}'
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
+
+
+def read_dbf_header(dbf_path: str, encoding: Optional[str] = None) -> Dict[str, Any]:
+    """
+    读取 .dbf 文件头和字段定义
+
+    Args:
+        dbf_path: .dbf 文件路径
+        encoding: 字段名编码（默认按 .dbf 文件头中的语言驱动编码判断）
+
+    Returns:
+        {'record_count': 记录数, 'fields': 字段名列表,
+         'dtypes': 字段数据类型列表（与 fields 一一对应）}
+
+    Raises:
+        ValueError: 文件头不完整
+    """
+    with open(dbf_path, 'rb') as f:
+        header = f.read(32)
+        if len(header) < 32:
+            raise ValueError(f"文件头不完整: {os.path.basename(dbf_path)}")
+        record_count, header_length = struct.unpack('<IH', header[4:10])
+        if encoding is None:
+            encoding = DBF_LANGUAGE_DRIVERS.get(header[29], 'latin-1')
+        descriptors = f.read(max(header_length - 32, 0))
+
+    fields = []
+    dtypes = []
+    # 每个字段描述 32 字节，以 0x0D 结束
+    for offset in range(0, len(descriptors) - 31, 32):
+        descriptor = descriptors[offset:offset + 32]
+        if descriptor[0] == 0x0D:
+            break
+        name = descriptor[:11].split(b'\x00', 1)[0].decode(encoding, errors='replace').strip()
+        field_type = chr(descriptor[11])
+        decimals = descriptor[17]
+        dtype = DBF_FIELD_TYPES.get(field_type, 'object')
+        if field_type == 'N' and decimals > 0:
+            dtype = 'float64'
+        fields.append(name)
+        dtypes.append(dtype)
+
+    return {'record_count': record_count, 'fields': fields, 'dtypes': dtypes}
+
+
+def read_prj(prj_path: str) -> Optional[str]:
+    """
+    读取 .prj 文件中的坐标系
+
+    Args:
+        prj_path: .prj 文件路径
+
+    Returns:
+        坐标系字符串（可识别时为 'EPSG:xxxx'，否则为 WKT）；文件不存在或为空时返回 None
+    """
+    if not os.path.exists(prj_path):
+        return None
+    with open(prj_path, 'r', encoding='utf-8', errors='replace') as f:
+        wkt = f.read().strip()
+    if not wkt:
+        return None
+
+    try:
+        from pyproj import CRS
+        return CRS.from_user_input(wkt).to_string()
+    except Exception:
+        return wkt
+
+
+def read_shapefile_header(file_path: str) -> Dict[str, Any]:
+    """
+    只解析文件头读取 Shapefile 图层元数据（耗时与图层大小无关）
+
+    要素数优先取自 .shx 文件长度，缺少 .shx 时使用 .dbf 的记录数。
+
+    Args:
+        file_path: .shp 文件路径
+
+    Returns:
+        {'feature_count', 'shape_type', 'geometry_type', 'crs', 'fields', 'dtypes', 'bounds'}
+
+    Raises:
+        ValueError: 文件头不完整或文件标识不正确
+        OSError: .shp 或 .dbf 文件无法读取
+    """
+    base_path = os.path.splitext(file_path)[0]
+    shp = read_shp_header(file_path)
+    dbf = read_dbf_header(base_path + '.dbf', encoding=read_cpg(base_path + '.cpg'))
+
+    shx_path = base_path + '.shx'
+    if os.path.exists(shx_path):
+        feature_count = (read_shp_header(shx_path)['file_length'] - SHP_HEADER_SIZE) // SHX_RECORD_SIZE
+    else:
+        feature_count = dbf['record_count']
+
+    return {
+        'feature_count': feature_count,
+        'shape_type': shp['shape_type'],
+        'geometry_type': SHAPE_TYPES.get(shp['shape_type'], '未知'),
+        'crs': read_prj(base_path + '.prj'),
+        'fields': dbf['fields'],
+        'dtypes': dbf['dtypes'],
+        'bounds': shp['bounds'],
+    }
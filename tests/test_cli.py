@@ -0,0 +1,152 @@
+"""
+测试命令行入口
+"""
+
+import pytest
+import subprocess
+import sys
+import geopandas as gpd
+import pandas as pd
+import shapely
+import tempfile
+import os
+from shapely.geometry import box
+from src.cli import main, EXIT_OK, EXIT_FAILURE
+
+
+def write_layers(tmpdir):
+    """写出测试用的源、目标图层"""
+    source_gdf = gpd.GeoDataFrame(
+        {'id': [1, 2]}, geometry=[box(0.2, 0.2, 0.8, 0.8), box(10, 10, 11, 11)], crs='EPSG:4326'
+    )
+    target_gdf = gpd.GeoDataFrame({'zone_id': ['Z01']}, geometry=[box(0, 0, 1, 1)], crs='EPSG:4326')
+    source_path = os.path.join(tmpdir, 'source.shp')
+    target_path = os.path.join(tmpdir, 'target.shp')
+    source_gdf.to_file(source_path)
+    target_gdf.to_file(target_path)
+    return source_path, target_path
+
+
+def test_cli_join_to_csv():
+    """测试命令行关联并导出 CSV"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        source_path, target_path = write_layers(tmpdir)
+        output_path = os.path.join(tmpdir, 'report.csv')
+
+        code = main(['join', source_path, target_path, '-o', output_path, '--target-id', 'zone_id', '-q'])
+
+        assert code == EXIT_OK
+        report = pd.read_csv(output_path, encoding='utf-8-sig')
+        assert list(report['relation_type']) == ['contained', 'no_intersection']
+        assert report['target_id'][0] == 'Z01'
+
+
+def test_cli_missing_input():
+    """测试输入文件不存在时返回非零退出码"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        code = main(['join', '/nonexistent/a.shp', '/nonexistent/b.shp', '-o', os.path.join(tmpdir, 'out.csv')])
+
+        assert code == EXIT_FAILURE
+
+
+def test_cli_unsupported_output():
+    """测试不支持的输出格式"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        source_path, target_path = write_layers(tmpdir)
+
+        code = main(['join', source_path, target_path, '-o', os.path.join(tmpdir, 'out.xyz'), '-q'])
+
+        assert code == EXIT_FAILURE
+
+
+def test_cli_does_not_import_gui():
+    """测试命令行不加载 PyQt5 和 Matplotlib"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        source_path, target_path = write_layers(tmpdir)
+        output_path = os.path.join(tmpdir, 'report.csv')
+        script = (
+            "import sys; from src.cli import main; "
+            f"code = main(['join', {source_path!r}, {target_path!r}, '-o', {output_path!r}, '-q']); "
+            "assert 'PyQt5' not in sys.modules and 'matplotlib' not in sys.modules; sys.exit(code)"
+        )
+        completed = subprocess.run(
+            [sys.executable, '-c', script],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        )
+
+        assert completed.returncode == EXIT_OK
+
+
+def test_cli_streaming_join():
+    """测试命令行流式处理"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        source_path, target_path = write_layers(tmpdir)
+        output_path = os.path.join(tmpdir, 'out.shp')
+
+        code = main(['join', source_path, target_path, '-o', output_path, '--batch-size', '1', '-q'])
+
+        assert code == EXIT_OK
+        output = gpd.read_file(output_path)
+        assert list(output['relation_t']) == ['contained', 'no_intersection']
+
+
+def test_cli_missing_id_field():
+    """测试ID字段不存在时在加载前报错"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        source_path, target_path = write_layers(tmpdir)
+
+        code = main(['join', source_path, target_path, '-o', os.path.join(tmpdir, 'out.csv'),
+                     '--target-id', 'missing', '-q'])
+
+        assert code == EXIT_FAILURE
+
+
+def test_cli_overlaps_to_csv():
+    """测试命令行输出相交边表"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        source_path, target_path = write_layers(tmpdir)
+        output_path = os.path.join(tmpdir, 'edges.csv')
+
+        code = main(['join', source_path, target_path, '-o', output_path, '--overlaps',
+                     '--source-id', 'id', '--target-id', 'zone_id', '-q'])
+
+        assert code == EXIT_OK
+        edges = pd.read_csv(output_path, encoding='utf-8-sig')
+        assert list(edges['source_id']) == [1]
+        assert list(edges['target_id']) == ['Z01']
+        assert edges['target_ratio'][0] == pytest.approx(0.36)
+
+        code = main(['join', source_path, target_path, '-o', os.path.join(tmpdir, 'edges.shp'), '--overlaps', '-q'])
+        assert code == EXIT_FAILURE
+
+
+def test_cli_overlaps_with_geometry():
+    """测试命令行输出带相交几何的边表"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        source_path, target_path = write_layers(tmpdir)
+        output_path = os.path.join(tmpdir, 'edges.gpkg')
+
+        code = main(['join', source_path, target_path, '-o', output_path, '--overlaps', '--overlap-geometry',
+                     '--source-id', 'id', '--target-id', 'zone_id', '-q'])
+
+        assert code == EXIT_OK
+        edges = gpd.read_file(output_path)
+        assert list(edges['target_id']) == ['Z01']
+        # 测试图层为地理坐标系，默认按坐标单位计算面积
+        assert shapely.area(edges.geometry.values).tolist() == pytest.approx(edges['intersection_area'].tolist())
+
+
+def test_cli_timing_and_profile(capsys):
+    """测试命令行输出各阶段计量报告并导出 cProfile 统计数据"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        source_path, target_path = write_layers(tmpdir)
+        profile_path = os.path.join(tmpdir, 'run.prof')
+
+        code = main(['join', source_path, target_path, '-o', os.path.join(tmpdir, 'report.csv'),
+                     '--timing', '--profile', profile_path, '-q'])
+
+        assert code == EXIT_OK
+        assert os.path.getsize(profile_path) > 0
+        stderr = capsys.readouterr().err
+        for label in ('读取图层', '几何修复', '匹配', '写出结果', '精确谓词调用'):
+            assert label in stderr
@@ -77,3 +77,230 @@ def test_export_to_csv():
         assert success
         assert len(errors) == 0
         assert os.path.exists(output_path)
+
+
+def test_export_join_result_to_csv():
+    """测试直接导出列式关联结果为 CSV"""
+    import numpy as np
+    import pandas as pd
+    from src.core.result import JoinResult, RELATION_CONTAINED
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        poly = Polygon([(0, 0), (1, 0), (1, 1), (0, 1), (0, 0)])
+        source_gdf = gpd.GeoDataFrame({'id': [1], 'name': ['A']}, geometry=[poly], crs='EPSG:4326')
+        target_gdf = gpd.GeoDataFrame({'zone_id': ['Z01']}, geometry=[poly], crs='EPSG:4326')
+        results = JoinResult(
+            source_gdf, target_gdf,
+            target_index=np.array([0]),
+            relations=np.array([RELATION_CONTAINED]),
+            intersection_area=np.array([1.0]),
+            overlap_ratio=np.array([1.0]),
+            target_id_field='zone_id'
+        )
+
+        output_path = os.path.join(tmpdir, 'report.csv')
+        success, errors = ResultExporter().export_to_csv(results, output_path)
+
+        assert success
+        report = pd.read_csv(output_path, encoding='utf-8-sig')
+        assert report['target_id'][0] == 'Z01'
+        assert report['target_zone_id'][0] == 'Z01'
+        assert report['source_name'][0] == 'A'
+
+
+def test_export_csv_colliding_columns():
+    """测试源图层含 id 字段时，列式结果与字典列表导出的 CSV 列一致且不重复"""
+    import numpy as np
+    import pandas as pd
+    from src.core.result import JoinResult, RELATION_CONTAINED
+
+    poly = Polygon([(0, 0), (1, 0), (1, 1), (0, 1), (0, 0)])
+    source_gdf = gpd.GeoDataFrame({'id': [5]}, geometry=[poly], crs='EPSG:4326')
+    target_gdf = gpd.GeoDataFrame({'zone_id': ['Z01']}, geometry=[poly], crs='EPSG:4326')
+    results = JoinResult(
+        source_gdf, target_gdf,
+        target_index=np.array([0]),
+        relations=np.array([RELATION_CONTAINED]),
+        intersection_area=np.array([1.0]),
+        overlap_ratio=np.array([1.0])
+    )
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        reports = []
+        for name, data in (('columnar', results), ('legacy', results.to_records())):
+            output_path = os.path.join(tmpdir, f'{name}.csv')
+            success, errors = ResultExporter().export_to_csv(data, output_path)
+            assert success, errors
+            reports.append(pd.read_csv(output_path, encoding='utf-8-sig'))
+
+    assert list(reports[0].columns) == list(reports[1].columns)
+    assert reports[0]['source_id'][0] == 0
+    assert reports[0]['source_attr_id'][0] == 5
+
+
+def test_build_output_gdf_columnar():
+    """测试按列构建输出图层（字典列表与列式结果结果一致）"""
+    import numpy as np
+    from src.core.result import JoinResult, RELATION_CONTAINED, RELATION_NONE
+
+    poly = Polygon([(0, 0), (1, 0), (1, 1), (0, 1), (0, 0)])
+    source_gdf = gpd.GeoDataFrame({'id': [1, 2], 'name': ['A', 'B']}, geometry=[poly, poly], crs='EPSG:4326')
+    target_gdf = gpd.GeoDataFrame({'zone_id': ['Z01'], '流域': ['黄河']}, geometry=[poly], crs='EPSG:4326')
+    results = JoinResult(
+        source_gdf, target_gdf,
+        target_index=np.array([0, -1]),
+        relations=np.array([RELATION_CONTAINED, RELATION_NONE]),
+        intersection_area=np.array([1.0, 0.0]),
+        overlap_ratio=np.array([1.0, 0.0])
+    )
+
+    exporter = ResultExporter()
+    output_gdf = exporter.build_output_gdf(source_gdf, results)
+
+    assert list(output_gdf.columns) == [
+        'id', 'name', 'geometry', 't_zone_id', 't_luyu', 'relation_type', 'intersection_area', 'overlap_ratio'
+    ]
+    assert list(output_gdf['t_luyu']) == ['黄河', None]
+    assert list(output_gdf['relation_type']) == ['contained', 'no_intersection']
+
+    legacy_gdf = exporter.build_output_gdf(source_gdf, results.to_records())
+    assert list(legacy_gdf.columns) == list(output_gdf.columns)
+    assert legacy_gdf['t_zone_id'][0] == output_gdf['t_zone_id'][0]
+    assert list(legacy_gdf['t_zone_id'].isna()) == list(output_gdf['t_zone_id'].isna())
+
+
+def test_export_unmatched_keeps_numeric_fields():
+    """测试有无关联行时，目标的整数、浮点字段在 DBF 中仍为数值字段"""
+    import numpy as np
+    import pyogrio
+    from src.core.result import JoinResult, RELATION_CONTAINED, RELATION_NONE
+
+    poly = Polygon([(0, 0), (1, 0), (1, 1), (0, 1), (0, 0)])
+    source_gdf = gpd.GeoDataFrame({'id': [1, 2]}, geometry=[poly, poly], crs='EPSG:4326')
+    target_gdf = gpd.GeoDataFrame({'zone': [7], 'val': [0.5], 'name': ['A']}, geometry=[poly], crs='EPSG:4326')
+    results = JoinResult(
+        source_gdf, target_gdf,
+        target_index=np.array([0, -1]),
+        relations=np.array([RELATION_CONTAINED, RELATION_NONE]),
+        intersection_area=np.array([1.0, 0.0]),
+        overlap_ratio=np.array([1.0, 0.0])
+    )
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for name, data in (('columnar', results), ('legacy', results.to_records())):
+            output_path = os.path.join(tmpdir, f'{name}.shp')
+            success, errors = ResultExporter().export_to_shapefile(source_gdf, data, output_path)
+            assert success, errors
+
+            info = pyogrio.read_info(output_path)
+            dtypes = dict(zip(info['fields'], info['dtypes']))
+            assert dtypes['t_zone'] in ('int64', 'float64')
+            assert dtypes['t_val'] == 'float64'
+            assert dtypes['t_name'] == 'object'
+
+            output = gpd.read_file(output_path)
+            assert output['t_zone'][0] == 7
+            assert output['t_zone'].isna().tolist() == [False, True]
+
+        # 列式结果保持整数字段
+        columnar = pyogrio.read_info(os.path.join(tmpdir, 'columnar.shp'))
+        assert dict(zip(columnar['fields'], columnar['dtypes']))['t_zone'] == 'int64'
+
+
+@pytest.mark.parametrize('extension', ['.gpkg', '.parquet', '.fgb'])
+def test_export_unicode_formats(extension):
+    """测试 GeoPackage、GeoParquet、FlatGeobuf 导出保留完整的中文字段名"""
+    import numpy as np
+    from src.core.result import JoinResult, RELATION_CONTAINED, RELATION_NONE
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        poly = Polygon([(0, 0), (1, 0), (1, 1), (0, 1), (0, 0)])
+        source_gdf = gpd.GeoDataFrame({'编号': [1, 2]}, geometry=[poly, poly], crs='EPSG:4326')
+        target_gdf = gpd.GeoDataFrame({'所属流域名称': ['黄河']}, geometry=[poly], crs='EPSG:4326')
+        results = JoinResult(
+            source_gdf, target_gdf,
+            target_index=np.array([0, -1]),
+            relations=np.array([RELATION_CONTAINED, RELATION_NONE]),
+            intersection_area=np.array([1.0, 0.0]),
+            overlap_ratio=np.array([1.0, 0.0])
+        )
+
+        output_path = os.path.join(tmpdir, 'sub', f'output{extension}')
+        success, errors = ResultExporter().export(source_gdf, results, output_path)
+
+        assert success, errors
+        if extension == '.parquet':
+            output = gpd.read_parquet(output_path)
+        else:
+            output = gpd.read_file(output_path)
+        assert list(output['编号']) == [1, 2]
+        assert output['target_所属流域名称'][0] == '黄河'
+        assert list(output['relation_type']) == ['contained', 'no_intersection']
+        assert output.crs == source_gdf.crs
+
+
+@pytest.mark.parametrize('extension', ['.parquet', '.csv'])
+def test_export_overlaps_streaming(extension):
+    """测试逐块写出相交边表"""
+    import numpy as np
+    import pandas as pd
+    from src.core.result import OverlapTable
+
+    poly = Polygon([(0, 0), (1, 0), (1, 1), (0, 1), (0, 0)])
+    source_gdf = gpd.GeoDataFrame({'id': ['S1', 'S2']}, geometry=[poly, poly], crs='EPSG:3857')
+    target_gdf = gpd.GeoDataFrame({'zone': ['Z1', 'Z2']}, geometry=[poly, poly], crs='EPSG:3857')
+
+    def chunks():
+        for source_pos in (0, 1):
+            yield OverlapTable(source_gdf, target_gdf, [source_pos] * 2, [0, 1], [0.5, 0.5], [0.5, 0.5], [0.5, 0.5],
+                               source_id_field='id', target_id_field='zone')
+        yield OverlapTable(source_gdf, target_gdf, [], [], [], [], [])
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_path = os.path.join(tmpdir, f'edges{extension}')
+        success, errors = ResultExporter().export_overlaps(chunks(), output_path)
+
+        assert success, errors
+        if extension == '.parquet':
+            edges = pd.read_parquet(output_path)
+        else:
+            edges = pd.read_csv(output_path, encoding='utf-8-sig')
+        assert list(edges['source_id']) == ['S1', 'S1', 'S2', 'S2']
+        assert list(edges['target_id']) == ['Z1', 'Z2', 'Z1', 'Z2']
+        assert np.allclose(edges['source_ratio'], 0.5)
+
+
+@pytest.mark.parametrize('extension', ['.parquet', '.gpkg'])
+def test_export_overlaps_with_geometry(extension):
+    """测试逐块写出带相交几何的边表（几何统一为多面）"""
+    from shapely.geometry import box
+    from src.core.result import OverlapTable
+
+    poly = Polygon([(0, 0), (1, 0), (1, 1), (0, 1), (0, 0)])
+    source_gdf = gpd.GeoDataFrame({'id': ['S1', 'S2']}, geometry=[poly, poly], crs='EPSG:3857')
+    target_gdf = gpd.GeoDataFrame({'zone': ['Z1']}, geometry=[poly], crs='EPSG:3857')
+
+    def chunks():
+        for source_pos in (0, 1):
+            yield OverlapTable(source_gdf, target_gdf, [source_pos], [0], [0.5], [0.5], [0.5],
+                               source_id_field='id', target_id_field='zone',
+                               geometry=[box(0, 0, 0.5, 1)], crs='EPSG:3857')
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_path = os.path.join(tmpdir, f'edges{extension}')
+        success, errors = ResultExporter().export_overlaps(chunks(), output_path)
+
+        assert success, errors
+        if extension == '.parquet':
+            edges = gpd.read_parquet(output_path)
+        else:
+            edges = gpd.read_file(output_path)
+        assert list(edges['source_id']) == ['S1', 'S2']
+        assert edges.crs == source_gdf.crs
+        assert list(edges.geom_type) == ['MultiPolygon', 'MultiPolygon']
+        assert edges.geometry.area.tolist() == pytest.approx([0.5, 0.5])
+
+        # 带几何的边表不能输出为 CSV，不带几何的边表不能输出为 GeoPackage
+        assert not ResultExporter().export_overlaps(chunks(), os.path.join(tmpdir, 'edges.csv'))[0]
+        plain = OverlapTable(source_gdf, target_gdf, [0], [0], [0.5], [0.5], [0.5])
+        assert not ResultExporter().export_overlaps(plain, os.path.join(tmpdir, 'plain.gpkg'))[0]
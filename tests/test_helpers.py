@@ -40,3 +40,19 @@ def test_calculate_overlap_ratio():
     assert calculate_overlap_ratio(0, 100) == 0.0
     assert calculate_overlap_ratio(150, 100) == 1.0  # 不超过1.0
     assert calculate_overlap_ratio(50, 0) == 0.0    # 防止除零
+
+
+def test_validate_shapefile_path_schema(tmp_path):
+    """测试按文件头检查字段和几何类型"""
+    import geopandas as gpd
+    from shapely.geometry import Point
+
+    shp_path = str(tmp_path / 'points.shp')
+    gpd.GeoDataFrame({'id': [1]}, geometry=[Point(0, 0)], crs='EPSG:4326').to_file(shp_path)
+
+    assert validate_shapefile_path(shp_path, required_fields=['id']) == (True, [])
+
+    is_valid, errors = validate_shapefile_path(shp_path, required_fields=['zone_id'], require_polygon=True)
+    assert is_valid is False
+    assert "缺少字段: zone_id" in errors[0]
+    assert "不是面图层" in errors[1]
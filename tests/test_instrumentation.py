@@ -0,0 +1,113 @@
+"""
+测试计量模块
+"""
+
+import os
+import tempfile
+import pstats
+import geopandas as gpd
+import pytest
+from shapely.geometry import Polygon, box
+from src.core.instrumentation import Instrumentation, profile_to
+from src.core.loader import ShapefileLoader
+from src.core.validator import GeometryValidator
+from src.core.processor import SpatialJoinProcessor
+from src.core.exporter import ResultExporter
+
+
+def make_layers():
+    """构造测试图层（源图层含一个自相交的无效面）"""
+    bowtie = Polygon([(0.1, 0.1), (0.4, 0.4), (0.4, 0.1), (0.1, 0.4)])
+    source_gdf = gpd.GeoDataFrame(
+        {'id': [1, 2, 3]},
+        geometry=[box(0.2, 0.2, 0.8, 0.8), box(0.5, 0, 1.5, 1), bowtie],
+        crs='EPSG:3857'
+    )
+    target_gdf = gpd.GeoDataFrame({'zone': ['A', 'B']}, geometry=[box(0, 0, 1, 1), box(1, 0, 2, 1)],
+                                  crs='EPSG:3857')
+    return source_gdf, target_gdf
+
+
+def test_instrumentation_covers_all_stages():
+    """测试加载、修复、处理和导出共用一个计量实例时记录各阶段及计数"""
+    source_gdf, target_gdf = make_layers()
+    instrumentation = Instrumentation()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        source_path = os.path.join(tmpdir, 'source.shp')
+        source_gdf.to_file(source_path)
+        loaded, errors = ShapefileLoader(instrumentation=instrumentation).load_layer(source_path)
+        assert errors == []
+
+        processor = SpatialJoinProcessor(GeometryValidator(instrumentation), instrumentation=instrumentation)
+        results = processor.process(loaded, target_gdf)
+        success, errors = ResultExporter(instrumentation).export(loaded, results, os.path.join(tmpdir, 'out.csv'))
+        assert success, errors
+
+    report = instrumentation.report()
+    assert list(report['stages']) == [
+        'read', 'repair', 'align', 'index', 'match', 'predicate', 'intersection', 'export'
+    ]
+    assert all(stage['calls'] >= 1 and stage['wall'] >= 0 for stage in report['stages'].values())
+    counters = report['counters']
+    assert counters['features_read'] == 3
+    assert counters['validity_checks'] == 5
+    assert counters['repairs'] == 1
+    assert counters['features_written'] == 3
+    # 外包框候选对：源1-A、源2-A、源2-B、源3-A；源1、源3 被 A 包含，只有源2 的两对计算相交
+    # 源2 的外包框不在 A、B 内，预筛选后只对源1-A、源3-A 做包含判断
+    assert counters['candidates'] == 4
+    assert counters['predicate_calls'] == 4
+    assert counters['intersections'] == 2
+
+    lines = instrumentation.format_report()
+    assert lines[0].startswith('读取图层')
+    assert any(line.startswith('计数') for line in lines)
+
+    instrumentation.reset()
+    assert instrumentation.report()['stages'] == {}
+
+
+def test_instrumentation_loop_engine_counts():
+    """测试逐要素引擎与向量化引擎的候选对和相交计算次数一致"""
+    source_gdf, target_gdf = make_layers()
+    counters = {}
+    for engine in ('loop', 'vectorized'):
+        processor = SpatialJoinProcessor(GeometryValidator(), engine=engine)
+        processor.process(source_gdf, target_gdf)
+        # 未指定时处理器与验证器共用计量实例
+        assert processor.instrumentation is processor.validator.instrumentation
+        assert 'repair' in processor.instrumentation.report()['stages']
+        counters[engine] = processor.instrumentation.report()['counters']
+
+    assert counters['loop']['candidates'] == counters['vectorized']['candidates']
+    assert counters['loop']['intersections'] == counters['vectorized']['intersections']
+    # 逐要素引擎找到包含的目标后即停止判断
+    assert counters['loop']['predicate_calls'] <= counters['vectorized']['predicate_calls']
+
+
+def test_instrumentation_merge_and_profile():
+    """测试合并其他实例的报告及导出 cProfile 统计数据"""
+    worker = Instrumentation()
+    worker.add_stage('predicate', 0.5, 0.4)
+    worker.count('predicate_calls', 10)
+
+    instrumentation = Instrumentation()
+    instrumentation.count('predicate_calls', 5)
+    instrumentation.merge(worker.report())
+    instrumentation.merge(worker.report())
+
+    report = instrumentation.report()
+    assert report['counters']['predicate_calls'] == 25
+    assert report['stages']['predicate'] == {'wall': pytest.approx(1.0), 'cpu': pytest.approx(0.8), 'calls': 2}
+    assert report['peak_memory_workers'] == worker.report()['peak_memory']
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'profile', 'run.prof')
+        with profile_to(path) as profiler:
+            assert profiler is not None
+            sorted(range(1000))
+        assert pstats.Stats(path).total_calls > 0
+
+    with profile_to(None) as profiler:
+        assert profiler is None
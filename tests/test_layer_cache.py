@@ -0,0 +1,71 @@
+"""
+测试图层磁盘缓存
+"""
+
+import pytest
+import geopandas as gpd
+import tempfile
+import time
+import os
+from shapely.geometry import box
+from src.core.layer_cache import LayerCache
+
+
+def make_layer(count):
+    """生成测试图层"""
+    return gpd.GeoDataFrame(
+        {'id': list(range(count))},
+        geometry=[box(i, 0, i + 1, 1) for i in range(count)],
+        crs='EPSG:3857'
+    )
+
+
+def test_cache_roundtrip():
+    """测试缓存写入与读取"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = LayerCache(tmpdir)
+        layer = make_layer(5)
+
+        assert cache.get('missing') is None
+        cache.put('abc', layer)
+        cached = cache.get('abc')
+
+        assert cached.crs == layer.crs
+        assert list(cached['id']) == list(layer['id'])
+        assert cached.geometry.equals(layer.geometry)
+
+
+def test_cache_evicts_least_recently_used():
+    """测试超出大小上限时淘汰最久未访问的条目"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = LayerCache(tmpdir)
+        cache.put('a', make_layer(50))
+        cache.put('b', make_layer(50))
+        entry_size = cache.get_stats()['total_bytes'] // 2
+
+        # 访问 a 使 b 成为最久未访问的条目
+        os.utime(os.path.join(tmpdir, 'a.parquet'), (time.time() - 100, time.time() - 100))
+        os.utime(os.path.join(tmpdir, 'b.parquet'), (time.time() - 200, time.time() - 200))
+        cache.get('a')
+
+        cache.max_bytes = int(entry_size * 2.5)
+        cache.put('c', make_layer(50))
+
+        assert cache.get('b') is None
+        assert cache.get('a') is not None
+        assert cache.get('c') is not None
+
+
+def test_cache_key_depends_on_content():
+    """测试缓存键由文件内容决定"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = LayerCache(os.path.join(tmpdir, 'cache'))
+        first = os.path.join(tmpdir, 'first.shp')
+        second = os.path.join(tmpdir, 'second.shp')
+        make_layer(3).to_file(first)
+        make_layer(3).to_file(second)
+
+        assert cache.key(first) == cache.key(second)
+
+        make_layer(4).to_file(second)
+        assert cache.key(first) != cache.key(second)
@@ -66,3 +66,131 @@ def test_get_layer_info():
         assert info['feature_count'] == 2
         assert info['crs'] == 'EPSG:4326'
         assert info['geometry_type'] in ['Polygon', 'MultiPolygon']
+
+
+def test_load_layer_with_columns_and_bbox():
+    """测试字段投影和范围过滤"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        gdf = gpd.GeoDataFrame(
+            {'id': [1, 2], 'name': ['A', 'B'], 'code': [10, 20]},
+            geometry=[Polygon([(0, 0), (1, 0), (1, 1), (0, 1)]), Polygon([(5, 5), (6, 5), (6, 6), (5, 6)])],
+            crs='EPSG:4326'
+        )
+        shp_path = os.path.join(tmpdir, 'test.shp')
+        gdf.to_file(shp_path)
+
+        loader = ShapefileLoader()
+        loaded_gdf, errors = loader.load_layer(shp_path, columns=['id'], bbox=(4, 4, 7, 7))
+
+        assert len(errors) == 0
+        assert list(loaded_gdf.columns) == ['id', 'geometry']
+        assert loaded_gdf['id'].tolist() == [2]
+
+
+def test_load_layer_with_mask():
+    """测试按几何过滤"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        gdf = gpd.GeoDataFrame(
+            {'id': [1, 2]},
+            geometry=[Polygon([(0, 0), (1, 0), (1, 1), (0, 1)]), Polygon([(5, 5), (6, 5), (6, 6), (5, 6)])],
+            crs='EPSG:4326'
+        )
+        shp_path = os.path.join(tmpdir, 'test.shp')
+        gdf.to_file(shp_path)
+
+        loader = ShapefileLoader()
+        loaded_gdf, errors = loader.load_layer(shp_path, mask=Polygon([(0.5, 0.5), (2, 0.5), (2, 2)]))
+
+        assert len(errors) == 0
+        assert loaded_gdf['id'].tolist() == [1]
+
+
+def test_loader_invalid_engine():
+    """测试不支持的读取引擎"""
+    with pytest.raises(ValueError):
+        ShapefileLoader(engine='unknown')
+
+
+def test_load_layer_with_cache():
+    """测试启用磁盘缓存时的加载、命中和失效"""
+    from src.core.layer_cache import LayerCache
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # 自相交的领结多边形，缓存中应保存修复后的几何
+        bowtie = Polygon([(0, 0), (1, 1), (1, 0), (0, 1), (0, 0)])
+        square = Polygon([(2, 2), (3, 2), (3, 3), (2, 3), (2, 2)])
+        gdf = gpd.GeoDataFrame({'id': [1, 2], 'name': ['A', 'B']}, geometry=[bowtie, square], crs='EPSG:3857')
+        shp_path = os.path.join(tmpdir, 'test.shp')
+        gdf.to_file(shp_path)
+
+        cache = LayerCache(os.path.join(tmpdir, 'cache'))
+        loader = ShapefileLoader(cache=cache)
+
+        first, errors = loader.load_layer(shp_path)
+        assert len(errors) == 0
+        assert first.geometry.is_valid.all()
+        assert cache.get_stats()['entries'] == 1
+
+        # 命中缓存：结果与首次加载一致，支持字段投影和范围过滤
+        second, errors = loader.load_layer(shp_path, columns=['name'], bbox=(1.5, 1.5, 4, 4))
+        assert len(errors) == 0
+        assert list(second.columns) == ['name', 'geometry']
+        assert list(second['name']) == ['B']
+        assert cache.get_stats()['entries'] == 1
+
+        # 文件内容变化后生成新的缓存条目
+        gdf.assign(id=[3, 4]).to_file(shp_path)
+        third, _ = loader.load_layer(shp_path)
+        assert list(third['id']) == [3, 4]
+        assert cache.get_stats()['entries'] == 2
+
+
+def test_load_layer_cache_write_failure():
+    """测试缓存目录不可写时仍正常加载图层，只发出警告"""
+    import shutil
+    from src.core.layer_cache import LayerCache
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        gdf = gpd.GeoDataFrame({'id': [1]}, geometry=[Polygon([(0, 0), (1, 0), (1, 1), (0, 1)])], crs='EPSG:3857')
+        shp_path = os.path.join(tmpdir, 'test.shp')
+        gdf.to_file(shp_path)
+
+        # 缓存目录被同名文件替代，写入缓存必然失败
+        cache_dir = os.path.join(tmpdir, 'cache')
+        cache = LayerCache(cache_dir)
+        shutil.rmtree(cache_dir)
+        with open(cache_dir, 'w') as f:
+            f.write('')
+
+        with pytest.warns(RuntimeWarning, match='图层缓存'):
+            loaded, errors = ShapefileLoader(cache=cache).load_layer(shp_path)
+        assert errors == []
+        assert list(loaded['id']) == [1]
+
+
+def test_load_layer_with_progress_and_read_info(monkeypatch):
+    """测试分批加载时汇报进度，以及只读取元数据"""
+    import src.core.loader as loader_module
+    monkeypatch.setattr(loader_module, 'PROGRESS_MIN_BATCH_SIZE', 2)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        polys = [Polygon([(i, 0), (i + 1, 0), (i + 1, 1), (i, 1)]) for i in range(5)]
+        gdf = gpd.GeoDataFrame({'id': range(5)}, geometry=polys, crs='EPSG:4326')
+        shp_path = os.path.join(tmpdir, 'test.shp')
+        gdf.to_file(shp_path)
+
+        loader = ShapefileLoader()
+        info = loader.get_layer_info(shp_path)
+        assert info['feature_count'] == 5
+        assert info['crs'] == 'EPSG:4326'
+        assert info['fields'] == ['id', 'geometry']
+        assert info['geometry_type'] == 'Polygon'
+        assert info['bounds'] == [0.0, 0.0, 5.0, 1.0]
+
+        progress = []
+        loaded, errors = loader.load_layer(shp_path, progress_callback=lambda done, total: progress.append(done))
+
+        assert errors == []
+        assert progress == [2, 4, 5]
+        assert loaded.index.tolist() == list(range(5))
+        assert loaded['id'].tolist() == list(range(5))
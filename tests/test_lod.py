@@ -0,0 +1,97 @@
+"""
+测试地图预览的多级细节简化
+"""
+
+import numpy as np
+from shapely.geometry import box, Point
+from src.ui.lod import GeometryPyramid, MOVETO, CLOSEPOLY
+
+
+def test_select_level_by_pixel_size():
+    """测试按像素大小选择简化级别"""
+    pyramid = GeometryPyramid(np.array([box(0, 0, 256, 256)], dtype=object), levels=4, base_pixels=256)
+
+    assert pyramid.tolerances == [1.0, 0.5, 0.25, 0.125]
+    assert pyramid.select_level(2.0) == 0
+    assert pyramid.select_level(0.3) == 2
+    assert pyramid.select_level(0.01) == pyramid.full_level
+
+
+def test_visible_paths_culls_and_simplifies():
+    """测试按视图范围裁剪，粗级别减少顶点，路径指令正确"""
+    circles = np.array([Point(0, 0).buffer(10, 64), Point(1000, 1000).buffer(10, 64)], dtype=object)
+    pyramid = GeometryPyramid(circles)
+
+    verts, codes, points = pyramid.visible_paths((-20, -20, 20, 20), pixel_size=0.01)
+    assert len(points) == 0
+    assert sum(len(v) for v in verts) == len(circles[0].exterior.coords)
+    assert codes[0][0] == MOVETO and codes[-1][-1] == CLOSEPOLY
+
+    coarse, _, _ = pyramid.visible_paths((-2000, -2000, 2000, 2000), pixel_size=5.0)
+    assert 0 < sum(len(v) for v in coarse) < 2 * len(circles[0].exterior.coords) / 4
+
+
+def test_vertex_budget_keeps_largest_rings():
+    """测试超出顶点预算时保留大环，其余返回中心点"""
+    geoms = np.array([box(0, 0, 100, 100)] + [box(i, 200, i + 1, 201) for i in range(10)], dtype=object)
+    pyramid = GeometryPyramid(geoms)
+
+    verts, codes, points = pyramid.visible_paths((0, 0, 300, 300), pixel_size=0.001, vertex_budget=5)
+
+    assert len(verts) == 1 and np.allclose(verts[0].min(axis=0), [0, 0])
+    assert len(points) == 10
+    assert np.allclose(points[:, 1], 200.5)
+
+
+def test_paths_split_at_ring_boundaries():
+    """测试复合路径按环边界切分"""
+    geoms = np.array([box(i * 2, 0, i * 2 + 1, 1) for i in range(10)], dtype=object)
+    pyramid = GeometryPyramid(geoms)
+
+    verts, codes, _ = pyramid.visible_paths((0, 0, 20, 1), pixel_size=0.001, max_path_vertices=10)
+
+    assert len(verts) == 5
+    assert all(c[0] == MOVETO and c[-1] == CLOSEPOLY for c in codes)
+
+
+def test_deep_zoom_into_large_polygon():
+    """测试深度放大到超过顶点预算的大面时，裁剪到视图范围后仍绘制为路径"""
+    # 50001 个顶点的大面（如大流域），外接一个带内环的面
+    circle = Point(0, 0).buffer(1000, 12500)
+    assert len(circle.exterior.coords) == 50001
+    with_hole = box(2000, -500, 3000, 500).difference(box(2400, -100, 2600, 100))
+    pyramid = GeometryPyramid(np.array([circle, with_hole], dtype=object))
+
+    # 放大 100 倍到大面的边界：只统计视图内的顶点
+    verts, codes, points = pyramid.visible_paths((990, -10, 1010, 10), pixel_size=0.02)
+    assert len(points) == 0
+    assert len(verts) == 1 and 4 < len(verts[0]) < 1000
+    assert codes[0][0] == MOVETO and codes[0][-1] == CLOSEPOLY
+
+    # 视图完全落在大面内部：裁剪后为覆盖视图的矩形
+    verts, _, points = pyramid.visible_paths((-10, -10, 10, 10), pixel_size=0.02)
+    assert len(points) == 0
+    assert len(verts) == 1 and len(verts[0]) == 5
+
+    # 裁剪后的内环保持与原内环相同的方向
+    verts, codes, points = pyramid.visible_paths((2390, -10, 2410, 10), pixel_size=0.02)
+    assert len(points) == 0
+    starts = np.flatnonzero(codes[0] == MOVETO)
+    assert len(starts) == 2
+    from shapely.geometry import LinearRing
+    pieces = np.split(verts[0], starts[1:])
+    assert [LinearRing(p).is_ccw for p in pieces] == [
+        with_hole.exterior.is_ccw, with_hole.interiors[0].is_ccw
+    ]
+
+
+def test_vertex_budget_skips_only_rings_that_do_not_fit():
+    """测试放不下的环只跳过自身，后面较小的环仍在预算内绘制"""
+    big = Point(0, 0).buffer(50, 64)
+    geoms = np.array([big, box(200, 0, 210, 10), box(300, 0, 301, 1)], dtype=object)
+    pyramid = GeometryPyramid(geoms)
+
+    verts, _, points = pyramid.visible_paths((-100, -100, 400, 400), pixel_size=0.0001, vertex_budget=12)
+
+    assert sum(len(v) for v in verts) == 10
+    assert len(points) == 1 and np.allclose(points[0], [0, 0])
@@ -0,0 +1,43 @@
+"""
+测试并行处理辅助函数
+"""
+
+import pytest
+import numpy as np
+from shapely.geometry import box
+from src.core.parallel import hilbert_order, split_spatial_chunks, SharedGeometryBuffer, load_shared_geometries
+
+
+def test_hilbert_order_is_permutation():
+    """测试 Hilbert 排序返回原下标的一个排列"""
+    geoms = np.array([box(x, y, x + 1, y + 1) for x in range(5) for y in range(5)], dtype=object)
+    order = hilbert_order(geoms)
+
+    assert sorted(order.tolist()) == list(range(len(geoms)))
+
+
+def test_split_spatial_chunks_are_coherent():
+    """测试分块在空间上连续（两个相距很远的簇不会混在一个块中）"""
+    left = [box(x * 0.1, 0, x * 0.1 + 0.1, 0.1) for x in range(10)]
+    right = [box(1000 + x * 0.1, 0, 1000 + x * 0.1 + 0.1, 0.1) for x in range(10)]
+    geoms = np.array(left + right, dtype=object)
+
+    chunks = split_spatial_chunks(geoms, 2)
+
+    assert sorted(chunks[0].tolist() + chunks[1].tolist()) == list(range(20))
+    assert all(idx < 10 for idx in chunks[0]) or all(idx >= 10 for idx in chunks[0])
+
+
+def test_shared_geometry_buffer_roundtrip():
+    """测试几何经共享内存往返后保持不变"""
+    geoms = np.array([box(0, 0, 1, 1), None, box(2, 2, 3, 3)], dtype=object)
+
+    buffer = SharedGeometryBuffer(geoms)
+    try:
+        loaded = load_shared_geometries(buffer.name, buffer.offsets)
+    finally:
+        buffer.close()
+
+    assert loaded[0].equals(geoms[0])
+    assert loaded[1] is None
+    assert loaded[2].equals(geoms[2])
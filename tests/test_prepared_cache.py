@@ -0,0 +1,58 @@
+"""
+测试预处理几何缓存
+"""
+
+import pytest
+import numpy as np
+import shapely
+from shapely.geometry import box
+from src.core.prepared_cache import PreparedGeometryCache
+
+
+def test_cache_prepares_and_clears():
+    """测试缓存预处理几何并在清空时释放"""
+    geoms = np.array([box(0, 0, 1, 1), box(1, 1, 2, 2)], dtype=object)
+
+    cache = PreparedGeometryCache()
+    cache.bind(geoms)
+    cache.get(0)
+    cache.get(0)
+
+    assert shapely.is_prepared(geoms[0])
+    assert not shapely.is_prepared(geoms[1])
+    assert cache.get_stats()['hits'] == 1
+    assert cache.get_stats()['misses'] == 1
+
+    cache.clear()
+    assert not shapely.is_prepared(geoms[0])
+
+
+def test_cache_respects_vertex_budget():
+    """测试顶点预算（超出时淘汰最近最少使用的几何）"""
+    # 每个矩形 5 个顶点，预算只够缓存两个
+    geoms = np.array([box(i, 0, i + 1, 1) for i in range(3)], dtype=object)
+
+    cache = PreparedGeometryCache(max_vertices=10)
+    cache.bind(geoms)
+    cache.get(0)
+    cache.get(1)
+    cache.get(2)
+
+    assert cache.get_stats()['cached_vertices'] <= 10
+    assert not shapely.is_prepared(geoms[0])
+    assert shapely.is_prepared(geoms[1])
+    assert shapely.is_prepared(geoms[2])
+
+
+def test_cache_get_many():
+    """测试批量获取"""
+    geoms = np.array([box(i, 0, i + 1, 1) for i in range(3)], dtype=object)
+
+    cache = PreparedGeometryCache(max_vertices=10)
+    cache.bind(geoms)
+    result = cache.get_many(np.array([2, 0, 2, 1]))
+
+    assert list(result) == [geoms[2], geoms[0], geoms[2], geoms[1]]
+    # 预算内的几何被预处理，结果数组不受预算影响
+    assert cache.get_stats()['cached'] == 2
+    assert cache.get_stats()['cached_vertices'] == 10
@@ -4,6 +4,8 @@
 
 import pytest
 import geopandas as gpd
+import pandas as pd
+import shapely
 from shapely.geometry import Polygon, box
 from src.core.processor import SpatialJoinProcessor
 from src.core.validator import GeometryValidator
@@ -123,3 +125,383 @@ def test_processor_auto_fix():
 
     # 应该成功处理（自动修复后）
     assert len(result) == 1
+
+
+def test_processor_multiple_features_indexed():
+    """测试多要素关联（空间索引候选筛选后结果与规则一致）"""
+    source_gdf = gpd.GeoDataFrame(
+        {'id': [1, 2, 3]},
+        geometry=[
+            box(0.2, 0.2, 0.8, 0.8),   # 完全落入 Z01
+            box(0.8, 0.2, 1.6, 0.8),   # 跨越 Z01/Z02，与 Z02 相交面积更大
+            box(10, 10, 11, 11),       # 无相交
+        ],
+        crs='EPSG:4326'
+    )
+    target_gdf = gpd.GeoDataFrame(
+        {'zone_id': ['Z01', 'Z02', 'Z03']},
+        geometry=[box(0, 0, 1, 1), box(1, 0, 2, 1), box(5, 5, 6, 6)],
+        crs='EPSG:4326'
+    )
+
+    processor = SpatialJoinProcessor(GeometryValidator())
+    result = processor.process(source_gdf, target_gdf, source_id_field='id', target_id_field='zone_id')
+
+    assert [r['target_id'] for r in result] == ['Z01', 'Z02', None]
+    assert [r['relation_type'] for r in result] == ['contained', 'partial_overlap', 'no_intersection']
+    assert result[1]['intersection_area'] == pytest.approx(0.36)
+    assert result[1]['overlap_ratio'] == pytest.approx(0.75)
+
+
+def test_processor_engines_consistent():
+    """测试向量化引擎与逐要素循环引擎结果一致"""
+    sources = [box(x * 0.7, y * 0.7, x * 0.7 + 0.5, y * 0.7 + 0.5) for x in range(8) for y in range(8)]
+    targets = [box(x, y, x + 1, y + 1) for x in range(4) for y in range(4)]
+    # 与 (0,0)-(1,1) 完全重合的重复目标，用于检查多个包含目标时的取舍
+    targets.append(box(0, 0, 1, 1))
+    source_gdf = gpd.GeoDataFrame({'id': range(len(sources))}, geometry=sources, crs='EPSG:3857')
+    target_gdf = gpd.GeoDataFrame({'zone_id': range(len(targets))}, geometry=targets, crs='EPSG:3857')
+
+    loop = SpatialJoinProcessor(GeometryValidator(), engine='loop').process(source_gdf, target_gdf)
+    vectorized = SpatialJoinProcessor(GeometryValidator(), engine='vectorized').process(source_gdf, target_gdf)
+
+    assert [r['target_id'] for r in vectorized] == [r['target_id'] for r in loop]
+    assert [r['relation_type'] for r in vectorized] == [r['relation_type'] for r in loop]
+    assert [r['intersection_area'] for r in vectorized] == pytest.approx([r['intersection_area'] for r in loop])
+
+
+def test_processor_containment_prefilter():
+    """测试包含判断前的外包框、顶点预筛选：结果不变，被包含的源要素只做一次精确判断"""
+    # U 形源要素的质心落在缺口处（不在要素内），仍应判为被包含
+    u_shape = Polygon([(0.1, 0.1), (0.9, 0.1), (0.9, 0.9), (0.7, 0.9), (0.7, 0.3),
+                       (0.3, 0.3), (0.3, 0.9), (0.1, 0.9)])
+    sources = [u_shape, box(1.2, 0.6, 1.4, 0.8), box(0.8, 0.2, 1.2, 0.4)]
+    # 目标 L 为 L 形，N 为其缺角：源2 落在 N 内，外包框同时在 L 的外包框内
+    targets = [box(0, 0, 1, 1),
+               Polygon([(1, 0), (2, 0), (2, 1), (1.5, 1), (1.5, 0.5), (1, 0.5)]),
+               box(1, 0.5, 1.5, 1)]
+    source_gdf = gpd.GeoDataFrame({'id': [1, 2, 3]}, geometry=sources, crs='EPSG:3857')
+    target_gdf = gpd.GeoDataFrame({'zone_id': ['A', 'L', 'N']}, geometry=targets, crs='EPSG:3857')
+
+    for engine in ('loop', 'vectorized'):
+        processor = SpatialJoinProcessor(GeometryValidator(), engine=engine)
+        result = processor.process(source_gdf, target_gdf, target_id_field='zone_id')
+
+        assert [r['target_id'] for r in result] == ['A', 'N', 'A']
+        assert [r['relation_type'] for r in result] == ['contained', 'contained', 'partial_overlap']
+
+    # 只有源2 有两个外包框候选（L、N），检查顶点后 L 被排除
+    counters = processor.instrumentation.report()['counters']
+    assert counters['point_tests'] == 2
+    # 源1-A、源2-N 各一次包含判断，源3 与 A、L 两次相交判断
+    assert counters['predicate_calls'] == 4
+
+
+def test_processor_invalid_engine():
+    """测试不支持的处理引擎"""
+    with pytest.raises(ValueError):
+        SpatialJoinProcessor(GeometryValidator(), engine='unknown')
+
+
+def test_processor_repair_report():
+    """测试几何修复预处理报告"""
+    invalid_poly = Polygon([(0, 0), (2, 2), (0, 2), (2, 0), (0, 0)])
+    source_gdf = gpd.GeoDataFrame({'id': [1, 2]}, geometry=[invalid_poly, box(0, 0, 1, 1)], crs='EPSG:4326')
+    target_gdf = gpd.GeoDataFrame({'zone_id': ['Z01']}, geometry=[invalid_poly], crs='EPSG:4326')
+
+    processor = SpatialJoinProcessor(GeometryValidator())
+    result = processor.process(source_gdf, target_gdf)
+
+    assert processor.repair_report['source_repaired'] == 1
+    assert processor.repair_report['target_repaired'] == 1
+    assert processor.repair_report['elapsed'] >= 0
+    # 修复后两个蝴蝶形几何完全重合
+    assert result[0]['relation_type'] == 'contained'
+
+
+def test_processor_releases_prepared_targets():
+    """测试处理结束后释放目标几何的预处理结构"""
+    source_gdf = gpd.GeoDataFrame({'id': [1]}, geometry=[box(0.2, 0.2, 0.8, 0.8)], crs='EPSG:4326')
+    target_gdf = gpd.GeoDataFrame({'zone_id': ['Z01']}, geometry=[box(0, 0, 1, 1)], crs='EPSG:4326')
+
+    for engine in ('loop', 'vectorized'):
+        processor = SpatialJoinProcessor(GeometryValidator(), engine=engine)
+        result = processor.process(source_gdf, target_gdf)
+
+        assert result[0]['relation_type'] == 'contained'
+        assert processor.prepared_cache.get_stats()['misses'] == 1
+        assert not any(shapely.is_prepared(target_gdf.geometry.values))
+
+
+def test_processor_parallel_matches_serial():
+    """测试多进程并行处理结果与串行一致"""
+    sources = [box(x * 0.7, y * 0.7, x * 0.7 + 0.5, y * 0.7 + 0.5) for x in range(8) for y in range(8)]
+    targets = [box(x, y, x + 1, y + 1) for x in range(4) for y in range(4)]
+    source_gdf = gpd.GeoDataFrame({'id': range(len(sources))}, geometry=sources, crs='EPSG:3857')
+    target_gdf = gpd.GeoDataFrame({'zone_id': range(len(targets))}, geometry=targets, crs='EPSG:3857')
+
+    processor = SpatialJoinProcessor(GeometryValidator())
+    serial = processor.process(source_gdf, target_gdf)
+    parallel = processor.process(source_gdf, target_gdf, workers=2)
+
+    assert parallel.to_records() == serial.to_records()
+
+
+def test_processor_statistics_columnar():
+    """测试统计信息直接基于列式结果计算"""
+    source_gdf = gpd.GeoDataFrame(
+        {'id': [1, 2]}, geometry=[box(0.2, 0.2, 0.8, 0.8), box(10, 10, 11, 11)], crs='EPSG:4326'
+    )
+    target_gdf = gpd.GeoDataFrame({'zone_id': ['Z01']}, geometry=[box(0, 0, 1, 1)], crs='EPSG:4326')
+
+    processor = SpatialJoinProcessor(GeometryValidator())
+    result = processor.process(source_gdf, target_gdf)
+    stats = processor.get_statistics(result)
+
+    assert stats == processor.get_statistics(result.to_records())
+    assert stats['contained'] == 1
+    assert stats['no_intersection'] == 1
+    assert stats['success_rate'] == 0.5
+
+
+def test_processor_progress_and_cancel():
+    """测试分块进度回调与取消"""
+    from src.core.processor import ProcessingCancelled
+
+    sources = [box(x, 0, x + 0.5, 0.5) for x in range(10)]
+    source_gdf = gpd.GeoDataFrame({'id': range(10)}, geometry=sources, crs='EPSG:3857')
+    target_gdf = gpd.GeoDataFrame({'zone_id': ['Z01']}, geometry=[box(0, 0, 20, 1)], crs='EPSG:3857')
+
+    processor = SpatialJoinProcessor(GeometryValidator(), chunk_size=4)
+    progress = []
+    processor.process(source_gdf, target_gdf, progress_callback=lambda done, total: progress.append((done, total)))
+    assert progress == [(4, 10), (8, 10), (10, 10)]
+
+    # 在第一块完成后请求取消
+    with pytest.raises(ProcessingCancelled):
+        processor.process(source_gdf, target_gdf, progress_callback=lambda done, total: processor.cancel())
+
+    # 取消状态不影响下一次处理
+    assert len(processor.process(source_gdf, target_gdf)) == 10
+
+
+def test_process_incremental_matches_full_run():
+    """测试增量处理与对新图层完整处理的结果一致，且只重新计算受影响的要素"""
+    validator = GeometryValidator()
+    processor = SpatialJoinProcessor(validator)
+
+    source_gdf = gpd.GeoDataFrame(
+        {'id': list(range(40))},
+        geometry=[box(i, 0.2, i + 0.6, 0.8) for i in range(40)],
+        crs='EPSG:3857'
+    )
+    target_gdf = gpd.GeoDataFrame(
+        {'code': [f'T{i}' for i in range(8)]},
+        geometry=[box(i * 5, 0, i * 5 + 5, 1) for i in range(8)],
+        crs='EPSG:3857'
+    )
+    previous = processor.process(source_gdf, target_gdf, source_id_field='id', target_id_field='code')
+
+    # 修改两个源要素、新增一个源要素、删除一个目标要素、修改一个目标要素
+    new_source = source_gdf.copy()
+    new_source.loc[3, 'geometry'] = box(3, 0.2, 3.5, 0.4)
+    new_source.loc[30, 'geometry'] = box(29.5, 0.2, 30.5, 0.8)
+    new_source = pd.concat([new_source, gpd.GeoDataFrame(
+        {'id': [99]}, geometry=[box(12, 0.2, 12.5, 0.8)], crs='EPSG:3857'
+    )], ignore_index=True)
+    new_target = target_gdf.drop(index=6).reset_index(drop=True)
+    new_target.loc[0, 'geometry'] = box(0, 0, 2.8, 1)
+
+    incremental = processor.process_incremental(previous, new_source, new_target)
+    full = processor.process(new_source, new_target, source_id_field='id', target_id_field='code')
+
+    assert incremental.to_records() == full.to_records()
+    report = processor.incremental_report
+    assert report['source_changed'] == 3
+    assert report['target_changed'] == 2
+    assert report['recomputed'] < len(new_source)
+
+
+def test_process_incremental_mismatched_crs():
+    """测试两个图层坐标系不同时，目标要素移动后受影响的源要素会重新计算"""
+    processor = SpatialJoinProcessor(GeometryValidator())
+    source_gdf = gpd.GeoDataFrame(
+        {'id': [1, 2]},
+        geometry=[box(20000, 20000, 40000, 40000), box(150000, 20000, 170000, 40000)],
+        crs='EPSG:3857'
+    )
+    target_gdf = gpd.GeoDataFrame(
+        {'code': ['A', 'B']}, geometry=[box(0, 0, 1, 1), box(1, 0, 2, 1)], crs='EPSG:4326'
+    )
+    previous = processor.process(source_gdf, target_gdf, source_id_field='id', target_id_field='code')
+    assert [r['target_id'] for r in previous] == ['A', 'B']
+
+    # 目标 B 移走后，源2 不再与任何目标相交
+    new_target = target_gdf.copy()
+    new_target.loc[1, 'geometry'] = box(10, 10, 11, 11)
+
+    incremental = processor.process_incremental(previous, source_gdf, new_target)
+    full = processor.process(source_gdf, new_target, source_id_field='id', target_id_field='code')
+
+    assert [r['target_id'] for r in full] == ['A', None]
+    assert incremental.to_records() == full.to_records()
+
+
+def test_process_equal_area_mode():
+    """测试地理坐标系图层按等积投影计算面积"""
+    source_gdf = gpd.GeoDataFrame(
+        {'id': [1, 2]}, geometry=[box(0.2, 0.2, 0.4, 0.4), box(0.5, 0, 1.5, 1)], crs='EPSG:4326'
+    )
+    target_gdf = gpd.GeoDataFrame({'code': ['A']}, geometry=[box(0, 0, 1, 1)], crs='EPSG:4326')
+
+    for engine in ('vectorized', 'loop'):
+        processor = SpatialJoinProcessor(GeometryValidator(), engine=engine)
+        results = processor.process(source_gdf, target_gdf, area_mode='equal_area')
+
+        assert results.area_mode == 'equal_area'
+        assert list(results.relation_type) == ['contained', 'partial_overlap']
+        # 面积单位为平方米，重叠比例与投影无关（约为一半）
+        assert results.intersection_area[0] == pytest.approx(0.04 * 1.2309e10, rel=1e-2)
+        assert results.overlap_ratio[1] == pytest.approx(0.5, rel=1e-3)
+
+
+@pytest.mark.parametrize('source_geom, relation', [
+    (box(0.2, 0.2, 0.3, 0.3), 'contained'),
+    (box(5, 5, 6, 6), 'no_intersection'),
+])
+def test_process_geodesic_without_partial_overlaps(source_geom, relation):
+    """测试测地线面积方式下没有部分重叠（相交面积数组为空）时各处理入口正常"""
+    source_gdf = gpd.GeoDataFrame({'id': [1]}, geometry=[source_geom], crs='EPSG:4326')
+    target_gdf = gpd.GeoDataFrame({'code': ['A']}, geometry=[box(0, 0, 1, 1)], crs='EPSG:4326')
+    processor = SpatialJoinProcessor(GeometryValidator())
+
+    results = processor.process(source_gdf, target_gdf, area_mode='geodesic')
+    assert list(results.relation_type) == [relation]
+
+    batches = list(processor.process_batches([source_gdf], target_gdf, area_mode='geodesic'))
+    assert list(batches[0].relation_type) == [relation]
+
+    overlaps = processor.process_overlaps(source_gdf, target_gdf, area_mode='geodesic')
+    assert len(overlaps) == (1 if relation == 'contained' else 0)
+
+    # 目标几何变化，源要素需要重新计算
+    new_target = gpd.GeoDataFrame({'code': ['A']}, geometry=[box(0, 0, 1, 1.5)], crs='EPSG:4326')
+    incremental = processor.process_incremental(results, source_gdf, new_target)
+    assert processor.incremental_report['recomputed'] == (1 if relation == 'contained' else 0)
+    assert list(incremental.relation_type) == [relation]
+
+
+def test_process_aligns_mismatched_crs():
+    """测试坐标系不一致时自动重投影较小的图层，并缓存重投影结果"""
+    source_gdf = gpd.GeoDataFrame(
+        {'id': [1, 2]}, geometry=[box(0.2, 0.2, 0.4, 0.4), box(5, 5, 6, 6)], crs='EPSG:4326'
+    )
+    target_4326 = gpd.GeoDataFrame(
+        {'code': ['A', 'B', 'C']},
+        geometry=[box(0, 0, 1, 1), box(1, 0, 2, 1), box(2, 0, 3, 1)],
+        crs='EPSG:4326'
+    )
+    target_gdf = target_4326.to_crs('EPSG:3857')
+
+    processor = SpatialJoinProcessor(GeometryValidator())
+    expected = processor.process(source_gdf, target_4326)
+    results = processor.process(source_gdf, target_gdf)
+
+    assert list(results.relation_type) == list(expected.relation_type)
+    assert list(results.target_index) == list(expected.target_index)
+    assert processor.crs_report['reprojected'] == 'source'
+    assert processor.crs_report['cached'] is False
+
+    # 同一图层再次处理时使用缓存
+    processor.process(source_gdf, target_gdf)
+    assert processor.crs_report['cached'] is True
+
+
+def test_process_resumes_from_checkpoint(tmp_path):
+    """测试取消后从检查点继续，结果与完整处理一致；输入变化时重新开始"""
+    from src.core.processor import ProcessingCancelled
+
+    sources = [box(x * 0.7, y * 0.7, x * 0.7 + 0.5, y * 0.7 + 0.5) for x in range(6) for y in range(6)]
+    targets = [box(x, y, x + 1, y + 1) for x in range(4) for y in range(4)]
+    source_gdf = gpd.GeoDataFrame({'id': range(len(sources))}, geometry=sources, crs='EPSG:3857')
+    target_gdf = gpd.GeoDataFrame({'zone_id': range(len(targets))}, geometry=targets, crs='EPSG:3857')
+    checkpoint_dir = str(tmp_path / 'checkpoint')
+
+    processor = SpatialJoinProcessor(GeometryValidator(), chunk_size=10)
+    expected = processor.process(source_gdf, target_gdf).to_records()
+
+    # 第二块完成后取消，已完成的两块写入检查点
+    def cancel_after_two_chunks(done, total):
+        if done >= 20:
+            processor.cancel()
+
+    with pytest.raises(ProcessingCancelled):
+        processor.process(source_gdf, target_gdf, progress_callback=cancel_after_two_chunks,
+                          checkpoint_dir=checkpoint_dir, checkpoint_interval=0)
+    assert processor.checkpoint_report['saved'] == 20
+
+    progress = []
+    resumed = processor.process(source_gdf, target_gdf, checkpoint_dir=checkpoint_dir,
+                                progress_callback=lambda done, total: progress.append(done))
+    assert processor.checkpoint_report['resumed'] == 20
+    assert processor.checkpoint_report['saved'] == 16
+    assert progress == [30, 36]
+    assert resumed.to_records() == expected
+
+    # 目标图层几何变化后检查点失效
+    processor.process(source_gdf, target_gdf.iloc[:8], checkpoint_dir=checkpoint_dir)
+    assert processor.checkpoint_report['resumed'] == 0
+
+
+def test_process_overlaps_emits_all_pairs():
+    """测试多对多关联输出所有相交对及两侧比例，逐块结果与整体一致"""
+    source_gdf = gpd.GeoDataFrame(
+        {'id': [1, 2, 3]},
+        geometry=[box(0.2, 0.2, 0.8, 0.8), box(0.5, 0, 1.5, 1), box(10, 10, 11, 11)],
+        crs='EPSG:3857'
+    )
+    target_gdf = gpd.GeoDataFrame({'zone': ['A', 'B', 'C']},
+                                  geometry=[box(0, 0, 1, 1), box(1, 0, 2, 1), box(2, 0, 3, 1)], crs='EPSG:3857')
+
+    processor = SpatialJoinProcessor(GeometryValidator(), chunk_size=2)
+    table = processor.process_overlaps(source_gdf, target_gdf, source_id_field='id', target_id_field='zone')
+    df = table.to_dataframe()
+
+    assert list(zip(df['source_id'], df['target_id'])) == [(1, 'A'), (2, 'A'), (2, 'B')]
+    assert df['intersection_area'].tolist() == pytest.approx([0.36, 0.5, 0.5])
+    assert df['source_ratio'].tolist() == pytest.approx([1.0, 0.5, 0.5])
+    assert df['target_ratio'].tolist() == pytest.approx([0.36, 0.5, 0.5])
+
+    chunks = list(processor.iter_overlaps(source_gdf, target_gdf))
+    assert [len(chunk) for chunk in chunks] == [3, 0]
+
+
+def test_process_overlaps_keeps_geometry():
+    """测试边表保留相交几何：面积与几何一致，被包含的对直接使用源几何"""
+    import numpy as np
+    from shapely.geometry import GeometryCollection, LineString
+
+    source_gdf = gpd.GeoDataFrame(
+        {'id': [1, 2]}, geometry=[box(0.2, 0.2, 0.8, 0.8), box(0.5, 0, 1.5, 1)], crs='EPSG:3857'
+    )
+    target_gdf = gpd.GeoDataFrame({'zone': ['A', 'B']}, geometry=[box(0, 0, 1, 1), box(1, 0, 2, 1)], crs='EPSG:3857')
+
+    processor = SpatialJoinProcessor(GeometryValidator())
+    table = processor.process_overlaps(source_gdf, target_gdf, keep_geometry=True)
+    gdf = table.to_geodataframe()
+
+    assert gdf.crs == source_gdf.crs
+    assert gdf.geometry.area.tolist() == pytest.approx(gdf['intersection_area'].tolist())
+    assert gdf.geometry.iloc[0].equals(source_gdf.geometry.iloc[0])
+    assert gdf.geometry.iloc[2].equals(box(1, 0, 1.5, 1))
+
+    # 不保留几何时无法转换为 GeoDataFrame
+    with pytest.raises(ValueError):
+        processor.process_overlaps(source_gdf, target_gdf).to_geodataframe()
+
+    # 相交结果中边界接触产生的线被丢弃
+    pieces = SpatialJoinProcessor._polygonal(np.array([
+        GeometryCollection([box(0, 0, 1, 1), LineString([(2, 0), (2, 1)])]), box(0, 0, 2, 2)
+    ], dtype=object))
+    assert shapely.get_type_id(pieces).tolist() == [6, 3]
+    assert pieces[0].area == pytest.approx(1.0)
@@ -0,0 +1,73 @@
+"""
+测试坐标投影与面积计算
+"""
+
+import pytest
+import numpy as np
+from shapely.geometry import box
+from src.core.projection import AreaCalculator, get_transformer, transform_geometries
+
+
+def test_area_modes_on_geographic_crs():
+    """测试地理坐标系下等积投影面积与测地线面积一致"""
+    geoms = np.array([box(0, 0, 1, 1), box(100, 60, 101, 61)], dtype=object)
+
+    planar = AreaCalculator('planar', 'EPSG:4326')(geoms)
+    equal_area = AreaCalculator('equal_area', 'EPSG:4326')(geoms)
+    geodesic = AreaCalculator('geodesic', 'EPSG:4326')(geoms)
+
+    assert np.allclose(planar, [1.0, 1.0])
+    # 赤道附近 1°×1° 约 12309 平方千米，高纬度明显更小
+    assert geodesic[0] == pytest.approx(1.2309e10, rel=1e-3)
+    assert geodesic[1] < geodesic[0] / 1.9
+    assert np.allclose(equal_area, geodesic, rtol=1e-3)
+
+
+def test_geodesic_area_subtracts_holes():
+    """测试测地线面积扣除内环"""
+    outer = box(0, 0, 1, 1)
+    with_hole = outer.difference(box(0.25, 0.25, 0.75, 0.75))
+
+    areas = AreaCalculator('geodesic', 'EPSG:4326')(np.array([outer, with_hole], dtype=object))
+
+    assert areas[1] == pytest.approx(areas[0] * 0.75, rel=1e-3)
+
+
+def test_geodesic_area_matches_exact():
+    """测试数组运算的测地线面积与 pyproj 逐环精确计算一致（含长边、环绕极点、跨日界线和投影坐标系）"""
+    import shapely
+    from pyproj import Geod
+    from shapely.geometry import Polygon
+    from src.core.projection import geodesic_areas
+
+    geod = Geod(ellps='WGS84')
+    geoms = np.array([
+        box(116.3, 39.9, 116.31, 39.91),
+        box(10, 45, 30, 50),
+        shapely.segmentize(box(-20, -60, 20, -10), 0.5),
+        box(0, 0, 2, 2).difference(box(0.5, 0.5, 1, 1)),
+        Polygon([(179.5, 10), (-179.5, 10), (-179.5, 11), (179.5, 11)]),
+        Polygon([(lon, 80) for lon in range(0, 360, 1)]),
+    ], dtype=object)
+    expected = [abs(geod.geometry_area_perimeter(geom)[0]) for geom in geoms]
+
+    assert np.allclose(geodesic_areas(geoms, 'EPSG:4326'), expected, rtol=1e-6)
+
+    projected = transform_geometries(geoms[:4], 'EPSG:4326', 'EPSG:3857')
+    assert np.allclose(geodesic_areas(projected, 'EPSG:3857'), expected[:4], rtol=1e-6)
+
+
+def test_transformer_is_cached():
+    """测试同一对坐标系的转换器只创建一次"""
+    assert get_transformer('EPSG:4326', 'EPSG:3857') is get_transformer('EPSG:4326', 'EPSG:3857')
+
+    projected = transform_geometries(np.array([box(0, 0, 1, 1)], dtype=object), 'EPSG:4326', 'EPSG:3857')
+    assert projected[0].bounds[2] == pytest.approx(111319.49, rel=1e-6)
+
+
+def test_area_mode_requires_crs():
+    """测试非平面面积计算需要坐标系"""
+    with pytest.raises(ValueError):
+        AreaCalculator('geodesic', None)
+    with pytest.raises(ValueError):
+        AreaCalculator('unknown', 'EPSG:4326')
@@ -0,0 +1,87 @@
+"""
+测试列式关联结果
+"""
+
+import pytest
+import numpy as np
+import geopandas as gpd
+from shapely.geometry import box
+from src.core.result import JoinResult, RELATION_NONE, RELATION_CONTAINED, RELATION_PARTIAL
+
+
+def create_result():
+    """创建一个包含三种关联类型的测试结果"""
+    source_gdf = gpd.GeoDataFrame(
+        {'id': [1, 2, 3], 'name': ['A', 'B', 'C']},
+        geometry=[box(0, 0, 1, 1), box(1, 0, 2, 1), box(5, 5, 6, 6)],
+        crs='EPSG:4326'
+    )
+    target_gdf = gpd.GeoDataFrame(
+        {'zone_id': ['Z01', 'Z02'], 'code': [10, 20]},
+        geometry=[box(0, 0, 2, 2), box(1, 0, 3, 1)],
+        crs='EPSG:4326'
+    )
+    return JoinResult(
+        source_gdf,
+        target_gdf,
+        target_index=np.array([0, 1, -1]),
+        relations=np.array([RELATION_CONTAINED, RELATION_PARTIAL, RELATION_NONE]),
+        intersection_area=np.array([1.0, 0.5, 0.0]),
+        overlap_ratio=np.array([1.0, 0.5, 0.0]),
+        source_id_field='id',
+        target_id_field='zone_id'
+    )
+
+
+def test_result_records_view():
+    """测试兼容的字典列表视图"""
+    result = create_result()
+    records = result.to_records()
+
+    assert len(result) == 3
+    assert records[0] == {
+        'source_id': 1,
+        'source_attributes': {'id': 1, 'name': 'A'},
+        'target_id': 'Z01',
+        'target_attributes': {'zone_id': 'Z01', 'code': 10},
+        'relation_type': 'contained',
+        'intersection_area': 1.0,
+        'overlap_ratio': 1.0,
+    }
+    assert records[2]['target_id'] is None
+    assert records[2]['target_attributes'] == {'zone_id': None, 'code': None}
+    # 按下标访问与列表视图一致
+    assert result[1] == records[1]
+    assert result[-1]['relation_type'] == 'no_intersection'
+
+
+def test_result_target_attributes():
+    """测试按需关联的目标属性（整数列不因缺失值变为浮点数）"""
+    result = create_result()
+    attrs = result.target_attributes()
+
+    assert list(attrs['zone_id']) == ['Z01', 'Z02', None]
+    assert attrs['code'].dtype == 'Int64'
+    assert attrs['code'].tolist()[:2] == [10, 20]
+    assert attrs['code'].isna().tolist() == [False, False, True]
+
+
+def test_result_to_dataframe():
+    """测试扁平报告表"""
+    df = create_result().to_dataframe()
+
+    assert list(df['relation_type']) == ['contained', 'partial_overlap', 'no_intersection']
+    assert 'source_name' in df.columns
+    assert 'target_zone_id' in df.columns
+
+
+def test_result_to_dataframe_renames_colliding_columns():
+    """测试属性字段与关联信息列重名时改名（源图层的 id 字段不覆盖 source_id）"""
+    result = create_result()
+    result.source_id_field = None
+    df = result.to_dataframe()
+
+    assert df.columns.is_unique
+    assert list(df['source_id']) == [0, 1, 2]
+    assert list(df['source_attr_id']) == [1, 2, 3]
+    assert result.attribute_columns('target') == {'zone_id': 'target_zone_id', 'code': 'target_code'}
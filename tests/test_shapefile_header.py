@@ -0,0 +1,44 @@
+"""
+测试 Shapefile 文件头解析
+"""
+
+import geopandas as gpd
+import tempfile
+import os
+from shapely.geometry import box, Point
+from src.utils.shapefile_header import read_shapefile_header
+
+
+def test_read_shapefile_header_matches_layer():
+    """测试文件头中的要素数、字段、坐标系和范围与读取结果一致"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        gdf = gpd.GeoDataFrame(
+            {'名称': ['甲', '乙', '丙'], 'code': [1, 2, 3], 'ratio': [0.5, 1.5, 2.5]},
+            geometry=[box(0, 0, 1, 1), box(2, 3, 4, 5), box(-1, 0, 0, 1)],
+            crs='EPSG:4326'
+        )
+        shp_path = os.path.join(tmpdir, 'test.shp')
+        gdf.to_file(shp_path, encoding='gbk')
+
+        header = read_shapefile_header(shp_path)
+
+        assert header['feature_count'] == 3
+        assert header['geometry_type'] == 'Polygon'
+        assert header['crs'] == 'EPSG:4326'
+        assert header['fields'] == ['名称', 'code', 'ratio']
+        assert header['dtypes'] == ['object', 'int64', 'float64']
+        assert header['bounds'] == [-1.0, 0.0, 4.0, 5.0]
+
+
+def test_read_shapefile_header_point_layer():
+    """测试点图层的形状类型"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        gdf = gpd.GeoDataFrame({'id': [1]}, geometry=[Point(1, 2)], crs='EPSG:3857')
+        shp_path = os.path.join(tmpdir, 'points.shp')
+        gdf.to_file(shp_path)
+
+        header = read_shapefile_header(shp_path)
+
+        assert header['shape_type'] == 1
+        assert header['geometry_type'] == 'Point'
+        assert header['feature_count'] == 1
@@ -0,0 +1,143 @@
+"""
+测试流式处理
+"""
+
+import pytest
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import tempfile
+import os
+from shapely.geometry import box
+from src.core.loader import ShapefileLoader
+from src.core.validator import GeometryValidator
+from src.core.processor import SpatialJoinProcessor
+from src.core.exporter import ResultExporter
+from src.core.streaming import stream_join
+
+
+def write_layers(tmpdir):
+    """写出测试用的源、目标图层（部分源要素无关联）"""
+    source_gdf = gpd.GeoDataFrame(
+        {'id': list(range(10))},
+        geometry=[box(i * 0.5, 0.1, i * 0.5 + 0.4, 0.5) for i in range(10)],
+        crs='EPSG:3857'
+    )
+    target_gdf = gpd.GeoDataFrame(
+        {'zone': [1, 2], 'name': ['A', 'B']},
+        geometry=[box(0, 0, 1.2, 1), box(1.2, 0, 2.2, 1)],
+        crs='EPSG:3857'
+    )
+    source_path = os.path.join(tmpdir, 'source.shp')
+    target_path = os.path.join(tmpdir, 'target.shp')
+    source_gdf.to_file(source_path)
+    target_gdf.to_file(target_path)
+    return source_path, target_path
+
+
+def test_stream_join_matches_full_processing():
+    """测试流式处理与一次性处理的结果一致"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        source_path, target_path = write_layers(tmpdir)
+        loader = ShapefileLoader()
+        source_gdf, _ = loader.load_layer(source_path)
+        target_gdf, _ = loader.load_layer(target_path)
+
+        processor = SpatialJoinProcessor(GeometryValidator())
+        expected = processor.process(source_gdf, target_gdf).to_dataframe()
+
+        csv_path = os.path.join(tmpdir, 'out.csv')
+        stats = stream_join(source_path, target_gdf, csv_path, processor, batch_size=3)
+        report = pd.read_csv(csv_path, encoding='utf-8-sig')
+
+        assert stats['total'] == 10
+        assert stats['no_intersection'] == int((expected['relation_type'] == 'no_intersection').sum())
+        assert list(report['source_id']) == list(range(10))
+        assert list(report['relation_type']) == list(expected['relation_type'])
+        assert np.allclose(report['overlap_ratio'], expected['overlap_ratio'])
+        assert list(report['target_name'].fillna('')) == list(expected['target_name'].fillna(''))
+
+
+def test_stream_join_appends_shapefile():
+    """测试流式处理逐批追加写出 Shapefile"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        source_path, target_path = write_layers(tmpdir)
+        target_gdf, _ = ShapefileLoader().load_layer(target_path)
+        output_path = os.path.join(tmpdir, 'out.shp')
+
+        stream_join(source_path, target_gdf, output_path, SpatialJoinProcessor(GeometryValidator()), batch_size=4)
+        output = gpd.read_file(output_path)
+
+        assert len(output) == 10
+        assert list(output['id']) == list(range(10))
+        # 整数字段统一写为浮点数，无关联时为空
+        assert output['t_zone'].iloc[0] == 1
+        assert output['t_zone'].isna().sum() == (output['relation_t'] == 'no_intersection').sum()
+
+
+def test_iter_batches():
+    """测试按批读取图层"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        source_path, _ = write_layers(tmpdir)
+        loader = ShapefileLoader()
+
+        batches = list(loader.iter_batches(source_path, batch_size=4))
+
+        assert [len(batch) for batch in batches] == [4, 4, 2]
+        assert list(batches[1].index) == [4, 5, 6, 7]
+        assert list(batches[2]['id']) == [8, 9]
+        assert loader.count_features(source_path) == 10
+
+        with pytest.raises(ValueError):
+            list(loader.iter_batches('/nonexistent/file.shp', batch_size=4))
+
+
+def test_stream_join_appends_geopackage():
+    """测试流式处理逐批追加写出 GeoPackage（保留完整字段名）"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        source_path, target_path = write_layers(tmpdir)
+        target_gdf, _ = ShapefileLoader().load_layer(target_path)
+        output_path = os.path.join(tmpdir, 'out.gpkg')
+
+        stream_join(source_path, target_gdf, output_path, SpatialJoinProcessor(GeometryValidator()), batch_size=4)
+        output = gpd.read_file(output_path)
+
+        assert len(output) == 10
+        assert list(output['id']) == list(range(10))
+        assert output['target_zone'].iloc[0] == 1
+        assert output['target_name'].isna().sum() == (output['relation_type'] == 'no_intersection').sum()
+
+
+@pytest.mark.parametrize('extension, prefix', [('.shp', 't_'), ('.gpkg', 'target_')])
+def test_stream_join_first_batch_unmatched(extension, prefix):
+    """测试第一批源要素全部无关联时，输出字段类型仍取自目标图层"""
+    import pyogrio
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        source_gdf = gpd.GeoDataFrame(
+            {'id': list(range(4))},
+            geometry=[box(10, 10, 11, 11), box(12, 10, 13, 11), box(0.2, 0.2, 0.8, 0.8), box(1.2, 0.2, 1.8, 0.8)],
+            crs='EPSG:3857'
+        )
+        source_path = os.path.join(tmpdir, 'source.shp')
+        source_gdf.to_file(source_path)
+        target_gdf = gpd.GeoDataFrame(
+            {'zone': [1, 2], 'val': [0.5, 1.5], 'name': ['A', 'B'],
+             'day': pd.to_datetime(['2024-01-01', '2024-02-01'])},
+            geometry=[box(0, 0, 1, 1), box(1, 0, 2, 1)],
+            crs='EPSG:3857'
+        )
+        output_path = os.path.join(tmpdir, 'out' + extension)
+
+        stream_join(source_path, target_gdf, output_path, SpatialJoinProcessor(GeometryValidator()), batch_size=2)
+        info = pyogrio.read_info(output_path)
+        dtypes = dict(zip(info['fields'], info['dtypes']))
+        output = gpd.read_file(output_path)
+
+        assert dtypes[prefix + 'zone'] == 'float64'
+        assert dtypes[prefix + 'val'] == 'float64'
+        assert dtypes[prefix + 'name'] == 'object'
+        if extension == '.gpkg':
+            # Shapefile 没有日期时间字段类型，总是写为文本
+            assert dtypes[prefix + 'day'].startswith('datetime64')
+        assert list(output[prefix + 'val'].iloc[2:]) == [0.5, 1.5]
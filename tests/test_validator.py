@@ -70,3 +70,20 @@ def test_validate_geometry_empty():
 
     assert is_valid is False
     assert len(errors) > 0
+
+
+def test_fix_invalid_geometries_bulk():
+    """测试批量修复无效几何"""
+    valid_polygon = Polygon([(0, 0), (1, 0), (1, 1), (0, 1), (0, 0)])
+    invalid_polygon = Polygon([(0, 0), (2, 2), (0, 2), (2, 0), (0, 0)])
+    geoms = [valid_polygon, invalid_polygon, invalid_polygon]
+
+    validator = GeometryValidator()
+    fixed, repaired_count = validator.fix_invalid_geometries(geoms)
+
+    assert repaired_count == 2
+    assert all(g.is_valid for g in fixed)
+    assert fixed[0] is valid_polygon
+    assert fixed[1].area == pytest.approx(2.0)
+    # 输入不被修改
+    assert not geoms[1].is_valid